@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# /// script
+# dependencies = ["json", "sys", "datetime"]
+# ///
+
+"""
+Claude Code Hook: Combined PreToolUse
+
+Single-pass replacement for running pre_tool_use.py and
+error_attention_pre_tool_use.py as two processes on the same payload:
+- Parses the payload once
+- Scans conversation_context once, incrementally per session (see context_view)
+- Runs the workflow validators and the ERROR ATTENTION PROTOCOL validators
+  against that shared view
+- Emits one merged decision
+
+Exit Codes:
+- 0: Success, continue with tool execution
+- 1: Non-blocking warning, continue with tool execution
+- 2: Blocking error or framework violation, prevent tool execution
+"""
+
+import json
+import sys
+from datetime import datetime
+
+import pre_tool_use
+import error_attention_pre_tool_use as error_attention
+import hook_timing
+from context_view import scan_context
+
+
+def run_validations(tool_data, conversation_context, session_id=None):
+    """Run every pre-tool validator against one shared context scan"""
+    context = scan_context(conversation_context, session_id)
+    return [
+        # Workflow validation (pre_tool_use.py)
+        pre_tool_use.validate_file_modification_tools(tool_data),
+        pre_tool_use.validate_todo_workflow(tool_data, context),
+        pre_tool_use.validate_framework_principles(tool_data),
+        pre_tool_use.validate_security_practices(tool_data),
+        # ERROR ATTENTION PROTOCOL (error_attention_pre_tool_use.py)
+        error_attention.validate_context7_compliance(tool_data, context),
+        error_attention.validate_agent_deployment_compliance(tool_data, context),
+        error_attention.validate_progressive_thinking_usage(context),
+        error_attention.validate_todowrite_compliance(tool_data, context),
+        error_attention.validate_evidence_requirements(context)
+    ]
+
+
+def merge_validations(validations):
+    """Merge validator results into one decision, dropping duplicate messages"""
+    merged = {
+        'errors': [],
+        'warnings': [],
+        'agent_deployment_required': False,
+        'framework_violation_detected': False
+    }
+
+    for validation in validations:
+        for field in ('errors', 'warnings'):
+            for message in validation.get(field, []):
+                if message not in merged[field]:
+                    merged[field].append(message)
+        if validation.get('agent_deployment_required', False):
+            merged['agent_deployment_required'] = True
+        if validation.get('framework_violation_detected', False):
+            merged['framework_violation_detected'] = True
+
+    return merged
+
+
+@hook_timing.timed('combined_pre_tool_use')
+def main():
+    """Main combined pre-tool validation"""
+    try:
+        hook_data = pre_tool_use.load_hook_data()
+
+        tool_data = hook_data.get('tool', {})
+        validations = run_validations(
+            tool_data, hook_data.get('conversation_context', ''), hook_data.get('session_id')
+        )
+        merged = merge_validations(validations)
+
+        result = {
+            'allowed': True,
+            'errors': merged['errors'],
+            'warnings': merged['warnings'],
+            'tool': tool_data,
+            'framework_violations_detected': merged['framework_violation_detected'],
+            'immediate_agent_deployment_required': merged['agent_deployment_required'],
+            'metadata': {
+                'hook_name': 'combined_pre_tool_use',
+                'validators_run': len(validations),
+                'timestamp': datetime.now().isoformat(),
+                'git_status': pre_tool_use.get_git_status()
+            }
+        }
+
+        if merged['errors'] or merged['framework_violation_detected']:
+            result['allowed'] = False
+            result['error_attention_protocol_activated'] = True
+            result['required_actions'] = [
+                "STOP current operation",
+                "Deploy specialized agents immediately",
+                "Address all framework violations",
+                "Return to Universal Operation Mode compliance"
+            ]
+            result['metadata']['protocol_status'] = 'VIOLATION_DETECTED'
+            print(json.dumps(result, indent=2))
+            sys.exit(2)  # Blocking error
+
+        elif merged['warnings']:
+            result['metadata']['protocol_status'] = 'GUIDANCE_PROVIDED'
+            print(json.dumps(result, indent=2))
+            sys.exit(1)  # Non-blocking warning
+
+        else:
+            result['metadata']['protocol_status'] = 'COMPLIANT'
+            print(json.dumps(result, indent=2))
+            sys.exit(0)  # Success
+
+    except Exception as e:
+        print(f"Hook execution error: {e}", file=sys.stderr)
+        # On error, allow execution to continue
+        result = {
+            'allowed': True,
+            'errors': [f"Hook error: {e}"],
+            'warnings': [],
+            'tool': {'name': 'unknown', 'parameters': {}},
+            'metadata': {
+                'hook_name': 'combined_pre_tool_use',
+                'hook_error': True,
+                'execution_time': datetime.now().isoformat()
+            }
+        }
+        print(json.dumps(result, indent=2))
+        sys.exit(1)  # Non-blocking error
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# /// script
+# dependencies = []
+# ///
+
+"""
+Claude Code Hook Support: Normalized Conversation Context
+
+Validators match keywords against the lowercased conversation context. Each
+used to run str(conversation_context).lower() on its own, so a pre-tool call
+converted the same (potentially large) context once per validator.
+
+normalize_context() does the conversion once and marks the result, so passing
+the normalized view to further validators is free. Validators keep accepting
+the raw payload value as well.
+
+scan_context() goes one step further for hook entry points: it returns a
+ContextScan holding the CONTEXT_PATTERNS keywords found in the context,
+computed incrementally per session (see scan_state), so the transcript itself
+is not lowercased or scanned again on every tool call. context_keywords() and
+context_count() answer validator queries from either kind of view.
+"""
+
+import hook_timing
+from keyword_matcher import KeywordMatcher
+import scan_state
+
+
+# Every keyword the pre-tool validators look for in conversation_context
+CONTEXT_PATTERNS = {
+    'context7': ['context7', 'websearch', 'webfetch', 'research'],
+    'agent': ['agent', 'specialist', 'deploy', 'task'],
+    'direct_work': ['i will', 'let me', 'i\'ll create', 'i\'ll implement', 'i\'ll write'],
+    'specialized_work': ['hook', 'test', 'security', 'performance'],
+    'specialized_agents': [
+        'claude-hooks-developer', 'testing-strategy-specialist',
+        'security-specialist', 'performance-specialist'
+    ],
+    'thinking_levels': ['think', 'think hard', 'think harder', 'ultra think'],
+    'complexity': ['complex', 'multi-step', 'framework', 'system', 'integration'],
+    'todowrite': ['todowrite', 'todo'],
+    'framework_work': ['hook', 'system', 'framework', 'protocol'],
+    'claims': ['will work', 'should work', 'this fixes', 'this solves'],
+    'evidence': ['test', 'validate', 'verify', 'proof', 'evidence']
+}
+
+# Patterns whose number of occurrences matters, not just presence
+CONTEXT_COUNTED = ('file_path',)
+
+CONTEXT_MATCHER = KeywordMatcher(CONTEXT_PATTERNS)
+
+
+class NormalizedContext(str):
+    """Lowercased conversation context; normalize_context() returns it unchanged"""
+    __slots__ = ()
+
+
+class ContextScan:
+    """CONTEXT_PATTERNS hits and CONTEXT_COUNTED counts of a conversation context"""
+
+    def __init__(self, conversation_context, found, counts):
+        self.conversation_context = conversation_context
+        self.found = found
+        self.counts = counts
+
+    def __str__(self):
+        return str(self.conversation_context)
+
+
+def normalize_context(conversation_context):
+    """Stringify and lowercase conversation_context, unless that was already done"""
+    if isinstance(conversation_context, NormalizedContext):
+        return conversation_context
+    if isinstance(conversation_context, ContextScan):
+        conversation_context = conversation_context.conversation_context
+    return NormalizedContext(str(conversation_context).lower())
+
+
+@hook_timing.staged()
+def scan_context(conversation_context, session_id=None):
+    """Scan conversation_context once for every validator (incrementally per session)"""
+    found, counts = scan_state.scan_context(
+        conversation_context, CONTEXT_MATCHER,
+        session_id=session_id, scope='conversation_context', count_patterns=CONTEXT_COUNTED
+    )
+    return ContextScan(conversation_context, found, counts)
+
+
+def context_keywords(conversation_context):
+    """CONTEXT_PATTERNS keywords found in any kind of context view"""
+    if isinstance(conversation_context, ContextScan):
+        return conversation_context.found
+    return CONTEXT_MATCHER.find(normalize_context(conversation_context))
+
+
+def context_count(conversation_context, pattern):
+    """Occurrences of pattern in the lowercased context"""
+    if isinstance(conversation_context, ContextScan) and pattern in conversation_context.counts:
+        return conversation_context.counts[pattern]
+    return normalize_context(conversation_context).count(pattern)
@@ -28,7 +28,12 @@ import re
 from pathlib import Path
 from datetime import datetime
 
+import hook_timing
+from keyword_matcher import KeywordMatcher
+from segmented_log import SegmentedLog
 
+
+@hook_timing.staged('parse_input')
 def load_hook_data():
     """Load and validate notification data"""
     try:
@@ -101,30 +106,50 @@ def validate_and_enhance_data(data):
     return data
 
 
-def analyze_notification_severity(notification_data):
-    """ERROR ATTENTION PROTOCOL: Analyze notification severity"""
-    notification_type = notification_data.get('type', '').lower()
-    message = notification_data.get('message', '').lower()
-    level = notification_data.get('level', '').lower()
-    
+SEVERITY_PATTERNS = {
     # Critical error patterns requiring immediate attention
-    critical_patterns = [
+    'critical': [
         'error', 'exception', 'failed', 'failure', 'crash', 'critical',
         'timeout', 'permission denied', 'access denied', 'not found',
         'syntax error', 'runtime error', 'segmentation fault', 'traceback'
-    ]
-    
+    ],
     # Framework violation patterns
-    framework_violation_patterns = [
+    'framework_violation': [
         'framework violation', 'context7 bypass', 'agent not deployed',
         'direct work detected', 'compliance issue', 'protocol violation'
-    ]
-    
+    ],
     # Warning patterns requiring attention
-    warning_patterns = [
+    'warning': [
         'warning', 'deprecated', 'outdated', 'insecure', 'vulnerable',
         'performance', 'memory', 'disk space', 'rate limit'
     ]
+}
+
+# Required agents based on notification content
+AGENT_MAPPING = {
+    'error': 'error-resolution-specialist',
+    'test': 'testing-strategy-specialist',
+    'security': 'security-specialist',
+    'performance': 'performance-specialist',
+    'hook': 'claude-hooks-developer',
+    'git': 'git-workflow-specialist',
+    'framework': 'framework-compliance-specialist'
+}
+
+# One matcher for every table, built once per process
+SEVERITY_MATCHER = KeywordMatcher({**SEVERITY_PATTERNS, 'agents': list(AGENT_MAPPING)})
+
+
+@hook_timing.staged()
+def analyze_notification_severity(notification_data):
+    """ERROR ATTENTION PROTOCOL: Analyze notification severity"""
+    notification_type = notification_data.get('type', '').lower()
+    message = notification_data.get('message', '').lower()
+    level = notification_data.get('level', '').lower()
+    
+    message_hits = SEVERITY_MATCHER.find(message)
+    type_hits = SEVERITY_MATCHER.find(notification_type)
+    found = message_hits | type_hits
     
     analysis = {
         'severity_level': 'info',
@@ -136,8 +161,8 @@ def analyze_notification_severity(notification_data):
     }
     
     # Check for critical patterns
-    for pattern in critical_patterns:
-        if pattern in message or pattern in notification_type:
+    for pattern in SEVERITY_PATTERNS['critical']:
+        if pattern in found:
             analysis['patterns_detected'].append(pattern)
             analysis['severity_level'] = 'critical'
             analysis['requires_immediate_attention'] = True
@@ -145,8 +170,8 @@ def analyze_notification_severity(notification_data):
             analysis['blocking_required'] = True
     
     # Check for framework violations
-    for pattern in framework_violation_patterns:
-        if pattern in message:
+    for pattern in SEVERITY_PATTERNS['framework_violation']:
+        if pattern in message_hits:
             analysis['patterns_detected'].append(f"framework_violation: {pattern}")
             analysis['severity_level'] = 'critical'
             analysis['requires_immediate_attention'] = True
@@ -156,25 +181,15 @@ def analyze_notification_severity(notification_data):
     
     # Check for warning patterns
     if analysis['severity_level'] == 'info':
-        for pattern in warning_patterns:
-            if pattern in message or pattern in notification_type:
+        for pattern in SEVERITY_PATTERNS['warning']:
+            if pattern in found:
                 analysis['patterns_detected'].append(pattern)
                 analysis['severity_level'] = 'warning'
                 analysis['requires_agent_deployment'] = True
     
     # Determine required agents based on notification content
-    agent_mapping = {
-        'error': 'error-resolution-specialist',
-        'test': 'testing-strategy-specialist',
-        'security': 'security-specialist',
-        'performance': 'performance-specialist',
-        'hook': 'claude-hooks-developer',
-        'git': 'git-workflow-specialist',
-        'framework': 'framework-compliance-specialist'
-    }
-    
-    for keyword, agent in agent_mapping.items():
-        if keyword in message or keyword in notification_type:
+    for keyword, agent in AGENT_MAPPING.items():
+        if keyword in found:
             if agent not in analysis['agent_types_needed']:
                 analysis['agent_types_needed'].append(agent)
     
@@ -250,7 +265,6 @@ def log_error_attention_activity(notification_data, severity_analysis, deploymen
     """Log ERROR ATTENTION PROTOCOL activity for analysis"""
     try:
         log_dir = Path.home() / '.claude' / 'work' / 'error_attention_logs'
-        log_dir.mkdir(parents=True, exist_ok=True)
         
         log_entry = {
             'timestamp': datetime.now().isoformat(),
@@ -262,15 +276,15 @@ def log_error_attention_activity(notification_data, severity_analysis, deploymen
             'attention_level': severity_analysis['severity_level']
         }
         
-        log_file = log_dir / f"error_attention_{datetime.now().strftime('%Y%m%d')}.jsonl"
-        with open(log_file, 'a') as f:
-            f.write(json.dumps(log_entry) + '\n')
+        # Rotated, time-indexed segments; older error_attention_<date>.jsonl files stay as they are
+        SegmentedLog(log_dir / 'error_attention').append(log_entry)
             
     except Exception as e:
         # Don't fail on logging errors
         print(f"DEBUG: Error logging failed: {e}", file=sys.stderr)
 
 
+@hook_timing.timed('error_attention_notification')
 def main():
     """Main ERROR ATTENTION PROTOCOL notification handler"""
     try:
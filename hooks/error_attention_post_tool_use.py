@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # /// script
-# dependencies = ["pathlib", "json", "sys", "os", "subprocess", "re"]
+# dependencies = ["pathlib", "json", "sys", "os", "re"]
 # ///
 
 """
@@ -23,12 +23,21 @@ Exit Codes:
 import json
 import sys
 import os
-import subprocess
 import re
 from pathlib import Path
 from datetime import datetime
 
+import git_state
+import file_checks
+import hook_scheduler
+import hook_timing
 
+
+# Overall latency budget for the post-tool checks of one tool call
+CHECK_BUDGET_SECONDS = 0.5
+
+
+@hook_timing.staged('parse_input')
 def load_hook_data():
     """Load and validate post-tool execution data"""
     try:
@@ -168,14 +177,12 @@ def validate_evidence_requirements(tool_data, result_data):
         file_path = tool_data.get('parameters', {}).get('file_path', '')
         
         if file_path and file_path.endswith('.py'):
-            # Python files should be syntax-checked
+            # Python files should be syntax-checked (in process, cached by content hash)
             try:
-                result = subprocess.run(
-                    ['python3', '-m', 'py_compile', file_path],
-                    capture_output=True, text=True
-                )
-                if result.returncode != 0:
-                    evidence_issues.append(f"Python syntax error in {file_path}: {result.stderr}")
+                checks = file_checks.check_python_file(file_path)
+                problem = checks['read_error'] or checks['syntax_error']
+                if problem:
+                    evidence_issues.append(f"Python syntax error in {file_path}: {problem}")
             except Exception:
                 warnings.append(f"Could not validate Python syntax for {file_path}")
         
@@ -222,22 +229,23 @@ def validate_framework_compliance_post_execution(tool_data, result_data):
         # Validate hook files have proper structure
         if 'hook' in file_path.lower() and file_path.endswith('.py'):
             try:
-                with open(file_path, 'r') as f:
-                    content = f.read()
+                # Same single read and cache entry as the syntax check
+                checks = file_checks.check_python_file(file_path)
+                if checks['read_error']:
+                    raise OSError(checks['read_error'])
                 
                 # Check for PEP 723 compliance
-                if '# /// script' not in content:
+                if not checks['has_pep723']:
                     errors.append("FRAMEWORK VIOLATION: Hook missing PEP 723 script metadata")
                     compliance_issues = True
                 
                 # Check for proper exit code handling
-                exit_patterns = ['sys.exit(0)', 'sys.exit(1)', 'sys.exit(2)']
-                if not any(pattern in content for pattern in exit_patterns):
+                if not checks['has_exit_codes']:
                     errors.append("FRAMEWORK VIOLATION: Hook missing proper exit code handling")
                     compliance_issues = True
                 
                 # Check for JSON output structure
-                if 'json.dumps' not in content:
+                if not checks['has_json_output']:
                     warnings.append("Hook should provide structured JSON output")
                 
             except Exception as e:
@@ -258,15 +266,13 @@ def validate_framework_compliance_post_execution(tool_data, result_data):
     }
 
 
-def check_git_status_changes():
-    """Check if git status has new changes requiring attention"""
+def check_git_status_changes(changed_paths=None):
+    """Check if git status has new changes requiring attention (cached, see git_state)"""
     try:
-        result = subprocess.run(
-            ['git', 'status', '--porcelain'],
-            capture_output=True, text=True, cwd=os.getcwd()
-        )
-        
-        status_output = result.stdout.strip()
+        if changed_paths is None:
+            # Unknown side effects (e.g. Bash) - don't trust the cache
+            git_state.invalidate()
+        status_output = git_state.get_porcelain_status(changed_paths=changed_paths)
         if status_output:
             lines = status_output.split('\n')
             untracked = [line for line in lines if line.startswith('??')]
@@ -286,6 +292,7 @@ def check_git_status_changes():
         return {'has_changes': False, 'error': 'Could not check git status'}
 
 
+@hook_timing.timed('error_attention_post_tool_use')
 def main():
     """Main ERROR ATTENTION PROTOCOL post-tool validation"""
     try:
@@ -295,12 +302,38 @@ def main():
         tool_data = hook_data.get('tool', {})
         result_data = hook_data.get('result', {})
         
-        # Run ERROR ATTENTION PROTOCOL validations
+        # Check git status for changes
+        file_path = tool_data.get('parameters', {}).get('file_path', '')
+        if tool_data.get('name') == 'Bash':
+            changed_paths = None
+        else:
+            changed_paths = [file_path] if file_path else []
+        
+        # Run ERROR ATTENTION PROTOCOL validations within the latency budget (see
+        # hook_scheduler): validations always run, the git status context is advisory
+        schedule = hook_scheduler.run_checks([
+            hook_scheduler.check('validate_tool_execution_success',
+                                 lambda: validate_tool_execution_success(tool_data, result_data),
+                                 cost='cpu', priority=1, blocking=True),
+            hook_scheduler.check('validate_evidence_requirements',
+                                 lambda: validate_evidence_requirements(tool_data, result_data),
+                                 cost='filesystem', priority=2, blocking=True),
+            hook_scheduler.check('validate_framework_compliance_post_execution',
+                                 lambda: validate_framework_compliance_post_execution(tool_data, result_data),
+                                 cost='filesystem', priority=3, blocking=True),
+            hook_scheduler.check('check_git_status_changes',
+                                 lambda: check_git_status_changes(changed_paths),
+                                 cost='subprocess', priority=4)
+        ], budget_seconds=CHECK_BUDGET_SECONDS)
+        
         validations = [
-            validate_tool_execution_success(tool_data, result_data),
-            validate_evidence_requirements(tool_data, result_data),
-            validate_framework_compliance_post_execution(tool_data, result_data)
+            schedule['results']['validate_tool_execution_success'],
+            schedule['results']['validate_evidence_requirements'],
+            schedule['results']['validate_framework_compliance_post_execution']
         ]
+        git_status = schedule['results'].get(
+            'check_git_status_changes', {'has_changes': False, 'skipped': True}
+        )
         
         # Collect results
         all_errors = []
@@ -316,9 +349,6 @@ def main():
             if validation.get('compliance_issues_detected', False):
                 compliance_issues = True
         
-        # Check git status for changes
-        git_status = check_git_status_changes()
-        
         # ERROR ATTENTION PROTOCOL: Determine response
         if all_errors or attention_required or compliance_issues:
             # CRITICAL: Validation failures require immediate attention
@@ -338,8 +368,10 @@ def main():
                     "Verify all implementations with evidence"
                 ],
                 'git_status': git_status,
+                'skipped_checks': schedule['skipped_checks'],
                 'metadata': {
                     'hook_name': 'error_attention_post_tool_use',
+                    'check_elapsed_ms': schedule['elapsed_ms'],
                     'protocol_status': 'VALIDATION_FAILED',
                     'timestamp': datetime.now().isoformat(),
                     'attention_level': 'CRITICAL'
@@ -365,8 +397,10 @@ def main():
                     "Consider additional validation steps"
                 ],
                 'git_status': git_status,
+                'skipped_checks': schedule['skipped_checks'],
                 'metadata': {
                     'hook_name': 'error_attention_post_tool_use',
+                    'check_elapsed_ms': schedule['elapsed_ms'],
                     'protocol_status': 'CONCERNS_IDENTIFIED',
                     'timestamp': datetime.now().isoformat(),
                     'attention_level': 'MODERATE'
@@ -388,8 +422,10 @@ def main():
                 'result': result_data,
                 'status': "Tool execution successfully validated",
                 'git_status': git_status,
+                'skipped_checks': schedule['skipped_checks'],
                 'metadata': {
                     'hook_name': 'error_attention_post_tool_use',
+                    'check_elapsed_ms': schedule['elapsed_ms'],
                     'protocol_status': 'VALIDATED',
                     'timestamp': datetime.now().isoformat(),
                     'attention_level': 'NONE'
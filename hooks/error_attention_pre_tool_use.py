@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # /// script
-# dependencies = ["pathlib", "json", "sys", "os", "subprocess", "re"]
+# dependencies = ["pathlib", "json", "sys", "os", "re"]
 # ///
 
 """
@@ -23,12 +23,16 @@ Exit Codes:
 import json
 import sys
 import os
-import subprocess
 import re
 from pathlib import Path
 from datetime import datetime
 
+import git_state
+import hook_timing
+from context_view import CONTEXT_PATTERNS, scan_context, context_keywords, context_count
 
+
+@hook_timing.staged('parse_input')
 def load_hook_data():
     """Load and validate hook data with ERROR ATTENTION PROTOCOL enforcement"""
     try:
@@ -95,6 +99,16 @@ def validate_and_enhance_data(data):
     return data
 
 
+# Specialized work and the agent it calls for
+SPECIALIZED_PATTERNS = {
+    'hook': 'claude-hooks-developer',
+    'test': 'testing-strategy-specialist', 
+    'security': 'security-specialist',
+    'performance': 'performance-specialist'
+}
+
+
+@hook_timing.staged()
 def validate_context7_compliance(tool_data, conversation_context):
     """ERROR ATTENTION PROTOCOL: Validate Context7 usage for all code creation"""
     tool_name = tool_data.get('name', '')
@@ -110,10 +124,8 @@ def validate_context7_compliance(tool_data, conversation_context):
     agent_deployment_required = False
     
     # Check if Context7 was used in conversation context
-    context_str = str(conversation_context).lower()
-    context7_indicators = ['context7', 'websearch', 'webfetch', 'research']
-    
-    has_context7_usage = any(indicator in context_str for indicator in context7_indicators)
+    found = context_keywords(conversation_context)
+    has_context7_usage = any(indicator in found for indicator in CONTEXT_PATTERNS['context7'])
     
     # Check file extensions that require Context7 research
     file_path = tool_params.get('file_path', '')
@@ -142,6 +154,7 @@ def validate_context7_compliance(tool_data, conversation_context):
     }
 
 
+@hook_timing.staged()
 def validate_agent_deployment_compliance(tool_data, conversation_context):
     """ERROR ATTENTION PROTOCOL: Validate specialized agent deployment"""
     tool_name = tool_data.get('name', '')
@@ -155,15 +168,13 @@ def validate_agent_deployment_compliance(tool_data, conversation_context):
     if tool_name not in complex_tools:
         return {'valid': True, 'warnings': [], 'errors': [], 'agent_deployment_required': False}
     
-    context_str = str(conversation_context).lower()
+    found = context_keywords(conversation_context)
     
     # Check for agent deployment indicators
-    agent_indicators = ['agent', 'specialist', 'deploy', 'task']
-    has_agent_deployment = any(indicator in context_str for indicator in agent_indicators)
+    has_agent_deployment = any(indicator in found for indicator in CONTEXT_PATTERNS['agent'])
     
     # Direct work detection (framework violation)
-    direct_work_patterns = ['i will', 'let me', 'i\'ll create', 'i\'ll implement', 'i\'ll write']
-    has_direct_work = any(pattern in context_str for pattern in direct_work_patterns)
+    has_direct_work = any(pattern in found for pattern in CONTEXT_PATTERNS['direct_work'])
     
     if has_direct_work and not has_agent_deployment:
         errors.append("FRAMEWORK VIOLATION: Direct work detected - AGENT DEPLOYMENT MANDATORY")
@@ -171,15 +182,8 @@ def validate_agent_deployment_compliance(tool_data, conversation_context):
         agent_deployment_required = True
     
     # Check for specialized work requiring specific agents
-    specialized_patterns = {
-        'hook': 'claude-hooks-developer',
-        'test': 'testing-strategy-specialist', 
-        'security': 'security-specialist',
-        'performance': 'performance-specialist'
-    }
-    
-    for pattern, required_agent in specialized_patterns.items():
-        if pattern in context_str and required_agent not in context_str:
+    for pattern, required_agent in SPECIALIZED_PATTERNS.items():
+        if pattern in found and required_agent not in found:
             warnings.append(f"Consider deploying {required_agent} agent for {pattern} work")
     
     return {
@@ -191,20 +195,19 @@ def validate_agent_deployment_compliance(tool_data, conversation_context):
     }
 
 
+@hook_timing.staged()
 def validate_progressive_thinking_usage(conversation_context):
     """ERROR ATTENTION PROTOCOL: Validate 4-level Progressive Thinking methodology"""
-    context_str = str(conversation_context).lower()
+    found = context_keywords(conversation_context)
     
     errors = []
     warnings = []
     
     # Check for Progressive Thinking indicators
-    thinking_levels = ['think', 'think hard', 'think harder', 'ultra think']
-    thinking_usage = [level for level in thinking_levels if level in context_str]
+    thinking_usage = [level for level in CONTEXT_PATTERNS['thinking_levels'] if level in found]
     
     # Complex tasks require Progressive Thinking
-    complexity_indicators = ['complex', 'multi-step', 'framework', 'system', 'integration']
-    is_complex = any(indicator in context_str for indicator in complexity_indicators)
+    is_complex = any(indicator in found for indicator in CONTEXT_PATTERNS['complexity'])
     
     if is_complex and len(thinking_usage) < 2:
         warnings.append("Complex task detected - consider Progressive Thinking methodology")
@@ -218,10 +221,10 @@ def validate_progressive_thinking_usage(conversation_context):
     }
 
 
+@hook_timing.staged()
 def validate_todowrite_compliance(tool_data, conversation_context):
     """ERROR ATTENTION PROTOCOL: Validate TodoWrite usage for task tracking"""
     tool_name = tool_data.get('name', '')
-    context_str = str(conversation_context).lower()
     
     errors = []
     warnings = []
@@ -229,16 +232,16 @@ def validate_todowrite_compliance(tool_data, conversation_context):
     # Multi-step operations require TodoWrite
     multi_step_tools = ['Write', 'Edit', 'MultiEdit']
     if tool_name in multi_step_tools:
-        has_todowrite = 'todowrite' in context_str or 'todo' in context_str
+        found = context_keywords(conversation_context)
+        has_todowrite = any(indicator in found for indicator in CONTEXT_PATTERNS['todowrite'])
         
         # Check for multiple file operations indicating complex workflow
-        file_operation_count = context_str.count('file_path')
+        file_operation_count = context_count(conversation_context, 'file_path')
         if file_operation_count > 1 and not has_todowrite:
             warnings.append("Multi-file operation detected - TodoWrite recommended for tracking")
         
         # Check for framework work requiring structured approach  
-        framework_indicators = ['hook', 'system', 'framework', 'protocol']
-        needs_structure = any(indicator in context_str for indicator in framework_indicators)
+        needs_structure = any(indicator in found for indicator in CONTEXT_PATTERNS['framework_work'])
         
         if needs_structure and not has_todowrite:
             warnings.append("Framework work detected - TodoWrite tracking recommended")
@@ -251,18 +254,16 @@ def validate_todowrite_compliance(tool_data, conversation_context):
     }
 
 
+@hook_timing.staged()
 def validate_evidence_requirements(conversation_context):
     """ERROR ATTENTION PROTOCOL: Validate evidence-based approach"""
-    context_str = str(conversation_context).lower()
+    found = context_keywords(conversation_context)
     
     warnings = []
     
     # Claims requiring evidence
-    claim_patterns = ['will work', 'should work', 'this fixes', 'this solves']
-    evidence_patterns = ['test', 'validate', 'verify', 'proof', 'evidence']
-    
-    has_claims = any(pattern in context_str for pattern in claim_patterns)
-    has_evidence = any(pattern in context_str for pattern in evidence_patterns)
+    has_claims = any(pattern in found for pattern in CONTEXT_PATTERNS['claims'])
+    has_evidence = any(pattern in found for pattern in CONTEXT_PATTERNS['evidence'])
     
     if has_claims and not has_evidence:
         warnings.append("Claims detected - provide evidence/validation for all statements")
@@ -277,17 +278,14 @@ def validate_evidence_requirements(conversation_context):
 
 
 def get_git_status():
-    """Get current git status for context"""
+    """Get current git status for context (cached, see git_state)"""
     try:
-        result = subprocess.run(
-            ['git', 'status', '--porcelain'],
-            capture_output=True, text=True, cwd=os.getcwd()
-        )
-        return result.stdout.strip() if result.returncode == 0 else ""
+        return git_state.get_porcelain_status()
     except Exception:
         return ""
 
 
+@hook_timing.timed('error_attention_pre_tool_use')
 def main():
     """Main ERROR ATTENTION PROTOCOL enforcement"""
     try:
@@ -295,7 +293,10 @@ def main():
         hook_data = load_hook_data()
         
         tool_data = hook_data.get('tool', {})
-        conversation_context = hook_data.get('conversation_context', '')
+        # Scanned once (incrementally per session), shared by every validator
+        conversation_context = scan_context(
+            hook_data.get('conversation_context', ''), hook_data.get('session_id')
+        )
         
         # Run ERROR ATTENTION PROTOCOL validations
         validations = [
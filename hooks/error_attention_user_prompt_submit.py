@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # /// script
-# dependencies = ["pathlib", "json", "sys", "os", "subprocess", "re"]
+# dependencies = ["pathlib", "json", "sys", "os", "re"]
 # ///
 
 """
@@ -23,12 +23,16 @@ Exit Codes:
 import json
 import sys
 import os
-import subprocess
 import re
 from pathlib import Path
 from datetime import datetime
 
+import git_state
+import hook_timing
+from keyword_matcher import KeywordMatcher
 
+
+@hook_timing.staged('parse_input')
 def load_hook_data():
     """Load and validate user prompt data"""
     try:
@@ -91,28 +95,45 @@ def validate_and_enhance_data(data):
     return data
 
 
+COMPLEXITY_INDICATORS = {
+    'high_complexity': [
+        'system', 'framework', 'architecture', 'integration', 'comprehensive',
+        'implement', 'build', 'create', 'develop', 'design', 'deploy'
+    ],
+    'multi_step': [
+        'first', 'then', 'next', 'finally', 'step', 'phase', 'stage',
+        'multiple', 'several', 'many', 'various', 'all'
+    ],
+    'specialized_domains': [
+        'hook', 'security', 'performance', 'test', 'database', 'api',
+        'protocol', 'algorithm', 'optimization', 'validation'
+    ],
+    'error_patterns': [
+        'error', 'fix', 'debug', 'problem', 'issue', 'failure', 'broken',
+        'not working', 'failed', 'exception', 'crash'
+    ]
+}
+
+# Specialized agents needed per keyword
+AGENT_MAPPING = {
+    'hook': 'claude-hooks-developer',
+    'test': 'testing-strategy-specialist',
+    'security': 'security-specialist',
+    'performance': 'performance-specialist',
+    'debug': 'debugging-specialist',
+    'error': 'error-resolution-specialist',
+    'database': 'database-specialist',
+    'api': 'api-specialist'
+}
+
+# One matcher for every table, built once per process
+PROMPT_MATCHER = KeywordMatcher({**COMPLEXITY_INDICATORS, 'agents': list(AGENT_MAPPING)})
+
+
+@hook_timing.staged()
 def analyze_prompt_complexity(prompt_text):
     """ERROR ATTENTION PROTOCOL: Analyze prompt complexity for agent deployment"""
-    prompt_lower = prompt_text.lower()
-    
-    complexity_indicators = {
-        'high_complexity': [
-            'system', 'framework', 'architecture', 'integration', 'comprehensive',
-            'implement', 'build', 'create', 'develop', 'design', 'deploy'
-        ],
-        'multi_step': [
-            'first', 'then', 'next', 'finally', 'step', 'phase', 'stage',
-            'multiple', 'several', 'many', 'various', 'all'
-        ],
-        'specialized_domains': [
-            'hook', 'security', 'performance', 'test', 'database', 'api',
-            'protocol', 'algorithm', 'optimization', 'validation'
-        ],
-        'error_patterns': [
-            'error', 'fix', 'debug', 'problem', 'issue', 'failure', 'broken',
-            'not working', 'failed', 'exception', 'crash'
-        ]
-    }
+    hits = PROMPT_MATCHER.scan(prompt_text.lower())
     
     analysis = {
         'complexity_score': 0,
@@ -124,8 +145,8 @@ def analyze_prompt_complexity(prompt_text):
     }
     
     # Calculate complexity score
-    for category, indicators in complexity_indicators.items():
-        found = [indicator for indicator in indicators if indicator in prompt_lower]
+    for category in COMPLEXITY_INDICATORS:
+        found = hits.get(category, [])
         if found:
             analysis['indicators_found'][category] = found
             analysis['complexity_score'] += len(found)
@@ -142,68 +163,62 @@ def analyze_prompt_complexity(prompt_text):
         analysis['requires_agent_deployment'] = True
     
     # Identify specialized agents needed
-    agent_mapping = {
-        'hook': 'claude-hooks-developer',
-        'test': 'testing-strategy-specialist',
-        'security': 'security-specialist',
-        'performance': 'performance-specialist',
-        'debug': 'debugging-specialist',
-        'error': 'error-resolution-specialist',
-        'database': 'database-specialist',
-        'api': 'api-specialist'
-    }
-    
-    for keyword, agent in agent_mapping.items():
-        if keyword in prompt_lower:
-            analysis['specialized_agents_needed'].append(agent)
+    for keyword in hits.get('agents', []):
+        analysis['specialized_agents_needed'].append(AGENT_MAPPING[keyword])
     
     return analysis
 
 
+COMPLIANCE_PATTERNS = {
+    # Direct work requests (framework violation)
+    'direct_work': [
+        'write', 'create', 'implement', 'build', 'develop', 'code',
+        'fix', 'update', 'modify', 'change', 'add', 'remove'
+    ],
+    'agent': ['agent'],
+    # Code work that requires Context7 research
+    'code': ['python', 'javascript', 'typescript', 'hook', 'script', '.py', '.js'],
+    'research': ['context7', 'websearch'],
+    'complex': ['system', 'framework', 'comprehensive', 'complex', 'integration'],
+    'thinking': ['think', 'analyze', 'consider'],
+    'claims': ['will work', 'should work', 'fixes', 'solves', 'handles'],
+    'evidence': ['test', 'verify', 'validate', 'prove']
+}
+
+COMPLIANCE_MATCHER = KeywordMatcher(COMPLIANCE_PATTERNS)
+
+
+@hook_timing.staged()
 def validate_universal_operation_mode_compliance(prompt_text):
     """ERROR ATTENTION PROTOCOL: Validate Universal Operation Mode compliance"""
-    prompt_lower = prompt_text.lower()
+    hits = COMPLIANCE_MATCHER.scan(prompt_text.lower())
     
     errors = []
     warnings = []
     compliance_issues = False
     
     # Check for direct work requests (framework violation)
-    direct_work_patterns = [
-        'write', 'create', 'implement', 'build', 'develop', 'code',
-        'fix', 'update', 'modify', 'change', 'add', 'remove'
-    ]
+    direct_requests = hits.get('direct_work', [])
     
-    direct_requests = [pattern for pattern in direct_work_patterns if pattern in prompt_lower]
-    
-    if direct_requests and 'agent' not in prompt_lower:
+    if direct_requests and 'agent' not in hits:
         errors.append("FRAMEWORK VIOLATION: Direct work request without agent deployment")
         errors.append("ERROR ATTENTION PROTOCOL: ALL work requires specialized agent deployment")
         errors.append(f"Detected direct work patterns: {', '.join(direct_requests[:3])}")
         compliance_issues = True
     
     # Check for Context7 bypass attempts
-    code_patterns = ['python', 'javascript', 'typescript', 'hook', 'script', '.py', '.js']
-    needs_context7 = any(pattern in prompt_lower for pattern in code_patterns)
-    
-    if needs_context7 and 'context7' not in prompt_lower and 'websearch' not in prompt_lower:
+    if 'code' in hits and 'research' not in hits:
         errors.append("FRAMEWORK VIOLATION: Code creation without Context7 research")
         errors.append("MANDATORY: Use Context7 for all library documentation and best practices")
         compliance_issues = True
     
     # Check for missing Progressive Thinking on complex tasks
-    complex_indicators = ['system', 'framework', 'comprehensive', 'complex', 'integration']
-    is_complex = any(indicator in prompt_lower for indicator in complex_indicators)
-    
-    if is_complex and not any(thinking in prompt_lower for thinking in ['think', 'analyze', 'consider']):
+    if 'complex' in hits and 'thinking' not in hits:
         warnings.append("Complex task detected - Progressive Thinking methodology recommended")
         warnings.append("Use 4-level analysis: Think → Think Hard → Think Harder → Ultra Think")
     
     # Check for evidence requirements bypass
-    claim_patterns = ['will work', 'should work', 'fixes', 'solves', 'handles']
-    makes_claims = any(pattern in prompt_lower for pattern in claim_patterns)
-    
-    if makes_claims and not any(evidence in prompt_lower for evidence in ['test', 'verify', 'validate', 'prove']):
+    if 'claims' in hits and 'evidence' not in hits:
         warnings.append("Claims made - evidence and validation required for all statements")
     
     return {
@@ -215,21 +230,15 @@ def validate_universal_operation_mode_compliance(prompt_text):
     }
 
 
+@hook_timing.staged()
 def check_framework_status():
-    """Check current framework and system status"""
+    """Check current framework and system status (git queries cached, see git_state)"""
     try:
-        git_result = subprocess.run(
-            ['git', 'status', '--porcelain'],
-            capture_output=True, text=True, cwd=os.getcwd()
-        )
-        git_status = git_result.stdout.strip() if git_result.returncode == 0 else ""
+        git_status = git_state.get_porcelain_status()
         
         # Count recent commits
-        recent_commits = subprocess.run(
-            ['git', 'log', '--oneline', '--since="24 hours ago"'],
-            capture_output=True, text=True, cwd=os.getcwd()
-        )
-        commit_count = len(recent_commits.stdout.strip().split('\n')) if recent_commits.returncode == 0 else 0
+        recent_commits = git_state.run_git(['log', '--oneline', '--since="24 hours ago"'])
+        commit_count = len(recent_commits['stdout'].strip().split('\n')) if recent_commits['returncode'] == 0 else 0
         
         # Check for hooks directory
         hooks_dir = Path.home() / '.claude' / 'hooks'
@@ -317,6 +326,7 @@ def generate_enhanced_prompt_context(prompt_text, complexity_analysis, framework
     return '\n'.join(context_sections)
 
 
+@hook_timing.timed('error_attention_user_prompt_submit')
 def main():
     """Main ERROR ATTENTION PROTOCOL prompt analysis"""
     try:
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# /// script
+# dependencies = ["pathlib", "json", "os", "hashlib", "time", "traceback"]
+# ///
+
+"""
+Claude Code Hook Support: Cached Python File Checks
+
+Post-tool validation used to spawn `python3 -m py_compile` for every edit of a
+.py file and then re-read hook files for their PEP 723 and exit-code markers.
+check_python_file() reads the file once and runs all of those checks in
+process:
+- syntax via compile() (no interpreter start, no __pycache__ side effect)
+- PEP 723 metadata, sys.exit(0|1|2) and json.dumps markers
+
+Results are memoized by content hash, in memory and on disk under
+~/.claude/cache/file_checks.json, so a file whose content did not change across
+a chain of edits is never compiled again. A hit refreshes the entry's
+checked_at (at most every TOUCH_INTERVAL_SECONDS, to avoid rewriting the cache
+on every hit), and eviction drops the least recently used entries.
+"""
+
+import json
+import os
+import hashlib
+import time
+import traceback
+from pathlib import Path
+
+
+MAX_CACHE_ENTRIES = 256
+TOUCH_INTERVAL_SECONDS = 60
+
+EXIT_CODE_PATTERNS = ['sys.exit(0)', 'sys.exit(1)', 'sys.exit(2)']
+
+_memory_cache = {}
+
+
+def get_cache_file():
+    """Get the on-disk file check cache"""
+    return Path.home() / '.claude' / 'cache' / 'file_checks.json'
+
+
+def _load_cache():
+    cache_file = get_cache_file()
+    try:
+        mtime = cache_file.stat().st_mtime_ns
+    except OSError:
+        return {}
+    cached = _memory_cache.get('disk')
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    try:
+        with open(cache_file, 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    _memory_cache['disk'] = (mtime, cache)
+    return cache
+
+
+def _save_cache(cache):
+    if len(cache) > MAX_CACHE_ENTRIES:
+        # Keep the most recently used entries (checked_at is refreshed on hits)
+        newest = sorted(cache.items(), key=lambda item: item[1].get('checked_at', 0), reverse=True)
+        cache = dict(newest[:MAX_CACHE_ENTRIES])
+    cache_file = get_cache_file()
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+        with open(temp_file, 'w') as f:
+            json.dump(cache, f)
+        os.replace(temp_file, cache_file)
+        _memory_cache['disk'] = (cache_file.stat().st_mtime_ns, cache)
+    except OSError:
+        pass  # Checks are simply repeated next time
+
+
+def _run_checks(file_path, source):
+    checks = {'syntax_error': None}
+    try:
+        compile(source, file_path, 'exec', dont_inherit=True)
+    except (SyntaxError, ValueError) as e:
+        # Same shape as py_compile's report: location, offending line, error
+        checks['syntax_error'] = ''.join(traceback.format_exception_only(type(e), e)).rstrip()
+
+    content = source.decode('utf-8', errors='replace')
+    checks['has_pep723'] = '# /// script' in content
+    checks['has_exit_codes'] = any(pattern in content for pattern in EXIT_CODE_PATTERNS)
+    checks['has_json_output'] = 'json.dumps' in content
+    return checks
+
+
+def check_python_file(file_path):
+    """
+    Syntax and hook-structure checks for a Python file, read once.
+
+    Returns {'read_error', 'syntax_error', 'has_pep723', 'has_exit_codes',
+    'has_json_output', 'cached'}; read_error/syntax_error are None when fine.
+    """
+    try:
+        stat = os.stat(file_path)
+        # Same file checked twice in one hook run: reuse while size/mtime are unchanged
+        run_key = (str(file_path), stat.st_mtime_ns, stat.st_size)
+        if _memory_cache.get('last_run', (None,))[0] == run_key:
+            return _memory_cache['last_run'][1]
+        with open(file_path, 'rb') as f:
+            source = f.read()
+    except OSError as e:
+        return {'read_error': str(e), 'syntax_error': None, 'has_pep723': False,
+                'has_exit_codes': False, 'has_json_output': False, 'cached': False}
+
+    digest = hashlib.sha256(source).hexdigest()
+    cache = _load_cache()
+    entry = cache.get(digest)
+    if entry is not None and entry.get('file_path') == str(file_path):
+        checks = dict(entry['checks'], cached=True)
+        now = time.time()
+        if now - entry.get('checked_at', 0) >= TOUCH_INTERVAL_SECONDS:
+            cache = dict(cache)
+            cache[digest] = dict(entry, checked_at=now)
+            _save_cache(cache)
+    else:
+        checks = dict(_run_checks(str(file_path), source), cached=False)
+        cache = dict(cache)
+        cache[digest] = {
+            'file_path': str(file_path),
+            'checks': {key: value for key, value in checks.items() if key != 'cached'},
+            'checked_at': time.time()
+        }
+        _save_cache(cache)
+
+    checks['read_error'] = None
+    _memory_cache['last_run'] = (run_key, checks)
+    return checks
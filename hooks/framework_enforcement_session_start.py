@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # /// script
-# dependencies = ["pathlib", "json", "sys", "os", "subprocess", "re"]
+# dependencies = ["pathlib", "json", "sys", "os", "re"]
 # ///
 
 """
@@ -23,12 +23,15 @@ Exit Codes:
 import json
 import sys
 import os
-import subprocess
 import re
 from pathlib import Path
 from datetime import datetime
 
+import git_state
+import hook_timing
 
+
+@hook_timing.staged('parse_input')
 def load_hook_data():
     """Load session start data"""
     try:
@@ -92,6 +95,7 @@ def validate_and_enhance_data(data):
     return data
 
 
+@hook_timing.staged()
 def validate_universal_operation_patterns():
     """FRAMEWORK ENFORCEMENT: Validate all 16 Universal Operation patterns"""
     claude_md_path = Path.home() / '.claude' / 'CLAUDE.md'
@@ -171,6 +175,7 @@ def validate_universal_operation_patterns():
     }
 
 
+@hook_timing.staged()
 def validate_hooks_system_integrity():
     """FRAMEWORK ENFORCEMENT: Validate hooks system is functional"""
     hooks_dir = Path.home() / '.claude' / 'hooks'
@@ -228,16 +233,15 @@ def validate_hooks_system_integrity():
     }
 
 
+@hook_timing.staged()
 def validate_git_workflow_readiness():
     """FRAMEWORK ENFORCEMENT: Validate git workflow is ready"""
     try:
-        # Check if in git repository
-        git_check = subprocess.run(
-            ['git', 'rev-parse', '--git-dir'],
-            capture_output=True, text=True, cwd=os.getcwd()
-        )
+        # One concurrent, cached probe shared with session_start (see git_state)
+        probe = git_state.probe_repository(max_age=git_state.SESSION_PROBE_MAX_AGE_SECONDS)
         
-        if git_check.returncode != 0:
+        # Check if in git repository
+        if not probe['is_repository']:
             return {
                 'valid': False,
                 'errors': ['FRAMEWORK VIOLATION: Not in git repository - auto-commit disabled'],
@@ -246,29 +250,12 @@ def validate_git_workflow_readiness():
             }
         
         # Check git status
-        status_check = subprocess.run(
-            ['git', 'status', '--porcelain'],
-            capture_output=True, text=True, cwd=os.getcwd()
-        )
-        
         warnings = []
-        if status_check.returncode == 0 and status_check.stdout.strip():
-            change_count = len(status_check.stdout.strip().split('\n'))
-            if change_count > 10:
-                warnings.append(f"Large number of git changes ({change_count}) - consider cleanup")
+        if probe['change_count'] > 10:
+            warnings.append(f"Large number of git changes ({probe['change_count']}) - consider cleanup")
         
         # Check git configuration
-        user_check = subprocess.run(
-            ['git', 'config', 'user.name'],
-            capture_output=True, text=True
-        )
-        
-        email_check = subprocess.run(
-            ['git', 'config', 'user.email'],
-            capture_output=True, text=True
-        )
-        
-        if not user_check.stdout.strip() or not email_check.stdout.strip():
+        if not probe['user_name'] or not probe['user_email']:
             warnings.append("Git user configuration missing - may affect auto-commits")
         
         return {
@@ -276,7 +263,7 @@ def validate_git_workflow_readiness():
             'errors': [],
             'warnings': warnings,
             'git_ready': True,
-            'changes_pending': bool(status_check.stdout.strip())
+            'changes_pending': bool(probe['status'])
         }
         
     except Exception as e:
@@ -288,6 +275,7 @@ def validate_git_workflow_readiness():
         }
 
 
+@hook_timing.staged()
 def validate_agent_system_readiness():
     """FRAMEWORK ENFORCEMENT: Validate agent system is ready"""
     agents_dir = Path.home() / '.claude' / 'agents'
@@ -345,6 +333,7 @@ def validate_agent_system_readiness():
     }
 
 
+@hook_timing.timed('framework_enforcement_session_start')
 def main():
     """Main FRAMEWORK ENFORCEMENT session start validation"""
     try:
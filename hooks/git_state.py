@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# /// script
+# dependencies = ["pathlib", "json", "os", "subprocess", "hashlib", "time", "threading", "concurrent.futures"]
+# ///
+
+"""
+Claude Code Hook Support: Shared Git State
+
+Single cached provider of git state for every hook. Instead of each hook
+spawning `git status --porcelain` (plus branch/log queries) on every invocation,
+results are cached per repository and keyed on the mtimes of .git/index,
+.git/HEAD, the ref HEAD points to and packed-refs. Git only re-runs when one
+of those changes.
+
+The cache lives in memory (so hook_daemon.py serves repeated calls without any
+I/O) and on disk under ~/.claude/cache/git_state (so separate hook processes
+share it). Editing a working-tree file does not touch .git/index, so:
+- callers that know which files a tool modified pass them as changed_paths,
+  which invalidates entries older than those files
+- invalidate() drops the cache after tools with unknown side effects (Bash)
+- entries expire after MAX_AGE_SECONDS as a last resort
+
+probe_repository() gathers everything the session orientation and enforcement
+hooks need (repository check, branch, status, recent/last commit, user config)
+as one structured probe: repository and branch come from the .git files
+without a process, the remaining git commands run concurrently under one
+shared timeout, and all of them go through the cache above.
+"""
+
+import json
+import os
+import subprocess
+import hashlib
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+
+import hook_timing
+
+
+MAX_AGE_SECONDS = 30
+SESSION_PROBE_MAX_AGE_SECONDS = 5  # Session start hooks share one probe, but never an old one
+GIT_TIMEOUT_SECONDS = 10
+
+_memory_cache = {}
+_cache_lock = threading.Lock()  # probe_repository() runs git commands from several threads
+
+
+def get_cache_dir():
+    """Get the on-disk git state cache directory"""
+    return Path.home() / '.claude' / 'cache' / 'git_state'
+
+
+def find_repository(cwd=None):
+    """Locate (worktree_root, git_dir, common_dir) for cwd without spawning git"""
+    current = Path(cwd or os.getcwd()).resolve()
+
+    for directory in [current, *current.parents]:
+        dot_git = directory / '.git'
+        if dot_git.is_dir():
+            git_dir = dot_git
+        elif dot_git.is_file():
+            # Worktrees and submodules: ".git" is a file pointing at the real git dir
+            try:
+                content = dot_git.read_text().strip()
+            except OSError:
+                return None
+            if not content.startswith('gitdir:'):
+                return None
+            git_dir = Path(content[len('gitdir:'):].strip())
+            if not git_dir.is_absolute():
+                git_dir = (directory / git_dir).resolve()
+        else:
+            continue
+
+        common_dir = git_dir
+        commondir_file = git_dir / 'commondir'
+        if commondir_file.exists():
+            try:
+                common_dir = (git_dir / commondir_file.read_text().strip()).resolve()
+            except OSError:
+                pass
+        return directory, git_dir, common_dir
+
+    return None
+
+
+def read_head(git_dir):
+    """Return the ref HEAD points to (e.g. 'refs/heads/main'), or None when detached"""
+    try:
+        head = (Path(git_dir) / 'HEAD').read_text().strip()
+    except OSError:
+        return None
+    if head.startswith('ref:'):
+        return head[len('ref:'):].strip()
+    return None
+
+
+@hook_timing.staged('git_probe')
+def get_current_branch(cwd=None):
+    """Current branch name read straight from HEAD; '' when detached, None outside a repo"""
+    repository = find_repository(cwd)
+    if repository is None:
+        return None
+    ref = read_head(repository[1])
+    if ref and ref.startswith('refs/heads/'):
+        return ref[len('refs/heads/'):]
+    return ''
+
+
+def _mtime_ns(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def compute_state_key(repository):
+    """Mtimes of the git files whose change can alter status/branch/log output"""
+    _, git_dir, common_dir = repository
+    ref = read_head(git_dir)
+    return [
+        _mtime_ns(git_dir / 'index'),
+        _mtime_ns(git_dir / 'HEAD'),
+        _mtime_ns(common_dir / ref) if ref else 0,
+        _mtime_ns(common_dir / 'packed-refs'),
+    ]
+
+
+def _cache_file(worktree_root):
+    digest = hashlib.sha1(str(worktree_root).encode('utf-8')).hexdigest()[:16]
+    return get_cache_dir() / f"{digest}.json"
+
+
+def _load_cache(worktree_root):
+    # The in-memory copy is only trusted while the shared file is the one it came from,
+    # so invalidations by other hook processes are still seen
+    cache_file = _cache_file(worktree_root)
+    file_mtime = _mtime_ns(cache_file)
+    cached = _memory_cache.get(str(worktree_root))
+    if cached is not None and cached[0] == file_mtime:
+        return cached[1]
+    try:
+        with open(cache_file, 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {'key': None, 'results': {}}
+    _memory_cache[str(worktree_root)] = (file_mtime, cache)
+    return cache
+
+
+def _save_cache(worktree_root, cache):
+    cache_file = _cache_file(worktree_root)
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = cache_file.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(temp_file, 'w') as f:
+            json.dump(cache, f)
+        os.replace(temp_file, cache_file)
+    except OSError:
+        pass  # The in-memory copy still serves this process
+    _memory_cache[str(worktree_root)] = (_mtime_ns(cache_file), cache)
+
+
+def _is_fresh(entry, changed_paths, max_age=MAX_AGE_SECONDS):
+    age = time.time() - entry.get('computed_at', 0)
+    if age > max_age:
+        return False
+    for path in changed_paths or []:
+        if _mtime_ns(path) / 1e9 >= entry.get('computed_at', 0):
+            return False
+    return True
+
+
+@hook_timing.staged('git_probe')
+def run_git(args, cwd=None, changed_paths=None, timeout=GIT_TIMEOUT_SECONDS, max_age=MAX_AGE_SECONDS):
+    """Run `git <args>` through the cache; returns {'returncode': int, 'stdout': str}"""
+    cwd = cwd or os.getcwd()
+    repository = find_repository(cwd)
+    if repository is None:
+        # Same outcome as git itself outside a repository, without the process spawn
+        return {'returncode': 128, 'stdout': ''}
+
+    worktree_root = repository[0]
+    try:
+        relative_cwd = str(Path(cwd).resolve().relative_to(worktree_root))
+    except ValueError:
+        relative_cwd = '.'
+    result_key = json.dumps([relative_cwd, list(args)])
+
+    with _cache_lock:
+        cache = _load_cache(worktree_root)
+        if cache.get('key') == compute_state_key(repository):
+            entry = cache['results'].get(result_key)
+            if entry is not None and _is_fresh(entry, changed_paths, max_age):
+                return {'returncode': entry['returncode'], 'stdout': entry['stdout']}
+
+    computed_at = time.time()
+    try:
+        completed = subprocess.run(
+            ['git', *args], capture_output=True, text=True, cwd=cwd, timeout=timeout
+        )
+        returncode, stdout = completed.returncode, completed.stdout
+    except Exception:
+        return {'returncode': 1, 'stdout': ''}
+
+    # git status may refresh .git/index itself, so key the entry on the state after the run
+    with _cache_lock:
+        cache = _load_cache(worktree_root)
+        key = compute_state_key(repository)
+        if cache.get('key') != key:
+            cache = {'key': key, 'results': {}}
+        cache['results'][result_key] = {
+            'returncode': returncode,
+            'stdout': stdout,
+            'computed_at': computed_at
+        }
+        _save_cache(worktree_root, cache)
+
+    return {'returncode': returncode, 'stdout': stdout}
+
+
+def get_porcelain_status(cwd=None, changed_paths=None):
+    """`git status --porcelain` output (stripped), '' when clean or not a repository"""
+    result = run_git(['status', '--porcelain'], cwd=cwd, changed_paths=changed_paths)
+    return result['stdout'].strip() if result['returncode'] == 0 else ""
+
+
+def invalidate(cwd=None):
+    """Drop cached results for the repository containing cwd"""
+    repository = find_repository(cwd)
+    if repository is None:
+        return
+    worktree_root = repository[0]
+    with _cache_lock:
+        _memory_cache.pop(str(worktree_root), None)
+        try:
+            _cache_file(worktree_root).unlink()
+        except OSError:
+            pass
+
+
+@hook_timing.staged('git_probe')
+def probe_repository(cwd=None, since=None, timeout=GIT_TIMEOUT_SECONDS, max_age=MAX_AGE_SECONDS):
+    """
+    Structured git state for cwd, with every git command run concurrently.
+
+    since: `git log --since` value for recent_commits (omitted when None).
+    timeout: shared deadline in seconds for all probes; probes that miss it are
+    listed in 'timed_out' and keep their empty defaults.
+    max_age: accept cached results up to this many seconds old.
+    """
+    cwd = cwd or os.getcwd()
+    repository = find_repository(cwd)
+    probe = {
+        'is_repository': repository is not None,
+        'branch': get_current_branch(cwd),
+        'status': '',
+        'change_count': 0,
+        'recent_commits': '',
+        'last_commit': '',
+        'user_name': '',
+        'user_email': '',
+        'timed_out': []
+    }
+    if repository is None:
+        return probe
+
+    commands = {
+        'status': ['status', '--porcelain'],
+        'last_commit': ['log', '-1', '--pretty=format:%h %s (%cr)'],
+        'user': ['config', '--get-regexp', r'^user\.(name|email)$'],
+    }
+    if since is not None:
+        commands['recent_commits'] = ['log', '--oneline', '--since', since]
+
+    executor = ThreadPoolExecutor(max_workers=len(commands))
+    futures = {
+        name: executor.submit(run_git, args, cwd=cwd, timeout=timeout, max_age=max_age)
+        for name, args in commands.items()
+    }
+    wait(futures.values(), timeout=timeout)
+    executor.shutdown(wait=False)
+
+    results = {}
+    for name, future in futures.items():
+        if future.done():
+            results[name] = future.result()
+        else:
+            probe['timed_out'].append(name)
+
+    def output(name):
+        result = results.get(name)
+        return result['stdout'].strip() if result and result['returncode'] == 0 else ''
+
+    probe['status'] = output('status')
+    probe['change_count'] = len(probe['status'].split('\n')) if probe['status'] else 0
+    probe['recent_commits'] = output('recent_commits')
+    probe['last_commit'] = output('last_commit')
+    for line in output('user').split('\n'):
+        config_key, _, value = line.partition(' ')
+        if config_key == 'user.name':
+            probe['user_name'] = value.strip()
+        elif config_key == 'user.email':
+            probe['user_email'] = value.strip()
+
+    return probe
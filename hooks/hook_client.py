@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# /// script
+# dependencies = ["json", "sys", "os", "socket", "subprocess"]
+# ///
+
+"""
+Claude Code Hook Client
+
+Thin stdin/stdout shim in front of hook_daemon.py. Configure Claude Code to run
+`hook_client.py <hook_name>` instead of `<hook_name>.py`: the client forwards the
+stdin payload to the warm daemon and relays the hook's JSON output, stderr and
+exit code unchanged.
+
+Deliberately imports nothing beyond socket/json so its cost is bare interpreter
+startup (run it with `python3 -S` to skip site-packages as well); the daemon
+round trip itself is single-digit milliseconds.
+
+When the daemon is not running the client executes hooks/<hook_name>.py directly,
+so hooks keep working; with CLAUDE_HOOK_DAEMON_AUTOSTART=1 it also starts the
+daemon in the background for subsequent tool calls.
+
+Exit Codes:
+- 0/1/2: Relayed unchanged from the hook
+- 1: Client usage error
+"""
+
+import json
+import sys
+import os
+import socket
+import subprocess
+
+
+HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+CLIENT_TIMEOUT_SECONDS = 30
+
+
+def get_socket_path():
+    """Get the daemon socket path (kept in sync with hook_daemon.py)"""
+    override = os.environ.get('CLAUDE_HOOK_DAEMON_SOCKET')
+    if override:
+        return override
+    return os.path.join(os.path.expanduser('~'), '.claude', 'run', 'hook-daemon.sock')
+
+
+def connect_to_daemon():
+    """Connect to the daemon socket, or return None if it is not running"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CLIENT_TIMEOUT_SECONDS)
+    try:
+        sock.connect(get_socket_path())
+        return sock
+    except OSError:
+        sock.close()
+        return None
+
+
+def start_daemon_in_background():
+    """Spawn hook_daemon.py detached from this process"""
+    try:
+        subprocess.Popen(
+            [sys.executable, os.path.join(HOOKS_DIR, 'hook_daemon.py'), '--idle-timeout', '3600'],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+    except Exception as e:
+        print(f"DEBUG: Could not start hook daemon: {e}", file=sys.stderr)
+
+
+def hook_script_path(hook_name):
+    return os.path.join(HOOKS_DIR, f"{hook_name}.py")
+
+
+def exec_hook_directly(hook_name):
+    """Replace this process with the standalone hook (stdin is still unread)"""
+    script = hook_script_path(hook_name)
+    os.execv(sys.executable, [sys.executable, script])
+
+
+def run_hook_with_payload(hook_name, payload):
+    """Run the standalone hook with an already-consumed stdin payload"""
+    result = subprocess.run(
+        [sys.executable, hook_script_path(hook_name)],
+        input=payload or '', capture_output=True, text=True
+    )
+    return {'exit_code': result.returncode, 'stdout': result.stdout, 'stderr': result.stderr}
+
+
+def request_from_daemon(sock, hook_name, payload):
+    """Send one hook invocation to the daemon and return its response"""
+    # Hooks run with the caller's working directory and environment (e.g. CLAUDE_PROJECT_DIR)
+    request = {'hook': hook_name, 'cwd': os.getcwd(), 'env': dict(os.environ), 'stdin': payload}
+    with sock:
+        sock.sendall(json.dumps(request).encode('utf-8'))
+        sock.shutdown(socket.SHUT_WR)
+
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+
+    return json.loads(b''.join(chunks).decode('utf-8'))
+
+
+def main():
+    """Main client execution"""
+    if len(sys.argv) != 2 or not sys.argv[1].replace('_', '').isalnum():
+        print("Usage: hook_client.py <hook_name>", file=sys.stderr)
+        sys.exit(1)
+
+    hook_name = sys.argv[1]
+
+    sock = connect_to_daemon()
+    if sock is None:
+        if os.environ.get('CLAUDE_HOOK_DAEMON_AUTOSTART') == '1':
+            start_daemon_in_background()
+        exec_hook_directly(hook_name)
+
+    payload = None if sys.stdin.isatty() else sys.stdin.read()
+
+    try:
+        response = request_from_daemon(sock, hook_name, payload)
+    except (OSError, ValueError) as e:
+        # Daemon went away mid-request: fall back to the standalone hook
+        print(f"DEBUG: Hook daemon request failed, running hook directly: {e}", file=sys.stderr)
+        response = run_hook_with_payload(hook_name, payload)
+
+    sys.stdout.write(response.get('stdout', ''))
+    sys.stderr.write(response.get('stderr', ''))
+    sys.stdout.flush()
+    sys.exit(response.get('exit_code', 1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+# /// script
+# dependencies = ["pathlib", "json", "sys", "os", "io", "socketserver", "threading", "importlib", "fcntl"]
+# ///
+
+"""
+Claude Code Hook Daemon
+
+Long-lived hook server that keeps every hook module loaded and warm behind a
+Unix domain socket, so tool calls no longer pay interpreter startup, imports
+and JSON setup once per hook script. hook_client.py is the matching stdin/stdout
+shim that Claude Code invokes instead of the hook scripts themselves.
+
+Protocol (one request per connection):
+- Client sends a JSON object {"hook": name, "cwd": path, "env": {...},
+  "stdin": payload} and shuts down its write side (payload is null when stdin
+  is a TTY)
+- Daemon replies with {"exit_code": int, "stdout": str, "stderr": str}
+
+Hooks run exactly as they would standalone: main() reads the forwarded stdin,
+prints its JSON result and calls sys.exit(), and the daemon relays all three.
+Hook scripts are reloaded automatically when their file changes on disk.
+
+Hooks run concurrently, one thread per connection:
+- stdin/stdout/stderr are per-thread (see ThreadLocalStream)
+- runs of the same session (the payload's session_id) are serialized, since
+  they share per-session state such as scan and side-effect queues
+- the working directory and environment are process-wide, so runs for the
+  client's cwd and env share them, and a run needing a different cwd or env
+  waits until the runs in progress finish (see ProcessContext)
+
+Exit Codes:
+- 0: Daemon stopped cleanly (or another daemon already owns the socket)
+- 1: Daemon failed to start
+"""
+
+import json
+import sys
+import os
+import io
+import fcntl
+import socketserver
+import threading
+import importlib.util
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from datetime import datetime
+
+
+HOOKS_DIR = Path(__file__).resolve().parent
+if str(HOOKS_DIR) not in sys.path:
+    sys.path.insert(0, str(HOOKS_DIR))
+
+# Hook scripts the daemon is allowed to serve (module name == script stem)
+SERVED_HOOKS = (
+    'session_start',
+    'user_prompt_submit',
+    'pre_tool_use',
+    'combined_pre_tool_use',
+    'post_tool_use',
+    'user_prompt_agent_enforcer',
+    'framework_enforcement_session_start',
+    'error_attention_pre_tool_use',
+    'error_attention_post_tool_use',
+    'error_attention_user_prompt_submit',
+    'error_attention_notification',
+)
+
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+
+
+def get_socket_path():
+    """Get the daemon socket path (kept in sync with hook_client.py)"""
+    override = os.environ.get('CLAUDE_HOOK_DAEMON_SOCKET')
+    if override:
+        return Path(override)
+    return Path.home() / '.claude' / 'run' / 'hook-daemon.sock'
+
+
+class TTYStringIO(io.StringIO):
+    """Empty stdin stand-in for clients that were attached to a terminal"""
+
+    def isatty(self):
+        return True
+
+
+class HookRegistry:
+    """Loads hook modules once and reloads them when their script changes"""
+
+    def __init__(self, hooks_dir=HOOKS_DIR):
+        self.hooks_dir = Path(hooks_dir)
+        self.modules = {}
+        self.mtimes = {}
+        self.lock = threading.Lock()
+
+    def get(self, hook_name):
+        """Return the loaded module for hook_name, loading or reloading as needed"""
+        if hook_name not in SERVED_HOOKS:
+            raise KeyError(f"Unknown hook: {hook_name}")
+
+        script_path = self.hooks_dir / f"{hook_name}.py"
+        mtime = script_path.stat().st_mtime
+
+        with self.lock:
+            if hook_name not in self.modules or self.mtimes.get(hook_name) != mtime:
+                spec = importlib.util.spec_from_file_location(hook_name, script_path)
+                module = importlib.util.module_from_spec(spec)
+                sys.modules[hook_name] = module
+                spec.loader.exec_module(module)
+                self.modules[hook_name] = module
+                self.mtimes[hook_name] = mtime
+            return self.modules[hook_name]
+
+    def preload(self):
+        """Import every served hook up front so the first tool call is warm"""
+        loaded = []
+        for hook_name in SERVED_HOOKS:
+            try:
+                self.get(hook_name)
+                loaded.append(hook_name)
+            except Exception as e:
+                print(f"DEBUG: Could not preload {hook_name}: {e}", file=sys.stderr)
+        return loaded
+
+
+def exit_code_from_system_exit(exc, stderr):
+    """Translate a SystemExit raised by a hook into the process exit code it implies"""
+    code = exc.code
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=stderr)
+    return 1
+
+
+class ThreadLocalStream:
+    """Stands in for sys.stdin/stdout/stderr: each hook thread gets its own stream"""
+
+    def __init__(self, default):
+        self._default = default
+        self._local = threading.local()
+
+    def set(self, stream):
+        self._local.stream = stream
+
+    def reset(self):
+        self._local.stream = None
+
+    def current(self):
+        return getattr(self._local, 'stream', None) or self._default
+
+    def __getattr__(self, name):
+        return getattr(self.current(), name)
+
+    def __iter__(self):
+        return iter(self.current())
+
+
+_streams = None
+_streams_lock = threading.Lock()
+
+
+def install_thread_local_streams():
+    """Replace sys.stdin/stdout/stderr with per-thread streams (once)"""
+    global _streams
+    with _streams_lock:
+        if _streams is None:
+            _streams = tuple(ThreadLocalStream(stream) for stream in (sys.stdin, sys.stdout, sys.stderr))
+            sys.stdin, sys.stdout, sys.stderr = _streams
+    return _streams
+
+
+class ProcessContext:
+    """
+    Working directory and environment of the hook runs in progress. Runs for
+    the same ones share them; a run needing different ones waits until the
+    process is idle, and runs for the current ones do not jump ahead of it.
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.environ = dict(os.environ)  # The daemon's own, for clients that send none
+        self.current = None
+        self.active = 0
+        self.waiting = Counter()
+
+    @contextmanager
+    def use(self, cwd, env):
+        env = env if env is not None else self.environ
+        key = (cwd or '', tuple(sorted(env.items())))
+        with self.condition:
+            self.waiting[key] += 1
+            try:
+                while not (self.active == 0 or
+                           (key == self.current and sum(self.waiting.values()) == self.waiting[key])):
+                    self.condition.wait()
+            finally:
+                self.waiting[key] -= 1
+                if not self.waiting[key]:
+                    del self.waiting[key]
+            if key != self.current:
+                self.current = None
+                os.environ.clear()
+                os.environ.update(env)
+                if cwd:
+                    os.chdir(cwd)
+                self.current = key
+            self.active += 1
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.active -= 1
+                self.condition.notify_all()
+
+
+_process_context = ProcessContext()
+_session_locks = {}
+_session_locks_lock = threading.Lock()
+
+
+def session_lock(payload):
+    """Lock serializing the runs of the session a hook payload belongs to"""
+    try:
+        session_id = json.loads(payload).get('session_id') if payload else None
+    except (ValueError, AttributeError):
+        session_id = None
+    with _session_locks_lock:
+        return _session_locks.setdefault(session_id, threading.Lock())
+
+
+def run_hook(registry, hook_name, payload, cwd, env=None):
+    """Run a hook's main() in-process with redirected stdio and return its outcome"""
+    stdin = TTYStringIO() if payload is None else io.StringIO(payload)
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    exit_code = 0
+    streams = install_thread_local_streams()
+
+    with session_lock(payload):
+        for stream, redirected in zip(streams, (stdin, stdout, stderr)):
+            stream.set(redirected)
+        try:
+            with _process_context.use(cwd, env):
+                module = registry.get(hook_name)
+                module.main()
+        except SystemExit as e:
+            exit_code = exit_code_from_system_exit(e, stderr)
+        except Exception as e:
+            print(f"Hook execution error: {e}", file=stderr)
+            exit_code = 1
+        finally:
+            for stream in streams:
+                stream.reset()
+
+    return {
+        'exit_code': exit_code,
+        'stdout': stdout.getvalue(),
+        'stderr': stderr.getvalue()
+    }
+
+
+class HookRequestHandler(socketserver.StreamRequestHandler):
+    """Handles one hook invocation per connection"""
+
+    def handle(self):
+        raw = self.rfile.read(MAX_REQUEST_BYTES)
+        try:
+            request = json.loads(raw.decode('utf-8'))
+            hook_name = request['hook']
+            response = run_hook(
+                self.server.registry, hook_name, request.get('stdin'), request.get('cwd'), request.get('env')
+            )
+        except Exception as e:
+            response = {
+                'exit_code': 1,
+                'stdout': '',
+                'stderr': f"Hook daemon error: {e}\n"
+            }
+
+        self.server.touch()
+        self.wfile.write(json.dumps(response).encode('utf-8'))
+
+
+class HookDaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server holding the warm hook registry"""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path, registry):
+        self.registry = registry
+        self.last_activity = datetime.now()
+        super().__init__(str(socket_path), HookRequestHandler)
+
+    def touch(self):
+        self.last_activity = datetime.now()
+
+    def idle_seconds(self):
+        return (datetime.now() - self.last_activity).total_seconds()
+
+
+def acquire_daemon_lock(socket_path):
+    """Take the single-instance lock next to the socket; None if another daemon holds it"""
+    lock_path = Path(f"{socket_path}.lock")
+    lock_file = open(lock_path, 'w')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    lock_file.write(str(os.getpid()))
+    lock_file.flush()
+    return lock_file
+
+
+def serve(socket_path=None, idle_timeout=0):
+    """Start the daemon and serve until interrupted or idle for idle_timeout seconds"""
+    socket_path = Path(socket_path) if socket_path else get_socket_path()
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+
+    lock_file = acquire_daemon_lock(socket_path)
+    if lock_file is None:
+        print(f"Hook daemon already running on {socket_path}", file=sys.stderr)
+        return 0
+
+    try:
+        # A socket file left behind by a crashed daemon is safe to remove while we hold the lock
+        if socket_path.exists():
+            socket_path.unlink()
+
+        registry = HookRegistry()
+        loaded = registry.preload()
+
+        server = HookDaemonServer(socket_path, registry)
+        os.chmod(socket_path, 0o600)
+
+        print(json.dumps({
+            'daemon': 'hook_daemon',
+            'socket': str(socket_path),
+            'pid': os.getpid(),
+            'hooks_loaded': loaded,
+            'started': datetime.now().isoformat()
+        }), file=sys.stderr)
+
+        if idle_timeout > 0:
+            def watch_idle():
+                while True:
+                    threading.Event().wait(min(idle_timeout, 5))
+                    if server.idle_seconds() >= idle_timeout:
+                        server.shutdown()
+                        return
+            threading.Thread(target=watch_idle, daemon=True).start()
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            if socket_path.exists():
+                socket_path.unlink()
+        return 0
+
+    except Exception as e:
+        print(f"Hook daemon failed to start: {e}", file=sys.stderr)
+        return 1
+    finally:
+        lock_file.close()
+
+
+def main():
+    """Main daemon entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Claude Code hook daemon')
+    parser.add_argument('--socket', help='Unix socket path (default: ~/.claude/run/hook-daemon.sock)')
+    parser.add_argument('--idle-timeout', type=float, default=0,
+                        help='Exit after this many idle seconds (default: never)')
+    args = parser.parse_args()
+
+    sys.exit(serve(args.socket, args.idle_timeout))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# /// script
+# dependencies = ["time", "threading"]
+# ///
+
+"""
+Claude Code Hook Support: Deadline-Aware Check Scheduler
+
+Hooks run inside the agent loop, so a slow git call or a large file read stalls
+every tool call. run_checks() gives a hook an overall latency budget:
+- Each check declares a cost class (expected duration) and a priority
+- Blocking checks always run, first, because their outcome decides the exit code
+- Advisory checks then run in priority order while the remaining budget covers
+  their expected cost; the rest are skipped and reported as 'skipped_checks'
+  in the hook's JSON output
+- An advisory check is only waited for until the budget runs out: one still
+  running then is abandoned (it finishes in a daemon thread, which does not
+  keep the hook process alive) and reported as skipped as well
+
+Checks are plain callables taking no arguments (use a lambda to bind inputs),
+so later checks can consume the results of earlier ones. Each check that runs
+is timed as a stage of the hook run (see hook_timing).
+"""
+
+import time
+import threading
+
+import hook_timing
+
+
+# Expected duration per cost class, in seconds
+COST_CLASSES = {
+    'cpu': 0.001,         # Pure computation on the payload
+    'filesystem': 0.02,   # A handful of stat/glob/read calls
+    'subprocess': 0.15,   # Spawns a process (e.g. git on a cache miss)
+    'import': 0.25        # Loads an external module
+}
+
+DEFAULT_BUDGET_SECONDS = 0.5
+
+
+def check(name, function, cost='cpu', priority=50, blocking=False):
+    """Declare a hook check; lower priority numbers run first"""
+    if cost not in COST_CLASSES:
+        raise ValueError(f"Unknown cost class: {cost}")
+    return {
+        'name': name,
+        'function': function,
+        'cost': cost,
+        'priority': priority,
+        'blocking': blocking
+    }
+
+
+def _run_with_timeout(function, timeout):
+    """(True, return value) if function finishes within timeout seconds, else (False, None)"""
+    outcome = {}
+
+    def run():
+        try:
+            outcome['value'] = function()
+        except BaseException as e:
+            outcome['error'] = e
+
+    thread = threading.Thread(target=run, name='hook-check', daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        return False, None
+    if 'error' in outcome:
+        raise outcome['error']
+    return True, outcome['value']
+
+
+def run_checks(checks, budget_seconds=DEFAULT_BUDGET_SECONDS):
+    """
+    Run checks within budget_seconds.
+
+    Returns {'results': {name: return value}, 'skipped_checks': [...],
+    'budget_ms': float, 'elapsed_ms': float}. Skipped checks (not started, or
+    abandoned at the deadline) have no entry in results. Exceptions raised by a
+    check propagate to the hook, as before.
+    """
+    started = time.monotonic()
+    deadline = started + budget_seconds
+    ordered = sorted(checks, key=lambda c: (not c['blocking'], c['priority']))
+
+    results = {}
+    skipped = []
+    for entry in ordered:
+        if entry['blocking']:
+            with hook_timing.stage(entry['name']):
+                results[entry['name']] = entry['function']()
+            continue
+
+        remaining = deadline - time.monotonic()
+        if remaining < COST_CLASSES[entry['cost']]:
+            reason = 'latency budget exhausted'
+        else:
+            with hook_timing.stage(entry['name']):
+                finished, value = _run_with_timeout(entry['function'], remaining)
+            if finished:
+                results[entry['name']] = value
+                continue
+            reason = 'latency budget exceeded while running'
+        skipped.append({
+            'name': entry['name'],
+            'cost': entry['cost'],
+            'priority': entry['priority'],
+            'reason': reason,
+            'remaining_ms': round(max(remaining, 0) * 1000, 1)
+        })
+
+    return {
+        'results': results,
+        'skipped_checks': skipped,
+        'budget_ms': round(budget_seconds * 1000, 1),
+        'elapsed_ms': round((time.monotonic() - started) * 1000, 1)
+    }
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# /// script
+# dependencies = ["pathlib", "json", "sys", "os", "fcntl", "math", "time", "functools", "contextlib"]
+# ///
+
+"""
+Claude Code Hook Support: Hook and Stage Latency Histograms
+
+Every served hook's main() is wrapped with @timed(hook_name), which measures
+the wall time of the whole run; stages inside it (input parsing, git probes,
+each validator, scheduled checks and queued side effects) are measured with
+@staged() / stage() / record_stage(). A stage's time is summed per run, and
+nested or concurrent entries of the same stage are counted once. Runs are
+tracked per thread, so hook_daemon.py can run hooks concurrently; helper
+threads of a run (e.g. concurrent git probes) record into it while it is the
+only run in progress.
+
+At the end of a run its times are merged into log-bucketed histograms (bucket
+i covers MIN_MS * GROWTH**i up to MIN_MS * GROWTH**(i+1), so percentiles are
+within half a bucket, about 9%). Each hook has one histogram file under
+~/.claude/system/dashboard/data/hook_latency, updated under a per-hook lock
+and replaced atomically, so concurrent hook processes merge their runs
+instead of overwriting each other. The dashboard metrics report them as
+hook_performance; `python3 hook_timing.py` prints the slowest hooks and stages.
+
+Timing never fails a hook: errors while saving are ignored.
+"""
+
+import json
+import sys
+import os
+import fcntl
+import math
+import time
+import threading
+import functools
+from contextlib import contextmanager
+from pathlib import Path
+
+
+MIN_MS = 0.01
+GROWTH = 2 ** 0.25
+
+PERCENTILES = (50, 95, 99)
+
+# Exit codes hooks use on purpose (0 ok, 1 warning, 2 blocking)
+HOOK_EXIT_CODES = (None, 0, 1, 2)
+
+# Timing of the hook runs in progress, by thread: {'hook', 'stages': {name: ms}, 'open': set()}
+_runs = {}
+
+
+def _current_run():
+    run = _runs.get(threading.get_ident())
+    if run is None:
+        runs = list(_runs.values())
+        if len(runs) == 1:
+            run = runs[0]  # A helper thread of the only run in progress
+    return run
+
+
+def get_latency_dir():
+    """Directory of the per-hook histogram files"""
+    return Path.home() / '.claude' / 'system' / 'dashboard' / 'data' / 'hook_latency'
+
+
+def new_histogram():
+    return {'count': 0, 'sum_ms': 0.0, 'min_ms': None, 'max_ms': None, 'buckets': {}}
+
+
+def bucket_of(ms):
+    if ms <= MIN_MS:
+        return 0
+    return int(math.log(ms / MIN_MS, GROWTH))
+
+
+def observe(histogram, ms):
+    """Add one measurement (milliseconds)"""
+    bucket = str(bucket_of(ms))
+    histogram['buckets'][bucket] = histogram['buckets'].get(bucket, 0) + 1
+    histogram['count'] += 1
+    histogram['sum_ms'] += ms
+    histogram['min_ms'] = ms if histogram['min_ms'] is None else min(histogram['min_ms'], ms)
+    histogram['max_ms'] = ms if histogram['max_ms'] is None else max(histogram['max_ms'], ms)
+
+
+def merge(into, other):
+    """Add the measurements of histogram other to histogram into"""
+    for bucket, count in other['buckets'].items():
+        into['buckets'][bucket] = into['buckets'].get(bucket, 0) + count
+    into['count'] += other['count']
+    into['sum_ms'] += other['sum_ms']
+    for field, pick in (('min_ms', min), ('max_ms', max)):
+        values = [value for value in (into[field], other[field]) if value is not None]
+        into[field] = pick(values) if values else None
+    return into
+
+
+def percentile(histogram, q):
+    """Approximate q-th percentile in milliseconds (None when empty)"""
+    if not histogram['count']:
+        return None
+    rank = max(1, math.ceil(histogram['count'] * q / 100))
+    seen = 0
+    for bucket in sorted(histogram['buckets'], key=int):
+        seen += histogram['buckets'][bucket]
+        if seen >= rank:
+            # Geometric middle of the bucket, kept within the observed range
+            value = MIN_MS * GROWTH ** (int(bucket) + 0.5)
+            return min(max(value, histogram['min_ms']), histogram['max_ms'])
+    return histogram['max_ms']
+
+
+def summarize(histogram):
+    """count, mean and percentiles of a histogram, rounded for display"""
+    summary = {'count': histogram['count']}
+    if histogram['count']:
+        summary['mean_ms'] = round(histogram['sum_ms'] / histogram['count'], 2)
+        for q in PERCENTILES:
+            summary[f'p{q}_ms'] = round(percentile(histogram, q), 2)
+        summary['max_ms'] = round(histogram['max_ms'], 2)
+    return summary
+
+
+def record_stage(name, elapsed_ms):
+    """Add elapsed_ms to a stage of the hook run in progress (no-op outside a run)"""
+    run = _current_run()
+    if run is not None:
+        run['stages'][name] = run['stages'].get(name, 0.0) + elapsed_ms
+
+
+@contextmanager
+def stage(name):
+    """Measure the enclosed block as a stage of the hook run in progress"""
+    run = _current_run()
+    if run is None or name in run['open']:
+        yield
+        return
+    run['open'].add(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        run['open'].discard(name)
+        record_stage(name, (time.perf_counter() - started) * 1000)
+
+
+def staged(name=None):
+    """Decorator: measure every call of the function as a stage (default: its name)"""
+    def decorate(function):
+        stage_name = name or function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with stage(stage_name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def timed(hook_name):
+    """
+    Decorator for a hook's main(): time the run and save it when main returns,
+    exits or raises. A run fails when it raises or exits with a code hooks do
+    not use on purpose.
+    """
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            thread = threading.get_ident()
+            if thread in _runs:
+                return function(*args, **kwargs)  # Called from another timed hook
+
+            run = _runs[thread] = {'hook': hook_name, 'stages': {}, 'open': set()}
+            started = time.perf_counter()
+            ok = False
+            try:
+                result = function(*args, **kwargs)
+                ok = True
+                return result
+            except SystemExit as e:
+                ok = e.code in HOOK_EXIT_CODES
+                raise
+            finally:
+                del _runs[thread]
+                try:
+                    save_run(hook_name, (time.perf_counter() - started) * 1000, run['stages'], ok)
+                except Exception:
+                    pass
+        return wrapper
+    return decorate
+
+
+def save_run(hook_name, total_ms, stages, ok=True, directory=None):
+    """Merge one run into the hook's histogram file"""
+    directory = Path(directory) if directory else get_latency_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    histogram_file = directory / f"{hook_name}.json"
+
+    with open(directory / f"{hook_name}.lock", 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        data = load_hook(histogram_file) or {'runs': 0, 'failures': 0, 'total': new_histogram(), 'stages': {}}
+        data['runs'] += 1
+        if not ok:
+            data['failures'] += 1
+        observe(data['total'], total_ms)
+        for name, elapsed_ms in stages.items():
+            observe(data['stages'].setdefault(name, new_histogram()), elapsed_ms)
+
+        temp_file = histogram_file.with_suffix(f'.{os.getpid()}.tmp')
+        with open(temp_file, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(temp_file, histogram_file)
+
+
+def load_hook(histogram_file):
+    try:
+        with open(histogram_file, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def load_histograms(directory=None):
+    """{hook_name: {'runs', 'failures', 'total', 'stages'}} of every hook measured"""
+    directory = Path(directory) if directory else get_latency_dir()
+    histograms = {}
+    try:
+        names = sorted(os.listdir(directory))
+    except FileNotFoundError:
+        return histograms
+    for name in names:
+        if name.endswith('.json'):
+            data = load_hook(directory / name)
+            if data is not None:
+                histograms[name[:-len('.json')]] = data
+    return histograms
+
+
+def hook_performance(directory=None):
+    """Dashboard hook_performance section: totals plus per-hook and per-stage percentiles"""
+    histograms = load_histograms(directory)
+    overall = new_histogram()
+    runs = failures = 0
+    hooks = {}
+    for hook_name, data in histograms.items():
+        merge(overall, data['total'])
+        runs += data['runs']
+        failures += data['failures']
+        hooks[hook_name] = {
+            'runs': data['runs'],
+            'failures': data['failures'],
+            'total': summarize(data['total']),
+            'stages': {name: summarize(histogram) for name, histogram in data['stages'].items()}
+        }
+
+    return {
+        'total_hook_executions': runs,
+        'hook_success_rate': round(100.0 * (runs - failures) / runs, 1) if runs else 100.0,
+        'average_execution_time': round(overall['sum_ms'] / overall['count'], 2) if overall['count'] else 0.0,
+        'latency': summarize(overall),
+        'hooks': hooks
+    }
+
+
+def main():
+    """Print hooks and their stages, slowest p95 first"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Show hook and stage latency percentiles')
+    parser.add_argument('--directory', help='Histogram directory (default: ~/.claude/system/dashboard/data/hook_latency)')
+    args = parser.parse_args()
+
+    performance = hook_performance(args.directory)
+    if not performance['hooks']:
+        print("No hook runs recorded yet")
+        return 0
+
+    print(f"{'hook / stage':<55} {'runs':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    by_p95 = lambda item: item[1].get('p95_ms', 0)
+    hooks = sorted(performance['hooks'].items(), key=lambda item: by_p95((None, item[1]['total'])), reverse=True)
+    for hook_name, hook in hooks:
+        rows = [(hook_name, hook['total'])]
+        rows += [(f"  {name}", summary) for name, summary in sorted(hook['stages'].items(), key=by_p95, reverse=True)]
+        for label, summary in rows:
+            print(f"{label:<55} {summary['count']:>7} {summary.get('p50_ms', 0):>9.2f} "
+                  f"{summary.get('p95_ms', 0):>9.2f} {summary.get('p99_ms', 0):>9.2f}")
+    print(f"\nSuccess rate: {performance['hook_success_rate']}%  "
+          f"Average: {performance['average_execution_time']} ms over {performance['total_hook_executions']} runs")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
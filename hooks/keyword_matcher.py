@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# /// script
+# dependencies = ["re"]
+# ///
+
+"""
+Claude Code Hook Support: Compiled Multi-Keyword Matcher
+
+Hooks classify prompts, notifications and conversation contexts by checking a
+table of keyword lists. Checking each keyword with its own `in` test or regex
+costs O(keywords x text), and conversation contexts reach hundreds of KB.
+
+KeywordMatcher is built once per table and finds every keyword of every
+category in one call, returning {category: [keywords]}:
+- Keywords shared between categories are only searched for once
+- All keywords are compiled into one trie-shaped regex, so the whole table
+  costs a single pass over the text instead of one search per keyword: a
+  zero-width lookahead finds the longest keyword starting at each position
+  (overlapping matches included), and the keywords that are prefixes of it
+  match there too
+- word_boundary=True reproduces r'\\b' + re.escape(keyword) + r'\\b' matching by
+  anchoring the alternation with r'\\b'; plain substring matching leaves it
+  unanchored
+- The scan stops early once every keyword has been found
+- The result of the last call is kept, so several validators scanning the same
+  (immutable) context string share it
+"""
+
+import re
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == '_'
+
+
+def _build_trie_pattern(keywords):
+    """Regex alternation shaped like a trie, so each position costs O(keyword length)"""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def render(node):
+        terminal = '' in node
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if terminal:
+            return '(?:' + '|'.join(branches) + ')?'
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+
+    return render(trie)
+
+
+class KeywordMatcher:
+    """Finds every keyword of a {category: [keywords]} table in one scan"""
+
+    def __init__(self, tables, word_boundary=False):
+        self.tables = {category: list(keywords) for category, keywords in tables.items()}
+        self.word_boundary = word_boundary
+
+        keywords = sorted({keyword for words in self.tables.values() for keyword in words if keyword})
+        self._keyword_count = len(keywords)
+
+        # Longest keyword per position, plus the keywords that are prefixes of it
+        self._prefixes = {
+            keyword: [other for other in keywords if keyword.startswith(other)]
+            for keyword in keywords
+        }
+        boundary = r'\b' if word_boundary else ''
+        trie_pattern = boundary + '(' + (_build_trie_pattern(keywords) if keywords else '(?!)') + ')' + boundary
+        self._search_pattern = re.compile(trie_pattern)
+        self._scan_pattern = re.compile('(?=' + trie_pattern + ')')
+
+        # (text, found) of the last call, as one value so concurrent callers never mix them
+        self._last = (None, frozenset())
+
+    def find(self, text):
+        """Set of keywords occurring in text"""
+        last_text, last_found = self._last
+        if text is last_text:
+            return last_found
+
+        found = self._find_keywords(text)
+
+        found = frozenset(found)
+        self._last = (text, found)
+        return found
+
+    def _find_keywords(self, text):
+        found = set()
+        for match in self._scan_pattern.finditer(text):
+            longest = match.group(1)
+            for keyword in self._prefixes[longest]:
+                if keyword in found:
+                    continue
+                if self.word_boundary and len(keyword) < len(longest):
+                    # A shorter keyword still needs its own trailing word boundary
+                    if _is_word_char(keyword[-1]) == _is_word_char(longest[len(keyword)]):
+                        continue
+                found.add(keyword)
+            if len(found) == self._keyword_count:
+                break
+        return found
+
+    def scan(self, text):
+        """{category: [keywords found, in table order]} for every category with a hit"""
+        found = self.find(text)
+        hits = {}
+        for category, keywords in self.tables.items():
+            category_hits = [keyword for keyword in keywords if keyword in found]
+            if category_hits:
+                hits[category] = category_hits
+        return hits
+
+    def contains(self, text):
+        """True if any keyword occurs in text (stops at the first hit)"""
+        return self._search_pattern.search(text) is not None
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # /// script
-# dependencies = ["pathlib", "json", "sys", "os", "datetime", "subprocess"]
+# dependencies = ["pathlib", "json", "sys", "os", "time", "importlib", "datetime"]
 # ///
 
 """
@@ -13,6 +13,12 @@ Automatic framework maintenance after tool execution including:
 - Update documentation references
 - Cleanup and optimization tasks
 
+Only the structure validation (which decides the exit code) runs inline. The
+other maintenance tasks are side effects: they are enqueued on a durable spool
+(see side_effect_queue) and drained by a detached worker, started as
+`post_tool_use.py --drain-side-effects`, which coalesces duplicate work. If the
+spool is unavailable they run inline within the latency budget instead.
+
 Exit Codes:
 - 0: Success, maintenance completed
 - 1: Non-blocking warning, maintenance partially completed
@@ -22,11 +28,36 @@ Exit Codes:
 import json
 import sys
 import os
-import subprocess
+import time
+import importlib
 from pathlib import Path
 from datetime import datetime
 
+import git_state
+import hook_scheduler
+import hook_timing
+import side_effect_queue
+
+
+# Overall latency budget for the maintenance checks of one tool call
+CHECK_BUDGET_SECONDS = 0.5
+
+SIDE_EFFECT_QUEUE = 'post_tool_use'
 
+# Dashboard updater entry point, loaded once per process (see load_dashboard_updater)
+_dashboard_updater = {}
+
+MAINTENANCE_ORDER = [
+    'update_system_indices',
+    'validate_framework_structure',
+    'maintain_git_workflow',
+    'update_documentation_references',
+    'cleanup_and_optimize',
+    'update_dashboard_metrics'
+]
+
+
+@hook_timing.staged('parse_input')
 def load_hook_data():
     """Load and validate hook data from stdin - fallback to defaults if no input"""
     try:
@@ -163,6 +194,7 @@ def update_system_indices(modified_files):
     return actions
 
 
+@hook_timing.staged()
 def validate_framework_structure():
     """Validate framework structure integrity"""
     claude_dir = get_claude_directory()
@@ -205,18 +237,19 @@ def validate_framework_structure():
     return validations, warnings
 
 
-def maintain_git_workflow(tool_result):
+def maintain_git_workflow(tool_result, modified_files=None, tool_name='', cwd=None):
     """Maintain git workflow consistency"""
     actions = []
-    
+
     try:
-        # Check if there are uncommitted changes
-        result = subprocess.run(
-            ['git', 'status', '--porcelain'],
-            capture_output=True, text=True, cwd=os.getcwd()
-        )
-        
-        if result.returncode == 0 and result.stdout.strip():
+        # Shell commands can touch anything in the working tree
+        if tool_name == 'Bash':
+            git_state.invalidate(cwd)
+
+        # Check if there are uncommitted changes (cached, see git_state)
+        status = git_state.get_porcelain_status(cwd=cwd, changed_paths=modified_files)
+
+        if status:
             actions.append("Git status: Uncommitted changes detected")
             
             # Suggest git workflow based on Simple and Easy Framework
@@ -291,6 +324,40 @@ def update_documentation_references(modified_files):
     return actions
 
 
+def load_dashboard_updater(metrics_updater):
+    """
+    Import the dashboard updater once per process and return its entry point,
+    a function taking (hook_data, framework_root).
+
+    The scripts directory goes on sys.path, so the module is imported normally
+    (bytecode cached in __pycache__, kept in sys.modules); it is reloaded only
+    when the file changes, e.g. while the hook daemon keeps this module loaded.
+    """
+    mtime = metrics_updater.stat().st_mtime_ns
+    cached = _dashboard_updater.get('entry_point')
+    if cached is not None and cached[0] == metrics_updater and cached[1] == mtime:
+        return cached[2]
+    
+    scripts_dir = str(metrics_updater.parent)
+    if scripts_dir not in sys.path:
+        sys.path.append(scripts_dir)  # After the hooks directory, so hook modules win
+    module = importlib.import_module(metrics_updater.stem)
+    if cached is not None:
+        module = importlib.reload(module)
+    
+    entry_point = getattr(module, 'update_from_hook_data', None)
+    if entry_point is None:
+        # Updater scripts without the module-level entry point
+        updaters = {}
+        
+        def entry_point(hook_data, framework_root):
+            if framework_root not in updaters:
+                updaters[framework_root] = module.DashboardMetricsUpdater(framework_root)
+            return updaters[framework_root].update_from_hook_data(hook_data)
+    _dashboard_updater['entry_point'] = (metrics_updater, mtime, entry_point)
+    return entry_point
+
+
 def update_dashboard_metrics(hook_data):
     """Update dashboard metrics with hook execution data"""
     actions = []
@@ -300,21 +367,14 @@ def update_dashboard_metrics(hook_data):
         metrics_updater = claude_dir / 'system' / 'dashboard' / 'scripts' / 'update_dashboard_metrics.py'
         
         if metrics_updater.exists() and os.access(metrics_updater, os.X_OK):
-            # Call the metrics updater script
-            import sys
-            import importlib.util
-            
-            # Load the metrics updater module
-            spec = importlib.util.spec_from_file_location("dashboard_updater", metrics_updater)
-            dashboard_updater = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(dashboard_updater)
-            
-            # Update metrics using the loaded module
-            updater = dashboard_updater.DashboardMetricsUpdater()
-            success = updater.update_from_hook_data(hook_data)
+            # Update metrics through the preloaded updater
+            record_hook_event = load_dashboard_updater(metrics_updater)
+            started = time.perf_counter()
+            success = record_hook_event(hook_data, str(claude_dir))
+            elapsed_ms = (time.perf_counter() - started) * 1000
             
             if success:
-                actions.append("✓ Dashboard metrics updated")
+                actions.append(f"✓ Dashboard metrics updated ({elapsed_ms:.1f} ms)")
             else:
                 actions.append("⚠ Dashboard metrics update failed")
         else:
@@ -326,6 +386,92 @@ def update_dashboard_metrics(hook_data):
     return actions
 
 
+def _merged_files(payloads):
+    """Modified files of all queued payloads, without duplicates"""
+    merged = []
+    for payload in payloads:
+        for file_path in payload.get('modified_files', []):
+            if file_path not in merged:
+                merged.append(file_path)
+    return merged
+
+
+def run_queued_system_indices(payloads):
+    """One index update for every file modified since the last drain"""
+    return update_system_indices(_merged_files(payloads))
+
+
+def run_queued_git_workflow(payloads):
+    """One status check per working directory, covering all queued changes"""
+    by_cwd = {}
+    for payload in payloads:
+        by_cwd.setdefault(payload.get('cwd'), []).append(payload)
+
+    actions = []
+    for cwd, cwd_payloads in by_cwd.items():
+        tool_names = [payload.get('tool_name', '') for payload in cwd_payloads]
+        tool_name = 'Bash' if 'Bash' in tool_names else tool_names[-1]
+        actions.extend(maintain_git_workflow({}, _merged_files(cwd_payloads), tool_name, cwd))
+    return actions
+
+
+def run_queued_documentation_references(payloads):
+    """One reference check for every file modified since the last drain"""
+    return update_documentation_references(_merged_files(payloads))
+
+
+def run_queued_cleanup(payloads):
+    """Cleanup runs once, however many tool calls asked for it"""
+    return cleanup_and_optimize()
+
+
+def run_queued_dashboard_metrics(payloads):
+    """Every hook run is a metrics event, so each queued one is recorded"""
+    actions = []
+    for hook_data in payloads:
+        actions.extend(update_dashboard_metrics(hook_data))
+    return actions
+
+
+SIDE_EFFECT_HANDLERS = {
+    'update_system_indices': run_queued_system_indices,
+    'maintain_git_workflow': run_queued_git_workflow,
+    'update_documentation_references': run_queued_documentation_references,
+    'cleanup_and_optimize': run_queued_cleanup,
+    'update_dashboard_metrics': run_queued_dashboard_metrics
+}
+
+
+def enqueue_side_effects(side_effects):
+    """Queue side effects for the background worker; returns the names queued"""
+    queued = []
+    try:
+        for name, payload in side_effects.items():
+            side_effect_queue.enqueue(SIDE_EFFECT_QUEUE, name, payload)
+            queued.append(name)
+    except OSError as e:
+        print(f"Side-effect queue unavailable, running inline: {e}", file=sys.stderr)
+        return queued
+
+    try:
+        side_effect_queue.start_worker(
+            SIDE_EFFECT_QUEUE,
+            [sys.executable, str(Path(__file__).resolve()), '--drain-side-effects']
+        )
+    except OSError as e:
+        # Jobs stay queued; the next tool call starts a worker
+        print(f"Could not start side-effect worker: {e}", file=sys.stderr)
+    return queued
+
+
+@hook_timing.timed('post_tool_use_side_effects')
+def drain_side_effects():
+    """Background worker entry point: drain the post-tool side-effect queue"""
+    side_effect_queue.drain(SIDE_EFFECT_QUEUE, SIDE_EFFECT_HANDLERS)
+    return 0
+
+
+@hook_timing.timed('post_tool_use')
 def main():
     """Main hook execution"""
     try:
@@ -348,35 +494,59 @@ def main():
         # Add modified files to hook data for metrics
         hook_data['modified_files'] = modified_files
         
-        # Perform maintenance tasks
-        maintenance_actions = []
-        warnings = []
-        
-        # 1. Update system indices
-        index_actions = update_system_indices(modified_files)
-        maintenance_actions.extend(index_actions)
-        
-        # 2. Validate framework structure
-        validations, structure_warnings = validate_framework_structure()
-        maintenance_actions.extend(validations)
-        warnings.extend(structure_warnings)
-        
-        # 3. Maintain git workflow
-        git_actions = maintain_git_workflow(tool_result)
-        maintenance_actions.extend(git_actions)
+        # Structure validation decides the exit code, so it always runs inline
+        validations, warnings = validate_framework_structure()
+        hook_data['warnings'] = warnings  # Add warnings to hook data for metrics
         
-        # 4. Update documentation references
-        doc_actions = update_documentation_references(modified_files)
-        maintenance_actions.extend(doc_actions)
+        # Everything else is a side effect for the background worker
+        side_effects = {}
+        if modified_files:
+            side_effects['update_system_indices'] = {'modified_files': modified_files}
+        side_effects['maintain_git_workflow'] = {
+            'modified_files': modified_files,
+            'tool_name': tool_name,
+            'cwd': os.getcwd()
+        }
+        if modified_files:
+            side_effects['update_documentation_references'] = {'modified_files': modified_files}
+        side_effects['cleanup_and_optimize'] = {}
+        side_effects['update_dashboard_metrics'] = hook_data
+        queued = enqueue_side_effects(side_effects)
         
-        # 5. Cleanup and optimize
-        cleanup_actions = cleanup_and_optimize()
-        maintenance_actions.extend(cleanup_actions)
+        # Side effects that could not be queued run inline within the latency
+        # budget (see hook_scheduler), skipped lowest priority first once it is spent
+        inline_checks = {
+            'maintain_git_workflow': hook_scheduler.check(
+                'maintain_git_workflow',
+                lambda: maintain_git_workflow(tool_result, modified_files, tool_name),
+                cost='subprocess', priority=2),
+            'update_system_indices': hook_scheduler.check(
+                'update_system_indices', lambda: update_system_indices(modified_files),
+                cost='filesystem', priority=3),
+            'update_dashboard_metrics': hook_scheduler.check(
+                'update_dashboard_metrics', lambda: update_dashboard_metrics(hook_data),
+                cost='import', priority=4),
+            'update_documentation_references': hook_scheduler.check(
+                'update_documentation_references',
+                lambda: update_documentation_references(modified_files),
+                cost='filesystem', priority=5),
+            'cleanup_and_optimize': hook_scheduler.check(
+                'cleanup_and_optimize', cleanup_and_optimize,
+                cost='filesystem', priority=6)
+        }
+        schedule = hook_scheduler.run_checks(
+            [inline_check for name, inline_check in inline_checks.items()
+             if name in side_effects and name not in queued],
+            budget_seconds=CHECK_BUDGET_SECONDS
+        )
+        schedule['results']['validate_framework_structure'] = validations
         
-        # 6. Update dashboard metrics
-        hook_data['warnings'] = warnings  # Add warnings to hook data for metrics
-        metrics_actions = update_dashboard_metrics(hook_data)
-        maintenance_actions.extend(metrics_actions)
+        # Report actions in the usual order
+        maintenance_actions = []
+        for name in MAINTENANCE_ORDER:
+            maintenance_actions.extend(schedule['results'].get(name, []))
+        if queued:
+            maintenance_actions.append(f"Queued for background worker: {', '.join(queued)}")
         
         # Generate result
         result = {
@@ -385,10 +555,17 @@ def main():
             'actions_taken': maintenance_actions,
             'warnings': warnings,
             'modified_files': modified_files,
+            'skipped_checks': schedule['skipped_checks'],
+            'side_effects': {
+                'queued': queued,
+                'last_results': side_effect_queue.read_last_results(SIDE_EFFECT_QUEUE)
+            },
             'metadata': {
                 'hook_name': 'post_tool_use',
                 'execution_time': datetime.now().isoformat(),
-                'maintenance_success': len(warnings) == 0
+                'maintenance_success': len(warnings) == 0,
+                'check_budget_ms': schedule['budget_ms'],
+                'check_elapsed_ms': schedule['elapsed_ms']
             }
         }
         
@@ -424,4 +601,6 @@ def main():
 
 
 if __name__ == "__main__":
+    if '--drain-side-effects' in sys.argv[1:]:
+        sys.exit(drain_side_effects())
     main()
\ No newline at end of file
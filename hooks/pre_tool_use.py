@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # /// script
-# dependencies = ["pathlib", "json", "sys", "os", "subprocess"]
+# dependencies = ["pathlib", "json", "sys", "os"]
 # ///
 
 """
@@ -21,11 +21,15 @@ Exit Codes:
 import json
 import sys
 import os
-import subprocess
 from pathlib import Path
 from datetime import datetime
 
+import git_state
+import hook_timing
+from context_view import scan_context, context_keywords
 
+
+@hook_timing.staged('parse_input')
 def load_hook_data():
     """Load and validate hook data from stdin - fallback to defaults if no input"""
     try:
@@ -121,17 +125,14 @@ def load_hook_data():
 
 
 def get_git_status():
-    """Get current git status"""
+    """Get current git status (cached, see git_state)"""
     try:
-        result = subprocess.run(
-            ['git', 'status', '--porcelain'],
-            capture_output=True, text=True, cwd=os.getcwd()
-        )
-        return result.stdout.strip() if result.returncode == 0 else ""
+        return git_state.get_porcelain_status()
     except Exception:
         return ""
 
 
+@hook_timing.staged()
 def validate_file_modification_tools(tool_data):
     """Validate tools that modify files"""
     tool_name = tool_data.get('name', '')
@@ -172,6 +173,7 @@ def validate_file_modification_tools(tool_data):
     return {'valid': len(errors) == 0, 'warnings': warnings, 'errors': errors}
 
 
+@hook_timing.staged()
 def validate_todo_workflow(tool_data, conversation_context):
     """Check if TodoWrite should be used for complex tasks"""
     tool_name = tool_data.get('name', '')
@@ -187,8 +189,8 @@ def validate_todo_workflow(tool_data, conversation_context):
     file_modification_tools = ['Edit', 'MultiEdit', 'Write']
     if tool_name in file_modification_tools:
         # Check if TodoWrite was mentioned in recent context
-        context_str = str(conversation_context).lower()
-        has_todo_mention = 'todowrite' in context_str or 'todo' in context_str
+        found = context_keywords(conversation_context)
+        has_todo_mention = 'todowrite' in found or 'todo' in found
         
         if not has_todo_mention:
             warnings.append(
@@ -198,6 +200,7 @@ def validate_todo_workflow(tool_data, conversation_context):
     return {'valid': True, 'warnings': warnings, 'errors': []}
 
 
+@hook_timing.staged()
 def validate_framework_principles(tool_data):
     """Validate adherence to Simple and Easy Framework principles"""
     tool_name = tool_data.get('name', '')
@@ -237,6 +240,7 @@ def validate_framework_principles(tool_data):
     return {'valid': len(errors) == 0, 'warnings': warnings, 'errors': errors}
 
 
+@hook_timing.staged()
 def validate_security_practices(tool_data):
     """Validate security best practices"""
     tool_name = tool_data.get('name', '')
@@ -271,6 +275,7 @@ def validate_security_practices(tool_data):
     return {'valid': len(errors) == 0, 'warnings': warnings, 'errors': errors}
 
 
+@hook_timing.timed('pre_tool_use')
 def main():
     """Main hook execution"""
     try:
@@ -278,7 +283,10 @@ def main():
         hook_data = load_hook_data()
         
         tool_data = hook_data.get('tool', {})
-        conversation_context = hook_data.get('conversation_context', '')
+        # Scanned once (incrementally per session), shared by every validator
+        conversation_context = scan_context(
+            hook_data.get('conversation_context', ''), hook_data.get('session_id')
+        )
         
         # Run all validations
         validations = [
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# /// script
+# dependencies = ["pathlib", "json", "os", "re", "hashlib", "time"]
+# ///
+
+"""
+Claude Code Hook Support: Incremental Conversation Context Scanning
+
+The conversation context of a session only grows at the end, yet every tool
+call used to lowercase and keyword-scan the whole transcript again - quadratic
+work over a long session. This module keeps a per-session scan state under
+~/.claude/cache/scan_state between hook invocations:
+- how much of the context was consumed (characters of a string context, items
+  of a list context) plus a SHA-1 of that prefix's scanned text, proving it is
+  unchanged; the hasher that checks the prefix is then fed the new suffix to
+  give the next digest, so each call hashes the context once (at C speed)
+  while keyword scanning stays limited to the new suffix
+- the keywords found so far and running counts of counted patterns
+- the last characters of the scanned text, rescanned with the new suffix so
+  keywords spanning the boundary are still found
+
+The next call lowercases and scans only the new suffix. Anything unexpected
+(context shrank or changed, different keyword table, no session id) falls back
+to a full scan, which also seeds the state for the next call.
+
+A list context is scanned as str(context) without its closing bracket: that
+text grows append-only as items are added, so results match a full
+str(context).lower() scan.
+"""
+
+import json
+import os
+import re
+import hashlib
+import time
+from pathlib import Path
+
+
+MAX_STATE_AGE_SECONDS = 7 * 24 * 3600
+
+# Placeholder session ids used by hooks when the payload has none
+ANONYMOUS_SESSIONS = {'', 'unknown', 'error', 'default'}
+
+
+def get_state_dir():
+    """Get the on-disk scan state directory"""
+    return Path.home() / '.claude' / 'cache' / 'scan_state'
+
+
+def _encode(text):
+    return text.encode('utf-8', 'surrogatepass')
+
+
+def _digest(text):
+    return hashlib.sha1(_encode(text)).hexdigest()
+
+
+def _signature(matcher, count_patterns):
+    keywords = sorted({keyword for words in matcher.tables.values() for keyword in words})
+    return _digest(json.dumps([keywords, sorted(count_patterns), matcher.word_boundary]))
+
+
+def _state_file(session_id, scope):
+    safe_session = re.sub(r'[^A-Za-z0-9_.-]', '_', str(session_id))[:128]
+    return get_state_dir() / f"{safe_session}-{scope}.json"
+
+
+def _load_state(state_file):
+    try:
+        with open(state_file, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_state(state_file, state):
+    try:
+        is_new = not state_file.exists()
+        state_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = state_file.with_suffix(f'.{os.getpid()}.tmp')
+        with open(temp_file, 'w') as f:
+            json.dump(state, f)
+        os.replace(temp_file, state_file)
+        if is_new:
+            prune_states()
+    except OSError:
+        pass  # Next call falls back to a full scan
+
+
+def prune_states(max_age=MAX_STATE_AGE_SECONDS):
+    """Remove scan states of sessions idle for longer than max_age seconds"""
+    cutoff = time.time() - max_age
+    try:
+        for state_file in get_state_dir().glob('*.json'):
+            if state_file.stat().st_mtime < cutoff:
+                state_file.unlink()
+    except OSError:
+        pass
+
+
+def _prefix_hasher(context, consumed):
+    """SHA-1 hasher fed the scanned text of the first `consumed` characters/items"""
+    if isinstance(context, list):
+        text = '[' + ', '.join(repr(item) for item in context[:consumed]) if consumed else ''
+    else:
+        text = context[:consumed]
+    return hashlib.sha1(_encode(text))
+
+
+def _suffix(context, consumed):
+    """Text of context not covered by the first `consumed` characters/items"""
+    if isinstance(context, list):
+        items = ', '.join(repr(item) for item in context[consumed:])
+        if consumed == 0:
+            return '[' + items
+        return ', ' + items if items else ''
+    return context[consumed:]
+
+
+def _scan(text, matcher, count_patterns, tail):
+    """Keywords and pattern counts of tail + text, excluding matches inside tail alone"""
+    window = tail + text.lower()
+    found = matcher.find(window)
+    counts = {pattern: window.count(pattern) - tail.count(pattern) for pattern in count_patterns}
+    return found, counts, window
+
+
+def scan_context(conversation_context, matcher, session_id=None, scope='context', count_patterns=()):
+    """
+    Keyword hits and pattern counts for str(conversation_context).lower().
+
+    Returns (found_keywords, counts): a frozenset of matcher keywords and a
+    {pattern: occurrences} dict. With a session_id, only the part of the context
+    added since the previous call of this session is scanned.
+    """
+    count_patterns = tuple(count_patterns)
+    # Word-boundary matches could be faked by the cut-off start of the carried tail
+    incremental = (
+        session_id is not None and session_id not in ANONYMOUS_SESSIONS
+        and isinstance(conversation_context, (str, list))
+        and not matcher.word_boundary
+    )
+    if not incremental:
+        text = str(conversation_context)
+        found, counts, _ = _scan(text, matcher, count_patterns, '')
+        return frozenset(found), counts
+
+    state_file = _state_file(session_id, scope)
+    state = _load_state(state_file)
+    kind = 'list' if isinstance(conversation_context, list) else 'str'
+    signature = _signature(matcher, count_patterns)
+
+    resumable = (
+        state is not None
+        and state.get('signature') == signature
+        and state.get('kind') == kind
+        and state.get('consumed', 0) <= len(conversation_context)
+    )
+    if resumable:
+        hasher = _prefix_hasher(conversation_context, state['consumed'])
+        resumable = state.get('prefix_sha1') == hasher.hexdigest()
+    if resumable:
+        found_so_far = set(state.get('found', []))
+        counts_so_far = state.get('counts', {})
+        tail = state.get('tail', '')
+        consumed = state['consumed']
+    else:
+        found_so_far = set()
+        counts_so_far = {}
+        tail = ''
+        consumed = 0
+        hasher = hashlib.sha1()
+
+    suffix = _suffix(conversation_context, consumed)
+    if suffix or not resumable:
+        found, counts, window = _scan(suffix, matcher, count_patterns, tail)
+        found_so_far.update(found)
+        counts_so_far = {
+            pattern: counts_so_far.get(pattern, 0) + counts[pattern] for pattern in count_patterns
+        }
+
+        # Keep enough trailing text for any keyword/pattern spanning into the next suffix
+        longest = max(
+            [len(keyword) for words in matcher.tables.values() for keyword in words] +
+            [len(pattern) for pattern in count_patterns] + [1]
+        )
+        consumed = len(conversation_context)
+        hasher.update(_encode(suffix))
+        _save_state(state_file, {
+            'signature': signature,
+            'kind': kind,
+            'consumed': consumed,
+            'prefix_sha1': hasher.hexdigest(),
+            'tail': window[-(longest - 1):] if longest > 1 else '',
+            'found': sorted(found_so_far),
+            'counts': counts_so_far,
+            'updated_at': time.time()
+        })
+
+    return frozenset(found_so_far), {pattern: counts_so_far.get(pattern, 0) for pattern in count_patterns}
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+# /// script
+# dependencies = ["pathlib", "json", "sys", "os", "fcntl", "gzip", "bisect", "time", "datetime"]
+# ///
+
+"""
+Claude Code Hook Support: Segmented, Time-Indexed JSONL Logs
+
+Activity and ERROR ATTENTION PROTOCOL logs used to be single JSONL files that
+grow forever (or one file per day), and every time-range question meant
+parsing every line. A SegmentedLog is a directory of segments:
+- current.jsonl receives appends (one locked write per record)
+- it is sealed into segment-<first_ms>-<last_ms>.jsonl (times of its first
+  and last record) when it passes max_segment_bytes or is older than
+  max_segment_seconds, and optionally gzip-compressed
+- every segment has a sparse .idx sidecar of "<epoch>\\t<byte offset>" lines,
+  one per index_interval_bytes of records, after a "# created <epoch>" header
+
+read(since, until) skips segments outside the range by their names and seeks
+within a segment to the last indexed record before `since`, so only records
+near the range are parsed. Offsets refer to uncompressed data; compressed
+segments are decompressed from the start but not parsed up to the offset.
+
+Records are timed by their 'timestamp' field (ISO format, as the hooks write
+it), falling back to the time of the append.
+
+Records are JSON lines by default. Another codec (an object with `suffix`,
+encode(record) -> bytes and scan(stream) yielding (epoch or None, load)
+pairs, load() returning the record) can store them in a different format;
+segment files then end in the codec's suffix instead of .jsonl.
+"""
+
+import json
+import sys
+import os
+import fcntl
+import gzip
+import bisect
+import time
+from pathlib import Path
+from datetime import datetime
+
+
+MAX_SEGMENT_BYTES = 8 * 1024 * 1024
+MAX_SEGMENT_SECONDS = 24 * 3600
+INDEX_INTERVAL_BYTES = 64 * 1024
+
+# Concurrent writers append in lock order, not strictly in timestamp order;
+# read() tolerates records this much out of order (per log: clock_skew_seconds)
+CLOCK_SKEW_SECONDS = 5
+
+def record_time(record, default=None):
+    """Epoch seconds of a record's ISO 'timestamp' field, or default"""
+    try:
+        return datetime.fromisoformat(record['timestamp']).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return default
+
+
+def _to_epoch(value):
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return datetime.fromisoformat(value).timestamp()
+
+
+class JSONLinesCodec:
+    """One JSON object per line"""
+
+    suffix = '.jsonl'
+
+    def encode(self, record):
+        return (json.dumps(record, separators=(',', ':')) + '\n').encode('utf-8')
+
+    def scan(self, stream):
+        for line in stream:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Partial line from an interrupted writer
+            timestamp = record_time(record) if isinstance(record, dict) else None
+            yield timestamp, (lambda record=record: record)
+
+
+class SegmentedLog:
+    """Append-only log split into rotated, indexed segments"""
+
+    def __init__(self, directory, max_segment_bytes=MAX_SEGMENT_BYTES,
+                 max_segment_seconds=MAX_SEGMENT_SECONDS, index_interval_bytes=INDEX_INTERVAL_BYTES,
+                 compress=True, codec=None, clock_skew_seconds=CLOCK_SKEW_SECONDS):
+        self.directory = Path(directory)
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_seconds = max_segment_seconds
+        self.index_interval_bytes = index_interval_bytes
+        self.compress = compress
+        self.codec = codec or JSONLinesCodec()
+        self.clock_skew_seconds = clock_skew_seconds
+
+        self.current_file = self.directory / f"current{self.codec.suffix}"
+        self.current_index = self.directory / 'current.idx'
+        self.lock_file = self.directory / '.lock'
+
+    def append(self, record):
+        """Append one record"""
+        line = self.codec.encode(record)
+        timestamp = record_time(record, time.time()) if isinstance(record, dict) else time.time()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        sealed = None
+        with open(self.lock_file, 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+
+            size = self._size(self.current_file)
+            if size and self._should_rotate(size):
+                sealed = self._seal()
+                size = 0
+
+            fd = os.open(self.current_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                written = 0
+                while written < len(line):
+                    written += os.write(fd, line[written:])
+            finally:
+                os.close(fd)
+
+            # Sparse index: the first record, then one per crossed interval boundary
+            interval = self.index_interval_bytes
+            if size == 0:
+                with open(self.current_index, 'w') as index:
+                    index.write(f"# created {time.time():.6f}\n{timestamp:.6f}\t{size}\n")
+            elif size // interval != (size + len(line)) // interval:
+                with open(self.current_index, 'a') as index:
+                    index.write(f"{timestamp:.6f}\t{size}\n")
+
+        # Compression happens outside the lock so other writers are not held up
+        if sealed is not None and self.compress:
+            self._compress(sealed)
+
+    def _size(self, path):
+        try:
+            return path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def _should_rotate(self, size):
+        if size >= self.max_segment_bytes:
+            return True
+        created = self._segment_created(self.current_index)
+        return created is not None and time.time() - created >= self.max_segment_seconds
+
+    def _seal(self):
+        """Rename the current segment and its index to their sealed names"""
+        now = time.time()
+        first = self._first_index_time(self.current_index)
+        first = first if first is not None else now
+        last = self._last_record_time(self.current_file)
+        last = max(last if last is not None else now, first)
+        name = f"segment-{int(first * 1000):013d}-{int(last * 1000):013d}"
+        segment = self.directory / f"{name}{self.codec.suffix}"
+        os.replace(self.current_file, segment)
+        if self.current_index.exists():
+            os.replace(self.current_index, self.directory / f"{name}.idx")
+        return segment
+
+    def _compress(self, segment):
+        compressed = segment.with_name(segment.name + '.gz')
+        temp_file = segment.with_name(f"{segment.name}.{os.getpid()}.tmp")
+        try:
+            with open(segment, 'rb') as source, gzip.open(temp_file, 'wb') as target:
+                while True:
+                    chunk = source.read(1024 * 1024)
+                    if not chunk:
+                        break
+                    target.write(chunk)
+            os.replace(temp_file, compressed)
+            segment.unlink()
+        except OSError:
+            # The uncompressed segment stays readable
+            try:
+                temp_file.unlink()
+            except OSError:
+                pass
+
+    def _segment_created(self, index_file):
+        try:
+            with open(index_file, 'r') as f:
+                return float(f.readline().split()[-1])
+        except (OSError, ValueError, IndexError):
+            return None
+
+    def _first_index_time(self, index_file):
+        entries = self._load_index(index_file, limit=1)
+        return entries[0][0] if entries else None
+
+    def _last_record_time(self, segment):
+        """Time of the last timed record, scanned from the last indexed offset"""
+        entries = self._load_index(self.current_index)
+        last = None
+        try:
+            with open(segment, 'rb') as f:
+                f.seek(entries[-1][1] if entries else 0)
+                for timestamp, _ in self.codec.scan(f):
+                    if timestamp is not None:
+                        last = timestamp
+        except OSError:
+            return None
+        return last
+
+    def _load_index(self, index_file, limit=None):
+        entries = []
+        try:
+            with open(index_file, 'r') as f:
+                for line in f:
+                    if line.startswith('#'):
+                        continue
+                    try:
+                        timestamp, offset = line.split('\t')
+                        entries.append((float(timestamp), int(offset)))
+                    except ValueError:
+                        continue
+                    if limit is not None and len(entries) >= limit:
+                        break
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def segments(self):
+        """[(first_epoch, last_epoch or None, path, index_path)] oldest first"""
+        found = []
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return found
+        suffix = self.codec.suffix
+        for name in names:
+            if not name.startswith('segment-') or not (name.endswith(suffix) or name.endswith(suffix + '.gz')):
+                continue
+            stem = name.split('.', 1)[0]
+            try:
+                _, first_ms, last_ms = stem.split('-')
+                found.append((int(first_ms) / 1000, int(last_ms) / 1000,
+                              self.directory / name, self.directory / f"{stem}.idx"))
+            except ValueError:
+                continue
+        found.sort(key=lambda segment: segment[0])
+
+        if self.current_file.exists():
+            first = self._first_index_time(self.current_index) or 0.0
+            found.append((first, None, self.current_file, self.current_index))
+        return found
+
+    def read(self, since=None, until=None):
+        """Yield records timed within [since, until] (epoch, datetime or ISO string)"""
+        since = _to_epoch(since)
+        until = _to_epoch(until)
+
+        visited = set()  # Names (without suffixes) of segments read or skipped
+        pending = self.segments()
+        while pending:
+            first, last, path, index_file = pending.pop(0)
+            stem = path.name.split('.', 1)[0]
+            visited.add(stem)
+            if until is not None and first > until + self.clock_skew_seconds:
+                break
+            if since is not None and last is not None and last < since - self.clock_skew_seconds:
+                continue
+
+            offset = 0
+            if since is not None:
+                entries = self._load_index(index_file)
+                position = bisect.bisect_right([entry[0] for entry in entries], since - self.clock_skew_seconds)
+                if position > 0:
+                    offset = entries[position - 1][1]
+
+            try:
+                f = self._open_segment(path)
+            except FileNotFoundError:
+                # Sealed or compressed between listing and opening: list again and continue with
+                # what it became (its .gz, or the sealed segment plus a new current one)
+                # (sealed names carry the first time in whole milliseconds)
+                visited.discard(stem)
+                pending = [segment for segment in self.segments()
+                           if segment[0] >= first - 0.001 and segment[2].name.split('.', 1)[0] not in visited]
+                continue
+            yield from self._read_segment(f, offset, since, until)
+
+    def _open_segment(self, path):
+        # Once open, the segment stays readable even if it is renamed or replaced
+        return gzip.open(path, 'rb') if path.name.endswith('.gz') else open(path, 'rb')
+
+    def _read_segment(self, f, offset, since, until):
+        with f:
+            f.seek(offset)
+            for timestamp, load in self.codec.scan(f):
+                if timestamp is None:
+                    if since is None and until is None:
+                        yield load()
+                    continue
+                if until is not None and timestamp > until + self.clock_skew_seconds:
+                    return
+                if (since is None or timestamp >= since) and (until is None or timestamp <= until):
+                    yield load()
+
+
+def main():
+    """Print records of a segmented log as JSONL"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Query a segmented JSONL log by time range')
+    parser.add_argument('directory', help='Segmented log directory')
+    parser.add_argument('--since', help='ISO timestamp (inclusive)')
+    parser.add_argument('--until', help='ISO timestamp (inclusive)')
+    args = parser.parse_args()
+
+    for record in SegmentedLog(args.directory).read(args.since, args.until):
+        print(json.dumps(record))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
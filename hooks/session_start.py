@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # /// script
-# dependencies = ["pathlib", "json", "sys", "os", "datetime", "subprocess"]
+# dependencies = ["pathlib", "json", "sys", "os", "datetime", "heapq", "time"]
 # ///
 
 """
@@ -22,11 +22,16 @@ Exit Codes:
 import json
 import sys
 import os
-import subprocess
+import heapq
+import time
 from pathlib import Path
 from datetime import datetime, timedelta
 
+import git_state
+import hook_timing
 
+
+@hook_timing.staged('parse_input')
 def load_hook_data():
     """Load and validate hook data from stdin - fallback to defaults if no input"""
     try:
@@ -94,36 +99,18 @@ def load_hook_data():
 
 
 def get_git_activity():
-    """Get recent git activity and status"""
+    """Get recent git activity and status (one concurrent, cached probe - see git_state)"""
     try:
-        # Get current branch
-        branch_result = subprocess.run(
-            ['git', 'branch', '--show-current'],
-            capture_output=True, text=True, cwd=os.getcwd()
-        )
-        current_branch = branch_result.stdout.strip() if branch_result.returncode == 0 else "unknown"
-        
-        # Get recent commits (last 24 hours)
+        # Get recent commits (last 24 hours) along with branch, status and last commit
         yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
-        log_result = subprocess.run(
-            ['git', 'log', '--oneline', '--since', yesterday],
-            capture_output=True, text=True, cwd=os.getcwd()
+        probe = git_state.probe_repository(
+            since=yesterday, max_age=git_state.SESSION_PROBE_MAX_AGE_SECONDS
         )
-        recent_commits = log_result.stdout.strip() if log_result.returncode == 0 else ""
         
-        # Get git status
-        status_result = subprocess.run(
-            ['git', 'status', '--porcelain'],
-            capture_output=True, text=True, cwd=os.getcwd()
-        )
-        changes = status_result.stdout.strip() if status_result.returncode == 0 else ""
-        
-        # Get last commit info
-        last_commit_result = subprocess.run(
-            ['git', 'log', '-1', '--pretty=format:%h %s (%cr)'],
-            capture_output=True, text=True, cwd=os.getcwd()
-        )
-        last_commit = last_commit_result.stdout.strip() if last_commit_result.returncode == 0 else "No commits"
+        current_branch = probe['branch'] if probe['branch'] is not None else "unknown"
+        recent_commits = probe['recent_commits']
+        changes = probe['status']
+        last_commit = probe['last_commit'] or "No commits"
         
         return {
             'branch': current_branch,
@@ -144,6 +131,7 @@ def get_git_activity():
         }
 
 
+@hook_timing.staged()
 def check_framework_health():
     """Check framework health and integrity"""
     claude_dir = Path.home() / '.claude'
@@ -247,6 +235,68 @@ def get_available_personalities():
     return personalities
 
 
+# Recent file scan budget: session start must stay fast even in huge monorepos
+RECENT_FILES_LIMIT = 10
+RECENT_FILES_MAX_ENTRIES = 50000
+RECENT_FILES_MAX_SECONDS = 1.0
+
+# Directories never descended into (hidden directories are skipped as well)
+IGNORED_DIRECTORIES = {'node_modules', '__pycache__', 'target'}
+
+
+def find_recent_files(root, since, limit=RECENT_FILES_LIMIT,
+                      max_entries=RECENT_FILES_MAX_ENTRIES, max_seconds=RECENT_FILES_MAX_SECONDS):
+    """
+    Find the `limit` most recently modified files under root modified after `since`.
+
+    Walks with os.scandir, pruning hidden and ignored directories before
+    descending, and keeps only the newest files in a heap. Stops once
+    max_entries directory entries were visited or max_seconds elapsed.
+
+    Returns (relative_paths_newest_first, truncated).
+    """
+    deadline = time.monotonic() + max_seconds
+    newest = []  # min-heap of (mtime, path)
+    pending = [str(root)]
+    entries_seen = 0
+    truncated = False
+
+    while pending and not truncated:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    entries_seen += 1
+                    if entries_seen > max_entries or (entries_seen % 256 == 0 and time.monotonic() > deadline):
+                        truncated = True
+                        break
+
+                    if entry.name.startswith('.'):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in IGNORED_DIRECTORIES:
+                                pending.append(entry.path)
+                            continue
+                        if not entry.is_file():
+                            continue
+                        mtime = entry.stat().st_mtime
+                    except OSError:
+                        continue
+
+                    if mtime <= since:
+                        continue
+                    if len(newest) < limit:
+                        heapq.heappush(newest, (mtime, entry.path))
+                    elif mtime > newest[0][0]:
+                        heapq.heapreplace(newest, (mtime, entry.path))
+        except OSError:
+            continue  # Unreadable directory
+
+    recent = [os.path.relpath(path, root) for _, path in sorted(newest, reverse=True)]
+    return recent, truncated
+
+
 def get_working_directory_context():
     """Get working directory context and project information"""
     cwd = Path.cwd()
@@ -255,7 +305,8 @@ def get_working_directory_context():
         'directory_name': cwd.name,
         'is_git_repo': False,
         'project_type': 'unknown',
-        'recent_files': []
+        'recent_files': [],
+        'recent_files_truncated': False
     }
     
     # Check if it's a git repository
@@ -277,16 +328,10 @@ def get_working_directory_context():
     # Get recently modified files (last 24 hours)
     try:
         yesterday = datetime.now() - timedelta(days=1)
-        recent_files = []
-        
-        for file_path in cwd.rglob('*'):
-            if file_path.is_file() and file_path.stat().st_mtime > yesterday.timestamp():
-                # Skip hidden files and common build/cache directories
-                if not any(part.startswith('.') for part in file_path.parts):
-                    if not any(ignore in str(file_path) for ignore in ['node_modules', '__pycache__', 'target', '.git']):
-                        recent_files.append(str(file_path.relative_to(cwd)))
+        recent_files, truncated = find_recent_files(cwd, yesterday.timestamp())
         
-        context['recent_files'] = recent_files[:10]  # Limit to 10 most recent
+        context['recent_files'] = recent_files
+        context['recent_files_truncated'] = truncated  # Scan budget hit, results are partial
     except Exception:
         context['recent_files'] = []
     
@@ -336,7 +381,8 @@ def format_orientation_message(orientation):
     lines.append(f"📍 Working Directory: {wd['directory_name']}")
     lines.append(f"   Type: {wd['project_type']}")
     if wd['recent_files']:
-        lines.append(f"   Recent Activity: {len(wd['recent_files'])} files modified (24h)")
+        partial = " (partial scan)" if wd.get('recent_files_truncated') else ""
+        lines.append(f"   Recent Activity: {len(wd['recent_files'])} files modified (24h){partial}")
     
     # Git Status
     git = orientation['git_activity']
@@ -383,6 +429,7 @@ def format_orientation_message(orientation):
     return "\n".join(lines)
 
 
+@hook_timing.timed('session_start')
 def main():
     """Main hook execution"""
     try:
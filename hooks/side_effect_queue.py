@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# /// script
+# dependencies = ["pathlib", "json", "sys", "os", "fcntl", "subprocess", "time", "itertools"]
+# ///
+
+"""
+Claude Code Hook Support: Durable Side-Effect Queue
+
+Maintenance a hook performs *after* deciding its result (index touches, git
+status, dashboard metrics, cleanup) does not have to delay the agent. A hook
+enqueues that work as small JSON job files in a spool directory
+(~/.claude/queue/<queue>/) and returns; a detached worker drains the spool.
+
+- enqueue() writes one job atomically (temp file + rename), so a job is
+  either fully visible to the worker or not at all
+- start_worker() spawns the drain command unless a worker already holds the
+  queue lock
+- drain() takes the lock, hands every task's pending payloads to its handler
+  in one call (handlers coalesce duplicate work), removes the processed jobs
+  and records the outcome in last_results.json. It keeps draining until the
+  spool is empty, so a job enqueued while a worker is finishing is not lost.
+  Each handler call is timed as a stage of the worker's run (see hook_timing).
+"""
+
+import json
+import sys
+import os
+import fcntl
+import subprocess
+import time
+import itertools
+from pathlib import Path
+
+import hook_timing
+
+
+MAX_RECORDED_ACTIONS = 50
+
+_sequence = itertools.count()
+
+
+def get_queue_dir(queue):
+    """Get the spool directory of a queue"""
+    return Path.home() / '.claude' / 'queue' / queue
+
+
+def enqueue(queue, task, payload):
+    """Append a job to the queue; raises OSError when the spool is not writable"""
+    queue_dir = get_queue_dir(queue)
+    queue_dir.mkdir(parents=True, exist_ok=True)
+    # Names sort in enqueue order within a process and roughly across processes
+    job_name = f"{time.time_ns():020d}-{os.getpid()}-{next(_sequence):06d}"
+    temp_file = queue_dir / f"{job_name}.tmp"
+    with open(temp_file, 'w') as f:
+        json.dump({'task': task, 'payload': payload, 'enqueued_at': time.time()}, f)
+    job_file = queue_dir / f"{job_name}.job"
+    os.replace(temp_file, job_file)
+    return job_file
+
+
+def pending_jobs(queue):
+    """Job files waiting in the queue, oldest first"""
+    try:
+        return sorted(get_queue_dir(queue).glob('*.job'))
+    except OSError:
+        return []
+
+
+def _acquire_lock(queue):
+    """Take the queue's worker lock without waiting; None if a worker holds it"""
+    queue_dir = get_queue_dir(queue)
+    queue_dir.mkdir(parents=True, exist_ok=True)
+    lock_file = open(queue_dir / 'worker.lock', 'w')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+def worker_running(queue):
+    """Whether a worker currently holds the queue lock"""
+    lock_file = _acquire_lock(queue)
+    if lock_file is None:
+        return True
+    lock_file.close()
+    return False
+
+
+def start_worker(queue, command, cwd=None):
+    """Spawn the detached drain command unless a worker is already draining"""
+    if worker_running(queue):
+        return False
+    subprocess.Popen(
+        command,
+        cwd=cwd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+        close_fds=True
+    )
+    return True
+
+
+def _load_jobs(job_files):
+    jobs = []
+    for job_file in job_files:
+        try:
+            with open(job_file, 'r') as f:
+                job = json.load(f)
+            jobs.append((job_file, job['task'], job['payload']))
+        except (OSError, ValueError, KeyError):
+            # Unreadable job: drop it rather than retrying it forever
+            jobs.append((job_file, None, None))
+    return jobs
+
+
+def _drain_once(queue, handlers):
+    jobs = _load_jobs(pending_jobs(queue))
+    if not jobs:
+        return None
+
+    by_task = {}
+    for _, task, payload in jobs:
+        if task is not None:
+            by_task.setdefault(task, []).append(payload)
+
+    outcome = {'jobs': len(jobs), 'tasks': {}}
+    for task, payloads in by_task.items():
+        started = time.monotonic()
+        handler = handlers.get(task)
+        if handler is None:
+            entry = {'error': f"Unknown side effect: {task}", 'actions': []}
+        else:
+            try:
+                with hook_timing.stage(task):
+                    actions = list(handler(payloads))
+                entry = {'error': None, 'actions': actions[:MAX_RECORDED_ACTIONS]}
+            except Exception as e:
+                # Failed work is reported, not retried: side effects are best effort
+                entry = {'error': str(e), 'actions': []}
+        entry['jobs'] = len(payloads)
+        entry['elapsed_ms'] = round((time.monotonic() - started) * 1000, 1)
+        outcome['tasks'][task] = entry
+
+    for job_file, _, _ in jobs:
+        try:
+            job_file.unlink()
+        except OSError:
+            pass
+    return outcome
+
+
+def drain(queue, handlers):
+    """
+    Process every pending job of the queue, unless another worker is on it.
+
+    handlers maps task names to callables taking the list of pending payloads
+    of that task (oldest first) and returning a list of action messages.
+    Returns the number of jobs processed, or None if the lock was held.
+    """
+    processed = 0
+    while True:
+        lock_file = _acquire_lock(queue)
+        if lock_file is None:
+            return processed if processed else None
+        try:
+            while True:
+                outcome = _drain_once(queue, handlers)
+                if outcome is None:
+                    break
+                processed += outcome['jobs']
+                _save_last_results(queue, outcome)
+        finally:
+            lock_file.close()
+        # A hook may have enqueued after our last pass but seen the lock still held
+        if not pending_jobs(queue):
+            return processed
+
+
+def _save_last_results(queue, outcome):
+    outcome['finished'] = time.time()
+    results_file = get_queue_dir(queue) / 'last_results.json'
+    try:
+        temp_file = results_file.with_suffix(f'.{os.getpid()}.tmp')
+        with open(temp_file, 'w') as f:
+            json.dump(outcome, f)
+        os.replace(temp_file, results_file)
+    except OSError:
+        pass
+
+
+def read_last_results(queue):
+    """Outcome of the most recent drain pass, or None"""
+    try:
+        with open(get_queue_dir(queue) / 'last_results.json', 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+if __name__ == "__main__":
+    # Inspection helper: python3 side_effect_queue.py <queue>
+    queue_name = sys.argv[1] if len(sys.argv) > 1 else 'post_tool_use'
+    print(json.dumps({
+        'queue': queue_name,
+        'pending_jobs': len(pending_jobs(queue_name)),
+        'worker_running': worker_running(queue_name),
+        'last_results': read_last_results(queue_name)
+    }, indent=2))
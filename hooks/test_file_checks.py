@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test script for file_checks.py
+
+Checks Python files the way error_attention_post_tool_use.py does, across
+simulated hook runs, and verifies that unchanged content is answered from the
+cache without compiling, that changed content is re-checked, that syntax
+errors are reported in py_compile's shape, and that eviction keeps the
+entries that are still being hit.
+"""
+
+import os
+import sys
+import tempfile
+import py_compile
+from pathlib import Path
+
+os.environ['HOME'] = tempfile.mkdtemp(prefix='file_checks_test_')
+
+import file_checks
+
+
+compiled = []
+
+
+def counting_compile(source, filename, *args, **kwargs):
+    compiled.append(filename)
+    return compile(source, filename, *args, **kwargs)
+
+
+file_checks.compile = counting_compile
+
+
+def new_hook_run():
+    """Forget the in-process memo, as a new hook process would."""
+    file_checks._memory_cache.clear()
+
+
+def write(path, text):
+    path.write_text(text)
+    return str(path)
+
+
+def test_unchanged_file_is_not_compiled_again():
+    path = write(Path(tempfile.mkdtemp()) / 'hook.py', 'import sys\nsys.exit(0)\n')
+    compiled.clear()
+    first = file_checks.check_python_file(path)
+    new_hook_run()
+    second = file_checks.check_python_file(path)
+    return (
+        first['cached'] is False and second['cached'] is True and compiled == [path] and
+        second['syntax_error'] is None and second['has_exit_codes'] and not second['has_pep723']
+    )
+
+
+def test_changed_file_is_checked_again():
+    path = write(Path(tempfile.mkdtemp()) / 'module.py', 'value = 1\n')
+    file_checks.check_python_file(path)
+    new_hook_run()
+    compiled.clear()
+    write(Path(path), '# /// script\nimport json\nprint(json.dumps({}))\n')
+    checks = file_checks.check_python_file(path)
+    return checks['cached'] is False and compiled == [path] and checks['has_pep723'] and checks['has_json_output']
+
+
+def test_syntax_error_matches_py_compile():
+    directory = Path(tempfile.mkdtemp())
+    path = write(directory / 'broken.py', 'def broken(:\n    pass\n')
+    checks = file_checks.check_python_file(path)
+    try:
+        py_compile.compile(path, cfile=str(directory / 'broken.pyc'), doraise=True)
+        expected = None
+    except py_compile.PyCompileError as e:
+        expected = e.msg.rstrip()
+    return expected is not None and checks['syntax_error'] == expected and 'SyntaxError' in expected
+
+
+def test_eviction_keeps_recently_used_entries():
+    directory = Path(tempfile.mkdtemp())
+    limits = file_checks.MAX_CACHE_ENTRIES, file_checks.TOUCH_INTERVAL_SECONDS
+    file_checks.MAX_CACHE_ENTRIES, file_checks.TOUCH_INTERVAL_SECONDS = 3, 0
+    try:
+        hot = write(directory / 'hot.py', 'hot = True\n')
+        file_checks.check_python_file(hot)
+        for n in range(4):
+            # The hot file is hit between every new check
+            file_checks.check_python_file(write(directory / f'cold_{n}.py', f'cold = {n}\n'))
+            new_hook_run()
+            file_checks.check_python_file(hot)
+        new_hook_run()
+        compiled.clear()
+        hit = file_checks.check_python_file(hot)
+        new_hook_run()
+        evicted = file_checks.check_python_file(str(directory / 'cold_0.py'))
+    finally:
+        file_checks.MAX_CACHE_ENTRIES, file_checks.TOUCH_INTERVAL_SECONDS = limits
+    return hit['cached'] is True and evicted['cached'] is False
+
+
+def main():
+    print("Testing file_checks.py...")
+    print("=" * 50)
+
+    test_cases = [
+        ('unchanged file is answered from the cache', test_unchanged_file_is_not_compiled_again),
+        ('changed file is checked again', test_changed_file_is_checked_again),
+        ('syntax errors are reported like py_compile', test_syntax_error_matches_py_compile),
+        ('eviction keeps recently used entries', test_eviction_keeps_recently_used_entries),
+    ]
+
+    passed = 0
+    for name, test in test_cases:
+        if test():
+            passed += 1
+            print(f"✅ {name}")
+        else:
+            print(f"❌ {name}")
+
+    print("\n" + "=" * 50)
+    print(f"Results: {passed}/{len(test_cases)} tests passed")
+
+    if passed == len(test_cases):
+        print("🎉 All tests passed!")
+        return 0
+    else:
+        print("❌ Some tests failed!")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
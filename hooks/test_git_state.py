@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Test script for git_state.py
+
+Runs git queries through the cache in a temporary repository and counts the
+git processes actually spawned, to check that cached results are reused while
+nothing changes, and that commits, checkouts, changed_paths, invalidate() and
+max_age each force a refresh.
+"""
+
+import os
+import sys
+import time
+import tempfile
+import subprocess
+from pathlib import Path
+
+os.environ['HOME'] = tempfile.mkdtemp(prefix='git_state_test_')
+
+import git_state
+
+
+spawned = []
+_run = subprocess.run
+
+
+def counting_run(command, *args, **kwargs):
+    spawned.append(command)
+    return _run(command, *args, **kwargs)
+
+
+git_state.subprocess.run = counting_run
+
+
+def git(repo, *args):
+    """Run git directly (not through the cache)."""
+    _run(['git', *args], cwd=repo, capture_output=True, check=True)
+
+
+def make_repository():
+    repo = Path(tempfile.mkdtemp(prefix='git_state_repo_'))
+    git(repo, 'init', '-q', '-b', 'main')
+    git(repo, 'config', 'user.name', 'Test User')
+    git(repo, 'config', 'user.email', 'test@example.com')
+    (repo / 'tracked.py').write_text('value = 1\n')
+    git(repo, 'add', 'tracked.py')
+    git(repo, 'commit', '-q', '-m', 'Initial commit')
+    return repo
+
+
+def status(repo, **kwargs):
+    spawned.clear()
+    result = git_state.get_porcelain_status(cwd=str(repo), **kwargs)
+    return result, len(spawned)
+
+
+def branch_via_git(repo):
+    spawned.clear()
+    result = git_state.run_git(['rev-parse', '--abbrev-ref', 'HEAD'], cwd=str(repo))
+    return result['stdout'].strip(), len(spawned)
+
+
+def test_unchanged_repository_is_served_from_cache():
+    repo = make_repository()
+    first = status(repo)
+    second = status(repo)
+    git_state._memory_cache.clear()  # Another hook process: served from the shared file
+    third = status(repo)
+    return first == ('', 1) and second == ('', 0) and third == ('', 0)
+
+
+def test_commit_and_checkout_invalidate():
+    repo = make_repository()
+    (repo / 'new.py').write_text('new = True\n')
+    before = status(repo)
+    git(repo, 'add', 'new.py')
+    git(repo, 'commit', '-q', '-m', 'Add new.py')
+    after_commit = status(repo)
+
+    main_branch = branch_via_git(repo)
+    git(repo, 'checkout', '-q', '-b', 'feature')
+    feature_branch = branch_via_git(repo)
+    return (
+        before == ('?? new.py', 1) and after_commit == ('', 1) and
+        main_branch == ('main', 1) and feature_branch == ('feature', 1)
+    )
+
+
+def test_changed_paths_and_invalidate_force_refresh():
+    repo = make_repository()
+    status(repo)
+    time.sleep(0.01)
+    (repo / 'tracked.py').write_text('value = 2\n')  # Working-tree edit: .git/index is untouched
+    unaware = status(repo)
+    informed = status(repo, changed_paths=[str(repo / 'tracked.py')])
+
+    (repo / 'other.py').write_text('other = True\n')
+    cached = status(repo)
+    git_state.invalidate(cwd=str(repo))
+    invalidated = status(repo)
+    return (
+        unaware == ('', 0) and informed == ('M tracked.py', 1) and
+        cached == ('M tracked.py', 0) and invalidated == ('M tracked.py\n?? other.py', 1)
+    )
+
+
+def test_max_age_expires_entries():
+    repo = make_repository()
+    status(repo)
+    time.sleep(0.05)
+    spawned.clear()
+    git_state.run_git(['status', '--porcelain'], cwd=str(repo), max_age=0.01)
+    expired = len(spawned)
+    spawned.clear()
+    git_state.run_git(['status', '--porcelain'], cwd=str(repo), max_age=60)
+    return expired == 1 and len(spawned) == 0
+
+
+def main():
+    print("Testing git_state.py...")
+    print("=" * 50)
+
+    test_cases = [
+        ('unchanged repository is served from the cache', test_unchanged_repository_is_served_from_cache),
+        ('commits and checkouts invalidate cached results', test_commit_and_checkout_invalidate),
+        ('changed_paths and invalidate() force a refresh', test_changed_paths_and_invalidate_force_refresh),
+        ('max_age expires cached results', test_max_age_expires_entries),
+    ]
+
+    passed = 0
+    for name, test in test_cases:
+        if test():
+            passed += 1
+            print(f"✅ {name}")
+        else:
+            print(f"❌ {name}")
+
+    print("\n" + "=" * 50)
+    print(f"Results: {passed}/{len(test_cases)} tests passed")
+
+    if passed == len(test_cases):
+        print("🎉 All tests passed!")
+        return 0
+    else:
+        print("❌ Some tests failed!")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
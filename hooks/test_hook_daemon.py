@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Test script for hook_daemon.py / hook_client.py
+
+Runs each hook through the daemon and standalone, and checks that the exit code
+and JSON output are relayed unchanged. With stand-in hooks served in-process,
+checks that sessions run concurrently with their own stdio, that runs of one
+session are serialized, and that hooks see the client's cwd and environment.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import hook_daemon
+
+
+HOOKS_DIR = Path(__file__).parent
+
+VOLATILE_KEYS = {'timestamp', 'execution_time'}
+
+
+def strip_volatile(value):
+    """Drop timestamp-like fields that legitimately differ between runs"""
+    if isinstance(value, dict):
+        return {k: strip_volatile(v) for k, v in value.items() if k not in VOLATILE_KEYS}
+    if isinstance(value, list):
+        return [strip_volatile(v) for v in value]
+    return value
+
+
+def run(command, payload, env):
+    return subprocess.run(
+        command, input=payload, capture_output=True, text=True, timeout=30, env=env
+    )
+
+
+def wait_for_socket(socket_path, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if os.path.exists(socket_path):
+            return True
+        time.sleep(0.05)
+    return False
+
+
+class StandInHook:
+    """Hook module stand-in: echoes its payload, cwd and environment after a delay"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    def main(self):
+        payload = json.loads(sys.stdin.read())
+        time.sleep(self.delay)
+        print(json.dumps({
+            'echo': payload.get('echo'),
+            'cwd': os.getcwd(),
+            'project_dir': os.environ.get('CLAUDE_PROJECT_DIR')
+        }))
+        sys.exit(0)
+
+
+class StandInRegistry:
+    def __init__(self, delay=0.0):
+        self.hook = StandInHook(delay)
+
+    def get(self, hook_name):
+        return self.hook
+
+
+def run_in_threads(registry, payloads, cwd, env):
+    responses = [None] * len(payloads)
+
+    def run(index):
+        responses[index] = hook_daemon.run_hook(registry, 'stand_in', json.dumps(payloads[index]), cwd, env)
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(len(payloads))]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return responses, time.perf_counter() - started
+
+
+def test_sessions_run_concurrently_with_own_stdio():
+    registry = StandInRegistry(delay=0.3)
+    env = dict(os.environ)
+    payloads = [{'session_id': f'session-{n}', 'echo': n} for n in range(4)]
+    responses, seconds = run_in_threads(registry, payloads, os.getcwd(), env)
+    return seconds < 0.9 and [json.loads(response['stdout'])['echo'] for response in responses] == [0, 1, 2, 3]
+
+
+def test_one_session_is_serialized():
+    registry = StandInRegistry(delay=0.2)
+    payloads = [{'session_id': 'same-session', 'echo': n} for n in range(3)]
+    responses, seconds = run_in_threads(registry, payloads, os.getcwd(), dict(os.environ))
+    return seconds >= 0.6 and all(response['exit_code'] == 0 for response in responses)
+
+
+def test_client_cwd_and_env_reach_the_hook():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        socket_path = os.path.join(tmp_dir, 'stand-in.sock')
+        server = hook_daemon.HookDaemonServer(socket_path, StandInRegistry())
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            project_dir = os.path.realpath(tempfile.mkdtemp(dir=tmp_dir))
+            env = dict(os.environ, CLAUDE_HOOK_DAEMON_SOCKET=socket_path, CLAUDE_PROJECT_DIR=project_dir)
+            result = subprocess.run(
+                [sys.executable, str(HOOKS_DIR.resolve() / 'hook_client.py'), 'stand_in'],
+                input=json.dumps({'echo': 'hello'}), capture_output=True, text=True, timeout=30,
+                env=env, cwd=project_dir
+            )
+        finally:
+            server.shutdown()
+            server.server_close()
+    output = json.loads(result.stdout)
+    return result.returncode == 0 and output == {'echo': 'hello', 'cwd': project_dir, 'project_dir': project_dir}
+
+
+CONCURRENCY_TESTS = [
+    ('sessions run concurrently with their own stdio', test_sessions_run_concurrently_with_own_stdio),
+    ('runs of one session are serialized', test_one_session_is_serialized),
+    ("hooks see the client's cwd and environment", test_client_cwd_and_env_reach_the_hook),
+]
+
+
+def main():
+    print("Testing hook_daemon.py / hook_client.py...")
+    print("=" * 50)
+
+    test_cases = [
+        ('pre_tool_use', {
+            'event': 'pre_tool_use',
+            'tool': {'name': 'Write', 'parameters': {'file_path': '/tmp/daemon_test.md', 'content': 'x'}},
+            'conversation_context': 'todo list'
+        }),
+        ('pre_tool_use', {
+            'event': 'pre_tool_use',
+            'tool': {'name': 'Edit', 'parameters': {'file_path': 'relative/path.py'}}
+        }),
+        ('combined_pre_tool_use', {
+            'event': 'pre_tool_use',
+            'tool': {'name': 'Write', 'parameters': {'file_path': '/tmp/daemon_hook.py', 'content': 'x'}},
+            'conversation_context': 'I will write the hook'
+        }),
+        ('user_prompt_agent_enforcer', {'prompt': 'Create a new service class'}),
+        ('error_attention_notification', {
+            'event': 'notification',
+            'notification': {'type': 'info', 'message': 'all good', 'level': 'info'}
+        }),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        env = dict(os.environ)
+        env['CLAUDE_HOOK_DAEMON_SOCKET'] = os.path.join(tmp_dir, 'hook-daemon.sock')
+        env['HOME'] = tmp_dir
+
+        daemon = subprocess.Popen(
+            [sys.executable, str(HOOKS_DIR / 'hook_daemon.py')],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env
+        )
+
+        passed = 0
+        try:
+            if not wait_for_socket(env['CLAUDE_HOOK_DAEMON_SOCKET']):
+                print("❌ Daemon socket never appeared")
+                return 1
+
+            for hook_name, payload in test_cases:
+                data = json.dumps(payload)
+                via_daemon = run([sys.executable, str(HOOKS_DIR / 'hook_client.py'), hook_name], data, env)
+                direct = run([sys.executable, str(HOOKS_DIR / f'{hook_name}.py')], data, env)
+
+                same_exit = via_daemon.returncode == direct.returncode
+                same_output = strip_volatile(json.loads(via_daemon.stdout)) == strip_volatile(json.loads(direct.stdout))
+
+                if same_exit and same_output:
+                    passed += 1
+                    print(f"✅ {hook_name}: exit {via_daemon.returncode}, output relayed unchanged")
+                else:
+                    print(f"❌ {hook_name}: daemon exit {via_daemon.returncode} vs direct {direct.returncode}")
+        finally:
+            daemon.terminate()
+            daemon.wait(timeout=10)
+
+        # Without a daemon the client must fall back to the standalone hook
+        fallback = run(
+            [sys.executable, str(HOOKS_DIR / 'hook_client.py'), 'pre_tool_use'],
+            json.dumps(test_cases[1][1]), env
+        )
+        if fallback.returncode == 2 and json.loads(fallback.stdout).get('allowed') is False:
+            passed += 1
+            print("✅ Client falls back to direct execution when the daemon is down")
+        else:
+            print(f"❌ Fallback execution returned exit {fallback.returncode}")
+
+    for name, test in CONCURRENCY_TESTS:
+        if test():
+            passed += 1
+            print(f"✅ {name}")
+        else:
+            print(f"❌ {name}")
+
+    total = len(test_cases) + 1 + len(CONCURRENCY_TESTS)
+    print("\n" + "=" * 50)
+    print(f"Results: {passed}/{total} tests passed")
+
+    if passed == total:
+        print("🎉 All tests passed!")
+        return 0
+    else:
+        print("❌ Some tests failed!")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
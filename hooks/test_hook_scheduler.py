@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Test script for hook_scheduler.py
+
+Schedules checks the way post_tool_use.py does, with a blocking check slow
+enough to spend most of the budget, and verifies ordering, that blocking
+checks always run and that advisory checks that no longer fit, or that are
+still running at the deadline, are skipped and reported.
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+os.environ['HOME'] = tempfile.mkdtemp(prefix='hook_scheduler_test_')
+
+import hook_scheduler
+from hook_scheduler import check, run_checks, COST_CLASSES
+
+
+def recorder(order, name, seconds=0.0, value=None):
+    def run():
+        order.append(name)
+        time.sleep(seconds)
+        return value if value is not None else name
+    return run
+
+
+def test_blocking_first_then_priority_order():
+    order = []
+    schedule = run_checks([
+        check('advisory_late', recorder(order, 'advisory_late'), priority=90),
+        check('advisory_early', recorder(order, 'advisory_early'), cost='filesystem', priority=10),
+        check('blocking', recorder(order, 'blocking'), priority=99, blocking=True),
+    ])
+    return (
+        order == ['blocking', 'advisory_early', 'advisory_late'] and
+        schedule['results'] == {name: name for name in order} and
+        schedule['skipped_checks'] == [] and schedule['budget_ms'] == 500.0
+    )
+
+
+def test_budget_skips_expensive_advisory_checks():
+    order = []
+    schedule = run_checks([
+        check('subprocess_check', recorder(order, 'subprocess_check'), cost='subprocess', priority=10),
+        check('cpu_check', recorder(order, 'cpu_check'), cost='cpu', priority=20),
+        check('import_check', recorder(order, 'import_check'), cost='import', priority=30),
+        # Blocking checks run even though they overrun the budget
+        check('slow_blocking', recorder(order, 'slow_blocking', seconds=0.15), cost='import', blocking=True),
+    ], budget_seconds=0.25)
+
+    skipped = {entry['name']: entry for entry in schedule['skipped_checks']}
+    remaining = skipped.get('subprocess_check', {}).get('remaining_ms', -1)
+    return (
+        order == ['slow_blocking', 'cpu_check'] and
+        set(schedule['results']) == {'slow_blocking', 'cpu_check'} and
+        list(skipped) == ['subprocess_check', 'import_check'] and
+        all(entry['reason'] == 'latency budget exhausted' for entry in skipped.values()) and
+        skipped['subprocess_check']['cost'] == 'subprocess' and skipped['subprocess_check']['priority'] == 10 and
+        0 <= remaining < COST_CLASSES['subprocess'] * 1000 and
+        schedule['elapsed_ms'] >= 150
+    )
+
+
+def test_exhausted_budget_still_runs_blocking_checks():
+    order = []
+    schedule = run_checks([
+        check('advisory', recorder(order, 'advisory')),
+        check('blocking', recorder(order, 'blocking', value={'exit_code': 2}), blocking=True),
+    ], budget_seconds=0)
+    return (
+        order == ['blocking'] and schedule['results'] == {'blocking': {'exit_code': 2}} and
+        schedule['skipped_checks'][0]['name'] == 'advisory' and
+        schedule['skipped_checks'][0]['remaining_ms'] == 0
+    )
+
+
+def test_admitted_check_is_abandoned_at_the_deadline():
+    order = []
+    schedule = run_checks([
+        # Admitted as a cheap check, but runs well past the budget
+        check('hanging', recorder(order, 'hanging', seconds=1.0), cost='cpu', priority=10),
+        check('later', recorder(order, 'later'), cost='cpu', priority=20),
+    ], budget_seconds=0.1)
+    skipped = schedule['skipped_checks']
+    return (
+        order == ['hanging'] and schedule['results'] == {} and
+        [entry['name'] for entry in skipped] == ['hanging', 'later'] and
+        skipped[0]['reason'] == 'latency budget exceeded while running' and
+        skipped[1]['reason'] == 'latency budget exhausted' and
+        100 <= schedule['elapsed_ms'] < 300
+    )
+
+
+def test_advisory_check_errors_propagate():
+    def failing():
+        raise OSError('disk unavailable')
+    try:
+        run_checks([check('failing', failing)])
+    except OSError as e:
+        return str(e) == 'disk unavailable'
+    return False
+
+
+def test_unknown_cost_class_is_rejected():
+    try:
+        hook_scheduler.check('network', lambda: None, cost='network')
+    except ValueError:
+        return True
+    return False
+
+
+def main():
+    print("Testing hook_scheduler.py...")
+    print("=" * 50)
+
+    test_cases = [
+        ('blocking checks first, then priority order', test_blocking_first_then_priority_order),
+        ('advisory checks over the remaining budget are skipped', test_budget_skips_expensive_advisory_checks),
+        ('blocking checks run with no budget left', test_exhausted_budget_still_runs_blocking_checks),
+        ('admitted checks are abandoned at the deadline', test_admitted_check_is_abandoned_at_the_deadline),
+        ('advisory check errors propagate', test_advisory_check_errors_propagate),
+        ('unknown cost classes are rejected', test_unknown_cost_class_is_rejected),
+    ]
+
+    passed = 0
+    for name, test in test_cases:
+        if test():
+            passed += 1
+            print(f"✅ {name}")
+        else:
+            print(f"❌ {name}")
+
+    print("\n" + "=" * 50)
+    print(f"Results: {passed}/{len(test_cases)} tests passed")
+
+    if passed == len(test_cases):
+        print("🎉 All tests passed!")
+        return 0
+    else:
+        print("❌ Some tests failed!")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
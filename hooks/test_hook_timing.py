@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test script for hook_timing.py
+
+Checks histogram percentiles against exact ones, stage accounting inside a
+timed hook run, and that runs saved by concurrent processes are all merged.
+"""
+
+import os
+import sys
+import random
+import tempfile
+import multiprocessing
+
+os.environ['HOME'] = tempfile.mkdtemp(prefix='hook_timing_test_')
+
+import hook_timing
+
+
+PROCESSES = 20
+RUNS_PER_PROCESS = 25
+
+
+def test_percentiles_within_bucket_error():
+    random.seed(3)
+    values = [random.lognormvariate(1, 1.2) for _ in range(5000)]
+    histogram = hook_timing.new_histogram()
+    for value in values:
+        hook_timing.observe(histogram, value)
+    values.sort()
+    ok = histogram['count'] == len(values)
+    for q in hook_timing.PERCENTILES:
+        exact = values[max(1, -(-len(values) * q // 100)) - 1]
+        ok = ok and abs(hook_timing.percentile(histogram, q) - exact) / exact < 0.1
+    return ok
+
+
+def test_timed_run_records_stages():
+    @hook_timing.staged('parse_input')
+    def parse():
+        return {}
+
+    @hook_timing.staged()
+    def validate(data):
+        with hook_timing.stage('validate'):  # Nested entry of the same stage counts once
+            return parse()
+
+    @hook_timing.timed('test_hook')
+    def main():
+        validate(parse())
+        hook_timing.record_stage('extra', 2.5)
+        sys.exit(2)  # Blocking is a result, not a failure
+
+    try:
+        main()
+    except SystemExit:
+        pass
+
+    @hook_timing.timed('test_hook')
+    def failing_main():
+        raise RuntimeError('boom')
+
+    try:
+        failing_main()
+    except RuntimeError:
+        pass
+
+    hook = hook_timing.load_histograms()['test_hook']
+    return (
+        hook['runs'] == 2 and hook['failures'] == 1 and
+        hook['stages']['parse_input']['count'] == 1 and
+        hook['stages']['validate']['count'] == 1 and
+        hook['stages']['extra']['min_ms'] == 2.5 and
+        not hook_timing._runs
+    )
+
+
+def save_runs(directory, worker_id):
+    for n in range(RUNS_PER_PROCESS):
+        hook_timing.save_run('concurrent_hook', 1.0 + worker_id, {'stage': 0.5}, ok=n % 5 != 0, directory=directory)
+
+
+def test_concurrent_runs_are_merged():
+    directory = tempfile.mkdtemp()
+    workers = [multiprocessing.Process(target=save_runs, args=(directory, worker_id)) for worker_id in range(PROCESSES)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+
+    expected = PROCESSES * RUNS_PER_PROCESS
+    performance = hook_timing.hook_performance(directory)
+    hook = performance['hooks']['concurrent_hook']
+    return (
+        hook['runs'] == expected and hook['total']['count'] == expected and
+        hook['stages']['stage']['count'] == expected and
+        performance['hook_success_rate'] == 80.0
+    )
+
+
+def main():
+    print("Testing hook_timing.py...")
+    print("=" * 50)
+
+    test_cases = [
+        ('percentiles are within the bucket error', test_percentiles_within_bucket_error),
+        ('timed runs record stages once and count failures', test_timed_run_records_stages),
+        (f'{PROCESSES} processes saving runs lose none', test_concurrent_runs_are_merged),
+    ]
+
+    passed = 0
+    for name, test in test_cases:
+        if test():
+            passed += 1
+            print(f"✅ {name}")
+        else:
+            print(f"❌ {name}")
+
+    print("\n" + "=" * 50)
+    print(f"Results: {passed}/{len(test_cases)} tests passed")
+
+    if passed == len(test_cases):
+        print("🎉 All tests passed!")
+        return 0
+    else:
+        print("❌ Some tests failed!")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -52,6 +52,13 @@ def main():
                 'parameters': {'file_path': '/test/path'}
             }
         }),
+        ('combined_pre_tool_use.py', {
+            'event': 'pre_tool_use',
+            'tool': {
+                'name': 'Read',
+                'parameters': {'file_path': '/test/path'}
+            }
+        }),
         ('post_tool_use.py', {
             'event': 'post_tool_use',
             'tool': {
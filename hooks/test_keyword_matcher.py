@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test script for keyword_matcher.py
+
+Checks KeywordMatcher against the plain `in` / r'\b...\b' checks it replaces,
+on fixed texts (including overlapping keywords) and on random ones.
+"""
+
+import re
+import sys
+import random
+
+from keyword_matcher import KeywordMatcher
+
+
+TABLES = {
+    'thinking': ['think', 'think hard', 'think harder', 'ultra think'],
+    'claims': ['will work', 'should work', 'this fixes'],
+    'implementation': ['write', 'write code', 'code', 'escribir código', 'build'],
+    'shared': ['code', 'test']
+}
+
+TEXTS = [
+    '',
+    'we should think harder about this, it will work',
+    'ultra think: write code, then test the build',
+    'the codebase rewrites itself; builder tests',
+    'please escribir código para el hook',
+    'think hard',
+    'ultra thinking: codecode, writecode',
+    'rewrite coder tested',
+]
+
+FRAGMENTS = ['think', ' hard', 'er', 'ultra ', 'will', ' work', 'write', ' code', 'co', 'de', 'test', 'build', ' ', '_', 'x']
+
+
+def random_texts(count, seed=4):
+    random.seed(seed)
+    return [''.join(random.choice(FRAGMENTS) for _ in range(random.randint(1, 12))) for _ in range(count)]
+
+
+def naive_scan(text, word_boundary):
+    hits = {}
+    for category, keywords in TABLES.items():
+        if word_boundary:
+            found = [k for k in keywords if re.search(r'\b' + re.escape(k) + r'\b', text)]
+        else:
+            found = [k for k in keywords if k in text]
+        if found:
+            hits[category] = found
+    return hits
+
+
+def main():
+    print("Testing keyword_matcher.py...")
+    print("=" * 50)
+
+    passed = 0
+    total = 0
+
+    for word_boundary in (False, True):
+        matcher = KeywordMatcher(TABLES, word_boundary=word_boundary)
+        for text in TEXTS:
+            total += 1
+            expected = naive_scan(text, word_boundary)
+            result = matcher.scan(text)
+            if result == expected and matcher.contains(text) == bool(expected):
+                passed += 1
+                print(f"✅ word_boundary={word_boundary}: {text[:40]!r}")
+            else:
+                print(f"❌ word_boundary={word_boundary}: {text[:40]!r}")
+                print(f"   Expected: {expected}")
+                print(f"   Got: {result}")
+
+    for word_boundary in (False, True):
+        matcher = KeywordMatcher(TABLES, word_boundary=word_boundary)
+        texts = random_texts(500)
+        total += 1
+        mismatches = [text for text in texts
+                      if matcher.scan(text) != naive_scan(text, word_boundary) or
+                      matcher.contains(text) != bool(naive_scan(text, word_boundary))]
+        if not mismatches:
+            passed += 1
+            print(f"✅ word_boundary={word_boundary}: {len(texts)} random texts")
+        else:
+            print(f"❌ word_boundary={word_boundary}: {len(mismatches)} of {len(texts)} random texts")
+            print(f"   First: {mismatches[0]!r}")
+
+    print("\n" + "=" * 50)
+    print(f"Results: {passed}/{total} tests passed")
+
+    if passed == total:
+        print("🎉 All tests passed!")
+        return 0
+    else:
+        print("❌ Some tests failed!")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test script for scan_state.py
+
+Grows conversation contexts step by step, as a session would, and checks the
+incremental per-session scan against a full rescan at every step.
+"""
+
+import os
+import random
+import sys
+import tempfile
+
+os.environ['HOME'] = tempfile.mkdtemp(prefix='scan_state_test_')
+
+import scan_state
+from context_view import CONTEXT_MATCHER, CONTEXT_COUNTED
+
+
+CHUNKS = [
+    'Let me ', 'think', ' hard about the hook. ', 'It will', ' work. ', 'file_', 'path ',
+    'TODO', 'Write ', 'ultra', ' think ', 'deploy the security-spec', 'ialist. ', 'x' * 40
+]
+
+
+def full_scan(context):
+    text = str(context).lower()
+    found = CONTEXT_MATCHER.find(text)
+    return found, {pattern: text.count(pattern) for pattern in CONTEXT_COUNTED}
+
+
+def run_session(session_id, steps, as_list):
+    random.seed(session_id)
+    context = [] if as_list else ''
+    for _ in range(steps):
+        chunk = ''.join(random.choice(CHUNKS) for _ in range(random.randint(0, 3)))
+        if as_list:
+            context = context + [chunk]
+        else:
+            context = context + chunk
+        result = scan_state.scan_context(
+            context, CONTEXT_MATCHER, session_id=session_id, count_patterns=CONTEXT_COUNTED
+        )
+        if result != full_scan(context):
+            return False
+    return True
+
+
+def test_rewritten_middle_is_detected():
+    # Head, tail and length stay the same: only a full-prefix check notices
+    filler = 'x' * 2000
+    before = filler + 'please think hard about it' + filler
+    after = filler + 'nothing to look at here ok' + filler
+    string_ok = (
+        scan_state.scan_context(before, CONTEXT_MATCHER, session_id='session-middle',
+                                count_patterns=CONTEXT_COUNTED) == full_scan(before) and
+        scan_state.scan_context(after + ' done', CONTEXT_MATCHER, session_id='session-middle',
+                                count_patterns=CONTEXT_COUNTED) == full_scan(after + ' done')
+    )
+
+    items_before = ['start', 'TODO: write the hook', 'end']
+    items_after = ['start', 'nothing pending here', 'end', 'more']
+    list_ok = (
+        scan_state.scan_context(items_before, CONTEXT_MATCHER, session_id='session-middle-list',
+                                count_patterns=CONTEXT_COUNTED) == full_scan(items_before) and
+        scan_state.scan_context(items_after, CONTEXT_MATCHER, session_id='session-middle-list',
+                                count_patterns=CONTEXT_COUNTED) == full_scan(items_after)
+    )
+    return len(before) == len(after) and string_ok and list_ok
+
+
+def main():
+    print("Testing scan_state.py...")
+    print("=" * 50)
+
+    test_cases = [
+        ('string context grows by appending', lambda: run_session('session-str', 60, False)),
+        ('list context grows by appending items', lambda: run_session('session-list', 60, True)),
+        ('rewritten context falls back to a full scan', lambda: (
+            run_session('session-reset', 20, False) and
+            scan_state.scan_context('no keywords here', CONTEXT_MATCHER, session_id='session-reset',
+                                    count_patterns=CONTEXT_COUNTED) == full_scan('no keywords here')
+        )),
+        ('rewritten middle falls back to a full scan', test_rewritten_middle_is_detected),
+        ('anonymous session scans without state', lambda: (
+            scan_state.scan_context('think hard', CONTEXT_MATCHER, session_id='unknown') ==
+            (full_scan('think hard')[0], {}) and
+            not (scan_state.get_state_dir() / 'unknown-context.json').exists()
+        )),
+    ]
+
+    passed = 0
+    for name, test in test_cases:
+        if test():
+            passed += 1
+            print(f"✅ {name}")
+        else:
+            print(f"❌ {name}")
+
+    print("\n" + "=" * 50)
+    print(f"Results: {passed}/{len(test_cases)} tests passed")
+
+    if passed == len(test_cases):
+        print("🎉 All tests passed!")
+        return 0
+    else:
+        print("❌ Some tests failed!")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
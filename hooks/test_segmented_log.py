@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test script for segmented_log.py
+
+Writes timestamped records across several rotated (and compressed) segments
+and checks that time-range reads return exactly the records in range.
+"""
+
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+from segmented_log import SegmentedLog
+
+
+START = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def write_records(log, count, step_seconds=60):
+    records = []
+    for n in range(count):
+        record = {
+            'timestamp': (START + timedelta(seconds=n * step_seconds)).isoformat(),
+            'n': n,
+            'payload': 'x' * 200
+        }
+        log.append(record)
+        records.append(record)
+    return records
+
+
+def test_rotates_by_size_and_compresses():
+    log = SegmentedLog(tempfile.mkdtemp(), max_segment_bytes=20 * 1024, index_interval_bytes=2048)
+    write_records(log, 500)
+    segments = log.segments()
+    sealed = [segment for segment in segments if segment[1] is not None]
+    return (
+        len(sealed) >= 4 and
+        all(path.name.endswith('.jsonl.gz') for _, _, path, _ in sealed) and
+        segments[-1][2].name == 'current.jsonl'
+    )
+
+
+def test_range_read_matches_full_scan():
+    log = SegmentedLog(tempfile.mkdtemp(), max_segment_bytes=20 * 1024, index_interval_bytes=2048)
+    records = write_records(log, 500)
+    ok = [record['n'] for record in log.read()] == list(range(500))
+    for since_n, until_n in [(0, 10), (123, 321), (480, 499), (250, 250)]:
+        since = START + timedelta(minutes=since_n)
+        until = START + timedelta(minutes=until_n)
+        expected = [record['n'] for record in records if since_n <= record['n'] <= until_n]
+        ok = ok and [record['n'] for record in log.read(since, until)] == expected
+        ok = ok and [record['n'] for record in log.read(since.isoformat(), until.isoformat())] == expected
+    return ok
+
+
+def test_index_is_sparse():
+    log = SegmentedLog(tempfile.mkdtemp(), index_interval_bytes=4096, compress=False)
+    write_records(log, 200)
+    with open(log.current_index) as f:
+        entries = [line for line in f.read().splitlines() if not line.startswith('#')]
+    size = log.current_file.stat().st_size
+    return 1 < len(entries) <= size // 4096 + 1
+
+
+def test_rotates_by_age():
+    log = SegmentedLog(tempfile.mkdtemp(), max_segment_seconds=3600, compress=False)
+    log.append({'timestamp': START.isoformat(), 'n': 0})
+    log.append({'timestamp': START.isoformat(), 'n': 1})
+    # Age counts from when the segment was opened, not from record timestamps
+    not_rotated = len(log.segments()) == 1
+    with open(log.current_index) as f:
+        lines = f.read().splitlines()
+    lines[0] = f"# created {(datetime.now() - timedelta(hours=2)).timestamp():.6f}"
+    with open(log.current_index, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+    log.append({'timestamp': START.isoformat(), 'n': 2})
+    return not_rotated and len(log.segments()) == 2 and [record['n'] for record in log.read()] == [0, 1, 2]
+
+
+def test_read_survives_concurrent_seal_and_compress():
+    log = SegmentedLog(tempfile.mkdtemp(), max_segment_bytes=20 * 1024, index_interval_bytes=2048, compress=False)
+    records = write_records(log, 200)
+    reader = log.read()
+    read = [next(reader)]  # Segments are listed and the first one is open
+
+    # A writer seals current.jsonl, and a compressor swaps a sealed segment for its .gz
+    log.max_segment_bytes = 1
+    log.compress = True
+    extra = {'timestamp': (START + timedelta(minutes=200)).isoformat(), 'n': 200}
+    log.append(extra)
+    for _, last, path, _ in log.segments()[1:]:
+        if last is not None and not path.name.endswith('.gz'):
+            log._compress(path)
+            break
+
+    read += list(reader)
+    return [record['n'] for record in read] == [record['n'] for record in records + [extra]]
+
+
+def main():
+    print("Testing segmented_log.py...")
+    print("=" * 50)
+
+    test_cases = [
+        ('segments rotate by size and are compressed when sealed', test_rotates_by_size_and_compresses),
+        ('time-range reads match a full scan', test_range_read_matches_full_scan),
+        ('index keeps one entry per interval', test_index_is_sparse),
+        ('segments rotate by age', test_rotates_by_age),
+        ('reads survive a concurrent seal and compress', test_read_survives_concurrent_seal_and_compress),
+    ]
+
+    passed = 0
+    for name, test in test_cases:
+        if test():
+            passed += 1
+            print(f"✅ {name}")
+        else:
+            print(f"❌ {name}")
+
+    print("\n" + "=" * 50)
+    print(f"Results: {passed}/{len(test_cases)} tests passed")
+
+    if passed == len(test_cases):
+        print("🎉 All tests passed!")
+        return 0
+    else:
+        print("❌ Some tests failed!")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test script for session_start.py
+
+Builds a small project tree with known modification times and checks that
+find_recent_files returns the newest files first, respects its limit, prunes
+hidden and ignored directories, and reports a truncated walk.
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+os.environ['HOME'] = tempfile.mkdtemp(prefix='session_start_test_')
+
+from session_start import find_recent_files
+
+
+NOW = time.time()
+
+
+def make_tree():
+    """Project tree: src/file_N.py modified N minutes ago, plus pruned directories with newer files."""
+    root = Path(tempfile.mkdtemp(prefix='session_start_tree_'))
+    for n in range(1, 6):
+        write(root / 'src' / f'file_{n}.py', NOW - n * 60)
+    write(root / 'README.md', NOW - 30 * 60)
+    write(root / 'old.txt', NOW - 3 * 86400)
+    for pruned in ('.git/index', '.cache/entry', 'node_modules/pkg/index.js',
+                   'src/__pycache__/file_1.pyc', 'target/debug/app'):
+        write(root / pruned, NOW)
+    return root
+
+
+def write(path, mtime):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(path.name)
+    os.utime(path, (mtime, mtime))
+
+
+def test_newest_first_without_pruned_directories():
+    recent, truncated = find_recent_files(make_tree(), NOW - 86400)
+    return not truncated and recent == [
+        os.path.join('src', f'file_{n}.py') for n in range(1, 6)
+    ] + ['README.md']
+
+
+def test_limit_keeps_the_newest():
+    recent, truncated = find_recent_files(make_tree(), NOW - 86400, limit=3)
+    return not truncated and recent == [os.path.join('src', f'file_{n}.py') for n in range(1, 4)]
+
+
+def test_entry_budget_truncates():
+    root = make_tree()
+    recent, truncated = find_recent_files(root, NOW - 86400, max_entries=3)
+    complete, _ = find_recent_files(root, NOW - 86400)
+    return truncated and len(recent) < len(complete) and set(recent) <= set(complete)
+
+
+def main():
+    print("Testing session_start.py...")
+    print("=" * 50)
+
+    test_cases = [
+        ('recent files are newest first, pruned directories skipped', test_newest_first_without_pruned_directories),
+        ('limit keeps only the newest files', test_limit_keeps_the_newest),
+        ('entry budget truncates the walk', test_entry_budget_truncates),
+    ]
+
+    passed = 0
+    for name, test in test_cases:
+        if test():
+            passed += 1
+            print(f"✅ {name}")
+        else:
+            print(f"❌ {name}")
+
+    print("\n" + "=" * 50)
+    print(f"Results: {passed}/{len(test_cases)} tests passed")
+
+    if passed == len(test_cases):
+        print("🎉 All tests passed!")
+        return 0
+    else:
+        print("❌ Some tests failed!")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
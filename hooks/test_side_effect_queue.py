@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test script for side_effect_queue.py
+
+Enqueues post-tool side effects the way post_tool_use.py does and checks that
+a drain coalesces them, removes every job and records the outcome.
+"""
+
+import os
+import sys
+import tempfile
+
+os.environ['HOME'] = tempfile.mkdtemp(prefix='side_effect_queue_test_')
+
+import side_effect_queue
+
+
+QUEUE = 'test_queue'
+
+
+def test_drain_coalesces_per_task():
+    calls = []
+
+    def record(payloads):
+        calls.append([payload['n'] for payload in payloads])
+        return [f"handled {len(payloads)}"]
+
+    for n in range(5):
+        side_effect_queue.enqueue(QUEUE, 'record', {'n': n})
+    processed = side_effect_queue.drain(QUEUE, {'record': record})
+    results = side_effect_queue.read_last_results(QUEUE)
+    return (
+        processed == 5 and calls == [[0, 1, 2, 3, 4]] and
+        results['tasks']['record']['actions'] == ['handled 5'] and
+        not side_effect_queue.pending_jobs(QUEUE)
+    )
+
+
+def test_failing_handler_is_reported_and_dropped():
+    def fail(payloads):
+        raise RuntimeError('disk full')
+
+    side_effect_queue.enqueue(QUEUE, 'fail', {})
+    side_effect_queue.enqueue(QUEUE, 'missing', {})
+    side_effect_queue.drain(QUEUE, {'fail': fail})
+    tasks = side_effect_queue.read_last_results(QUEUE)['tasks']
+    return (
+        tasks['fail']['error'] == 'disk full' and
+        tasks['missing']['error'] == 'Unknown side effect: missing' and
+        not side_effect_queue.pending_jobs(QUEUE)
+    )
+
+
+def test_drain_skips_while_worker_holds_lock():
+    side_effect_queue.enqueue(QUEUE, 'record', {'n': 0})
+    lock_file = side_effect_queue._acquire_lock(QUEUE)
+    try:
+        skipped = side_effect_queue.drain(QUEUE, {'record': lambda payloads: []}) is None
+        running = side_effect_queue.worker_running(QUEUE)
+    finally:
+        lock_file.close()
+    drained = side_effect_queue.drain(QUEUE, {'record': lambda payloads: []}) == 1
+    return skipped and running and drained and not side_effect_queue.worker_running(QUEUE)
+
+
+def test_post_tool_use_handlers_coalesce():
+    import post_tool_use
+
+    payloads = [
+        {'modified_files': ['a.md'], 'tool_name': 'Edit', 'cwd': os.getcwd()},
+        {'modified_files': ['a.md', 'b.md'], 'tool_name': 'Write', 'cwd': os.getcwd()}
+    ]
+    actions = post_tool_use.run_queued_documentation_references(payloads)
+    return (
+        post_tool_use._merged_files(payloads) == ['a.md', 'b.md'] and
+        actions == ["Documentation files modified: 2"] and
+        set(post_tool_use.SIDE_EFFECT_HANDLERS) <= set(post_tool_use.MAINTENANCE_ORDER)
+    )
+
+
+def main():
+    print("Testing side_effect_queue.py...")
+    print("=" * 50)
+
+    test_cases = [
+        ('drain hands each task all its pending payloads at once', test_drain_coalesces_per_task),
+        ('failing and unknown tasks are reported, not retried', test_failing_handler_is_reported_and_dropped),
+        ('drain leaves the queue to a worker holding the lock', test_drain_skips_while_worker_holds_lock),
+        ('post_tool_use handlers merge queued file lists', test_post_tool_use_handlers_coalesce),
+    ]
+
+    passed = 0
+    for name, test in test_cases:
+        if test():
+            passed += 1
+            print(f"✅ {name}")
+        else:
+            print(f"❌ {name}")
+
+    print("\n" + "=" * 50)
+    print(f"Results: {passed}/{len(test_cases)} tests passed")
+
+    if passed == len(test_cases):
+        print("🎉 All tests passed!")
+        return 0
+    else:
+        print("❌ Some tests failed!")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,10 +18,13 @@ Exit Codes:
 
 import json
 import sys
-import re
 from typing import Dict, Any, List
 
+import hook_timing
+from keyword_matcher import KeywordMatcher
 
+
+@hook_timing.staged('parse_input')
 def load_json_from_stdin() -> Dict[str, Any]:
     """Load and validate JSON data from stdin."""
     try:
@@ -51,6 +54,12 @@ def get_implementation_keywords() -> List[str]:
     ]
 
 
+# Built once per process (reused across calls when served by hook_daemon.py)
+IMPLEMENTATION_MATCHER = KeywordMatcher(
+    {'implementation': get_implementation_keywords()}, word_boundary=True
+)
+
+
 def contains_implementation_request(prompt: str) -> bool:
     """
     Check if the prompt contains implementation-related keywords.
@@ -64,18 +73,9 @@ def contains_implementation_request(prompt: str) -> bool:
     if not prompt:
         return False
     
-    # Convert to lowercase for case-insensitive matching
-    prompt_lower = prompt.lower()
-    keywords = get_implementation_keywords()
-    
-    # Check for exact word matches to avoid false positives
-    for keyword in keywords:
-        # Use word boundaries to match complete words
-        pattern = r'\b' + re.escape(keyword) + r'\b'
-        if re.search(pattern, prompt_lower):
-            return True
-    
-    return False
+    # Convert to lowercase for case-insensitive matching; the matcher checks
+    # exact word matches (word boundaries) for all keywords in one pass
+    return IMPLEMENTATION_MATCHER.contains(prompt.lower())
 
 
 def should_enforce_agents(data: Dict[str, Any]) -> bool:
@@ -107,6 +107,7 @@ def create_enforcement_message() -> str:
     )
 
 
+@hook_timing.timed('user_prompt_agent_enforcer')
 def main():
     """Main hook execution function."""
     try:
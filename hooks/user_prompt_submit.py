@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # /// script
-# dependencies = ["pathlib", "json", "sys", "os", "datetime", "subprocess"]
+# dependencies = ["pathlib", "json", "sys", "os", "datetime"]
 # ///
 
 """
@@ -21,11 +21,15 @@ Exit Codes:
 import json
 import sys
 import os
-import subprocess
 from pathlib import Path
 from datetime import datetime
 
+import git_state
+import hook_timing
+from keyword_matcher import KeywordMatcher
 
+
+@hook_timing.staged('parse_input')
 def load_hook_data():
     """Load and validate hook data from stdin - fallback to defaults if no input"""
     try:
@@ -100,28 +104,19 @@ def load_hook_data():
 
 
 def get_git_status():
-    """Get current git status and recent commits"""
+    """Get current git status and recent commits (cached, see git_state)"""
     try:
-        # Get current branch
-        branch_result = subprocess.run(
-            ['git', 'branch', '--show-current'],
-            capture_output=True, text=True, cwd=os.getcwd()
-        )
-        current_branch = branch_result.stdout.strip() if branch_result.returncode == 0 else "unknown"
+        # Get current branch straight from HEAD
+        current_branch = git_state.get_current_branch()
+        if current_branch is None:
+            current_branch = "unknown"
         
         # Get recent commits
-        log_result = subprocess.run(
-            ['git', 'log', '--oneline', '-5'],
-            capture_output=True, text=True, cwd=os.getcwd()
-        )
-        recent_commits = log_result.stdout.strip() if log_result.returncode == 0 else "No commits found"
+        log_result = git_state.run_git(['log', '--oneline', '-5'])
+        recent_commits = log_result['stdout'].strip() if log_result['returncode'] == 0 else "No commits found"
         
         # Get git status
-        status_result = subprocess.run(
-            ['git', 'status', '--porcelain'],
-            capture_output=True, text=True, cwd=os.getcwd()
-        )
-        changes = status_result.stdout.strip() if status_result.returncode == 0 else ""
+        changes = git_state.get_porcelain_status()
         
         return {
             'branch': current_branch,
@@ -167,17 +162,38 @@ def get_framework_context():
     return context
 
 
+COMPLEXITY_INDICATORS = [
+    'create', 'build', 'implement', 'develop', 'design',
+    'multiple', 'several', 'steps', 'phases', 'workflow',
+    'system', 'framework', 'complete', 'comprehensive',
+    'integrate', 'coordinate', 'manage', 'organize'
+]
+
+# Personality recommendations: (hint, keywords that suggest it)
+PERSONALITY_HINTS = [
+    ("🎭 Strategic Orchestrator for planning and coordination",
+     ['plan', 'coordinate', 'organize', 'strategy']),
+    ("🛡️ System Guardian for validation and quality assurance",
+     ['validate', 'check', 'verify', 'test', 'secure']),
+    ("🤝 Collaborative Partner for exploration and discussion",
+     ['explore', 'brainstorm', 'discuss', 'think about']),
+    ("🔍 Research Specialist for deep investigation",
+     ['research', 'investigate', 'analyze', 'study']),
+    ("📚 Knowledge Curator for documentation and organization",
+     ['document', 'organize', 'structure', 'catalog'])
+]
+
+# One matcher for every prompt keyword table, built once per process
+PROMPT_MATCHER = KeywordMatcher({
+    'complexity': COMPLEXITY_INDICATORS,
+    **{hint: keywords for hint, keywords in PERSONALITY_HINTS}
+})
+
+
 def detect_task_complexity(prompt):
     """Analyze prompt to determine if TodoWrite should be recommended"""
-    complexity_indicators = [
-        'create', 'build', 'implement', 'develop', 'design',
-        'multiple', 'several', 'steps', 'phases', 'workflow',
-        'system', 'framework', 'complete', 'comprehensive',
-        'integrate', 'coordinate', 'manage', 'organize'
-    ]
-    
-    prompt_lower = prompt.lower()
-    complexity_score = sum(1 for indicator in complexity_indicators if indicator in prompt_lower)
+    hits = PROMPT_MATCHER.scan(prompt.lower())
+    complexity_score = len(hits.get('complexity', []))
     
     # Check for numbered lists or comma-separated tasks
     has_multiple_tasks = (',' in prompt and len(prompt.split(',')) > 2) or any(
@@ -220,23 +236,8 @@ def generate_context_injection(original_prompt, framework_context):
         )
     
     # Personality recommendations based on prompt analysis
-    prompt_lower = original_prompt.lower()
-    personality_hints = []
-    
-    if any(word in prompt_lower for word in ['plan', 'coordinate', 'organize', 'strategy']):
-        personality_hints.append("🎭 Strategic Orchestrator for planning and coordination")
-    
-    if any(word in prompt_lower for word in ['validate', 'check', 'verify', 'test', 'secure']):
-        personality_hints.append("🛡️ System Guardian for validation and quality assurance")
-    
-    if any(word in prompt_lower for word in ['explore', 'brainstorm', 'discuss', 'think about']):
-        personality_hints.append("🤝 Collaborative Partner for exploration and discussion")
-    
-    if any(word in prompt_lower for word in ['research', 'investigate', 'analyze', 'study']):
-        personality_hints.append("🔍 Research Specialist for deep investigation")
-    
-    if any(word in prompt_lower for word in ['document', 'organize', 'structure', 'catalog']):
-        personality_hints.append("📚 Knowledge Curator for documentation and organization")
+    hits = PROMPT_MATCHER.scan(original_prompt.lower())
+    personality_hints = [hint for hint, _ in PERSONALITY_HINTS if hint in hits]
     
     if personality_hints:
         context_sections.append("🎯 Suggested Personalities:\n" + "\n".join(f"  • {hint}" for hint in personality_hints))
@@ -264,6 +265,7 @@ USER REQUEST:
 {original_prompt}"""
 
 
+@hook_timing.timed('user_prompt_submit')
 def main():
     """Main hook execution"""
     try:
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Compact Activity Record Codec
+
+Activity log entries are whole hook payloads: tool parameters, results and
+sometimes entire file contents, written for every event. ActivityCodec stores
+them as compact binary frames for a SegmentedLog (hooks/segmented_log.py):
+
+    u32 body length | f64 epoch | u16 event id | u16 tool id | body
+
+- timestamp, event name and tool name are fixed fields; event and tool names
+  are interned in names.txt next to the segments (one JSON string per line,
+  id = line number, appended under a lock so concurrent writers agree)
+- the body is compact JSON of the remaining fields, with every string longer
+  than LARGE_VALUE_BYTES replaced by {"omitted_bytes": n, "blake2b": hex}
+- readers get the epoch from the header, so records outside a time range are
+  skipped without parsing their body
+
+Decoded records are dicts again (with large values still replaced).
+`python3 activity_codec.py <log directory>` converts a binary log back to
+JSONL on stdout.
+"""
+
+import json
+import sys
+import fcntl
+import math
+import struct
+import hashlib
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+# Strings longer than this (UTF-8 bytes) are stored as their size and hash
+LARGE_VALUE_BYTES = 256
+
+HEADER = struct.Struct('<IdHH')
+MAX_NAME_ID = 0xFFFF
+
+NAMES_FILE = 'names.txt'
+
+# Bodies are always UTF-8 JSON objects, so skip json.loads' encoding detection
+_json_decoder = json.JSONDecoder()
+
+
+def omit_large_values(value: Any) -> Any:
+    """Copy of value with long strings replaced by their size and hash."""
+    if isinstance(value, str):
+        encoded = value.encode('utf-8')
+        if len(encoded) > LARGE_VALUE_BYTES:
+            return {"omitted_bytes": len(encoded), "blake2b": hashlib.blake2b(encoded, digest_size=8).hexdigest()}
+        return value
+    if isinstance(value, dict):
+        return {key: omit_large_values(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [omit_large_values(item) for item in value]
+    return value
+
+
+class ActivityCodec:
+    """Binary frame codec for SegmentedLog with interned event and tool names."""
+
+    suffix = '.bin'
+
+    def __init__(self, directory: Path):
+        self.names_file = Path(directory) / NAMES_FILE
+        self.names = [None]  # id 0: no name
+        self.ids: Dict[str, int] = {}
+
+    def load_names(self):
+        """Read the name table (names are only ever appended)."""
+        names = [None]
+        try:
+            with open(self.names_file, 'r') as f:
+                for line in f:
+                    try:
+                        names.append(json.loads(line))
+                    except ValueError:
+                        names.append(None)  # Keep ids aligned with line numbers
+        except FileNotFoundError:
+            pass
+        self.names = names
+        self.ids = {name: index for index, name in enumerate(names) if isinstance(name, str)}
+
+    def intern(self, name: Optional[str]) -> int:
+        """Id of name, adding it to the table if needed; 0 if it cannot be interned."""
+        if not isinstance(name, str):
+            return 0
+        if name in self.ids:
+            return self.ids[name]
+
+        self.names_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.names_file.with_suffix('.lock'), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            self.load_names()
+            if name not in self.ids:
+                if len(self.names) > MAX_NAME_ID:
+                    return 0
+                with open(self.names_file, 'a') as f:
+                    f.write(json.dumps(name) + '\n')
+                self.ids[name] = len(self.names)
+                self.names.append(name)
+        return self.ids[name]
+
+    def name(self, name_id: int) -> Optional[str]:
+        if name_id >= len(self.names):
+            self.load_names()  # Added by another process since we last read
+        return self.names[name_id] if name_id < len(self.names) else None
+
+    def encode(self, record: Dict[str, Any]) -> bytes:
+        rest = dict(record)
+
+        epoch = math.nan
+        try:
+            moment = datetime.fromisoformat(rest['timestamp'])
+            if moment.tzinfo is None:  # Naive local times round-trip through the epoch
+                epoch = moment.timestamp()
+                del rest['timestamp']
+        except (KeyError, TypeError, ValueError):
+            pass
+
+        event_id = self.intern(rest.get('event'))
+        if event_id:
+            del rest['event']
+
+        tool_id = 0
+        tool = rest.get('tool')
+        if isinstance(tool, dict):
+            tool_id = self.intern(tool.get('name'))
+            if tool_id:
+                rest['tool'] = {key: value for key, value in tool.items() if key != 'name'}
+
+        body = json.dumps(omit_large_values(rest), separators=(',', ':')).encode('utf-8') if rest else b''
+        return HEADER.pack(len(body), epoch, event_id, tool_id) + body
+
+    def scan(self, stream):
+        """Yield (epoch or None, load) per complete frame; stops at a partial frame."""
+        while True:
+            header = stream.read(HEADER.size)
+            if len(header) < HEADER.size:
+                return
+            length, epoch, event_id, tool_id = HEADER.unpack(header)
+            body = stream.read(length)
+            if len(body) < length:
+                return
+            timestamp = None if math.isnan(epoch) else epoch
+            yield timestamp, (lambda frame=(timestamp, event_id, tool_id, body): self.decode(*frame))
+
+    def decode(self, epoch: Optional[float], event_id: int, tool_id: int, body: bytes) -> Dict[str, Any]:
+        record = {}
+        if epoch is not None:
+            record['timestamp'] = datetime.fromtimestamp(epoch).isoformat()
+        if event_id:
+            record['event'] = self.name(event_id)
+        if body:
+            record.update(_json_decoder.decode(body.decode('utf-8')))
+        if tool_id:
+            record['tool'] = {"name": self.name(tool_id), **record.get('tool', {})}
+        return record
+
+
+def to_jsonl(directory: Path, output, since=None, until=None) -> int:
+    """Write the records of a binary activity log as JSONL; returns the count."""
+    from segmented_log import SegmentedLog
+
+    count = 0
+    for record in SegmentedLog(directory, codec=ActivityCodec(directory)).read(since, until):
+        output.write(json.dumps(record) + '\n')
+        count += 1
+    return count
+
+
+def main():
+    """Convert a binary activity log back to JSONL."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Convert a binary activity log to JSONL')
+    parser.add_argument('directory', help='Binary activity log directory (e.g. data/activity_log_binary)')
+    parser.add_argument('--since', help='ISO timestamp (inclusive)')
+    parser.add_argument('--until', help='ISO timestamp (inclusive)')
+    args = parser.parse_args()
+
+    # Makes the hooks directory (segmented_log) importable
+    import metrics_storage  # noqa: F401
+
+    to_jsonl(Path(args.directory), sys.stdout, args.since, args.until)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
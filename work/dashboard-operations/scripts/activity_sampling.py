@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Adaptive Activity Sampling
+
+During parallel agent bursts every hook event writes a full activity log
+entry. Metrics counters are unaffected by sampling (they come from the event
+log or the SQLite tables, which keep every event); only the detailed
+activity entries are sampled, and only while the event rate is above a
+threshold:
+
+- events are counted in fixed windows of window_seconds, shared by all hook
+  processes through a small locked state file
+- the first threshold_per_window entries of a window are always logged
+- beyond that, 'rate' mode logs each entry with probability `rate`, and
+  'reservoir' mode keeps a uniform sample of reservoir_size entries (slot
+  files next to the state file) that is logged when the window closes
+- sampled entries carry {"sampling": {"mode", "weight"}}, where weight is the
+  number of events each one stands for, and every sampled window ends with an
+  "activity_sampling" summary entry (events seen and logged), so the dashboard
+  can scale counts back up (see estimated_count)
+
+The policy defaults to DEFAULT_POLICY and can be overridden with the
+CLAUDE_DASHBOARD_ACTIVITY_SAMPLING environment variable: 'off', 'rate',
+'reservoir', or a JSON object of policy fields. An invalid value is reported
+on stderr and the default policy is used, so hooks keep recording.
+"""
+
+import json
+import os
+import sys
+import fcntl
+import random
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, Optional, List
+
+DEFAULT_POLICY = {
+    "mode": "rate",               # 'off', 'rate' or 'reservoir'
+    "window_seconds": 10,
+    "threshold_per_window": 50,   # Entries always logged per window
+    "rate": 0.1,                  # 'rate' mode: share of further entries logged
+    "reservoir_size": 10          # 'reservoir' mode: further entries logged per window
+}
+
+SAMPLING_MODES = ('off', 'rate', 'reservoir')
+POLICY_ENV_VAR = 'CLAUDE_DASHBOARD_ACTIVITY_SAMPLING'
+
+
+def load_policy(value: Optional[str] = None) -> Dict[str, Any]:
+    """Sampling policy from value (default: the environment variable); DEFAULT_POLICY if invalid."""
+    value = value if value is not None else os.environ.get(POLICY_ENV_VAR)
+    policy = dict(DEFAULT_POLICY)
+    try:
+        if value:
+            if value in SAMPLING_MODES:
+                policy['mode'] = value
+            else:
+                fields = json.loads(value)
+                if not isinstance(fields, dict):
+                    raise ValueError(f"expected a sampling mode or a JSON object, got {value!r}")
+                policy.update(fields)
+        if policy['mode'] not in SAMPLING_MODES:
+            raise ValueError(f"Unknown sampling mode: {policy['mode']} (choose from {', '.join(SAMPLING_MODES)})")
+    except ValueError as e:
+        print(f"Warning: invalid {POLICY_ENV_VAR} ({e}), using the default sampling policy", file=sys.stderr)
+        return dict(DEFAULT_POLICY)
+    return policy
+
+
+def estimated_count(entries: List[Dict[str, Any]]) -> float:
+    """Number of events a list of (possibly sampled) activity entries stands for."""
+    return sum(
+        entry.get('sampling', {}).get('weight', 1)
+        for entry in entries if entry.get('event_type') != 'activity_sampling'
+    )
+
+
+class ActivitySampler:
+    """Decides which activity entries are logged, consistently across processes."""
+
+    def __init__(self, data_dir: Path, policy: Optional[Dict[str, Any]] = None):
+        self.policy = policy or load_policy()
+        self.state_file = Path(data_dir) / "activity_sampling.json"
+        self.lock_file = Path(data_dir) / "activity_sampling.lock"
+        self.reservoir_dir = Path(data_dir) / "activity_reservoir"
+
+    def admit(self, entry: Dict[str, Any], now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Entries to log now for a new activity entry (it may be sampled out or held back)."""
+        if self.policy['mode'] == 'off':
+            return [entry]
+
+        now = now if now is not None else datetime.now().timestamp()
+        with open(self.lock_file, 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            state = self.load_state()
+            logged = self.close_window(state, now)
+
+            state['seen'] += 1
+            state['totals']['seen'] += 1
+            beyond = state['seen'] - self.policy['threshold_per_window']
+            if beyond <= 0:
+                logged.append(entry)
+                state['logged'] += 1
+                state['totals']['logged'] += 1
+            elif self.policy['mode'] == 'rate':
+                if random.random() < self.policy['rate']:
+                    logged.append({**entry, "sampling": {"mode": "rate", "weight": round(1 / self.policy['rate'], 3)}})
+                    state['logged'] += 1
+                    state['totals']['logged'] += 1
+            else:
+                # Algorithm R: slot i holds the entry of the i-th kept event
+                size = self.policy['reservoir_size']
+                slot = beyond - 1 if beyond <= size else random.randrange(beyond)
+                if slot < size:
+                    self.reservoir_dir.mkdir(parents=True, exist_ok=True)
+                    slot_file = self.reservoir_dir / f"{slot}.json"
+                    temp_file = slot_file.with_suffix(f'.{os.getpid()}.tmp')
+                    with open(temp_file, 'w') as f:
+                        json.dump(entry, f)
+                    os.replace(temp_file, slot_file)
+
+            self.save_state(state)
+        return logged
+
+    def flush(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Entries held back for a window that has ended (e.g. when compacting)."""
+        if self.policy['mode'] == 'off':
+            return []
+
+        now = now if now is not None else datetime.now().timestamp()
+        with open(self.lock_file, 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            state = self.load_state()
+            logged = self.close_window(state, now)
+            if logged:
+                self.save_state(state)
+        return logged
+
+    def close_window(self, state: Dict[str, Any], now: float) -> List[Dict[str, Any]]:
+        """Start the window containing now; returns the entries the ended window still owes."""
+        window_seconds = self.policy['window_seconds']
+        window = int(now // window_seconds)
+        if state['window'] == window:
+            return []
+
+        logged = []
+        beyond = state['seen'] - self.policy['threshold_per_window']
+        if state['window'] is not None and beyond > 0:
+            held = self.take_reservoir()
+            for entry in held:
+                logged.append({**entry, "sampling": {"mode": "reservoir", "weight": round(beyond / len(held), 3)}})
+            logged.append({
+                "timestamp": datetime.fromtimestamp((state['window'] + 1) * window_seconds).isoformat(),
+                "event_type": "activity_sampling",
+                "mode": self.policy['mode'],
+                "window_start": datetime.fromtimestamp(state['window'] * window_seconds).isoformat(),
+                "window_seconds": window_seconds,
+                "events_seen": state['seen'],
+                "events_logged": state['logged'] + len(held)
+            })
+            state['totals']['logged'] += len(held)
+            state['totals']['sampled_windows'] += 1
+
+        state.update({"window": window, "seen": 0, "logged": 0})
+        return logged
+
+    def take_reservoir(self) -> List[Dict[str, Any]]:
+        held = []
+        try:
+            slot_files = sorted(self.reservoir_dir.glob('*.json'), key=lambda path: int(path.stem))
+        except (OSError, ValueError):
+            return held
+        for slot_file in slot_files:
+            try:
+                with open(slot_file, 'r') as f:
+                    held.append(json.load(f))
+                slot_file.unlink()
+            except (OSError, ValueError):
+                continue
+        return held
+
+    def load_state(self) -> Dict[str, Any]:
+        try:
+            with open(self.state_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"window": None, "seen": 0, "logged": 0,
+                    "totals": {"seen": 0, "logged": 0, "sampled_windows": 0}}
+
+    def save_state(self, state: Dict[str, Any]):
+        temp_file = self.state_file.with_suffix(f'.{os.getpid()}.tmp')
+        with open(temp_file, 'w') as f:
+            json.dump(state, f)
+        os.replace(temp_file, self.state_file)
+
+    def stats(self) -> Dict[str, Any]:
+        """Policy and lifetime totals for the dashboard."""
+        totals = self.load_state()['totals']
+        return {
+            "policy": self.policy,
+            "events_seen": totals['seen'],
+            "events_logged": totals['logged'],
+            "sampled_windows": totals['sampled_windows']
+        }
@@ -4,16 +4,52 @@ Dashboard API Server
 
 Lightweight API server to provide real-time data for the Claude Framework Dashboard.
 Serves metrics, health status, and navigation data.
+
+Requests are handled by a bounded pool of worker threads (PooledHTTPServer);
+when every worker is busy and the backlog is full, new connections get a 503
+instead of queueing without limit. The slow collectors (health check, metrics,
+agent usage, git status) run in a separate small collector pool, so they
+cannot occupy every request worker.
+
+Collector results are kept in memory by a ResponseCache (see response_cache)
+with a TTL per endpoint (CACHE_POLICIES): concurrent misses share one
+collector run, expired results are served (marked stale) while they are
+refreshed in the background, and a request waits at most
+COLLECTOR_TIMEOUT_SECONDS for a collector. The data/<key>_cache.json files
+are only snapshots for a warm start (--no-cache-snapshots turns them off).
+
+JSON responses are compact and carry an ETag, so a polling client that sends
+If-None-Match gets a bodiless 304 while the data is unchanged; larger bodies
+are gzipped for clients that accept it. The encoding of recently sent
+objects (such as cached collector results) is reused instead of redone.
+
+Inside DashboardServer, a PrecomputeScheduler (see precompute) keeps the
+health check, agent usage and git status results precomputed: each is
+refreshed on its own interval or when a watched path changes
+(PRECOMPUTE_WATCH), and requests for them only read the latest snapshot
+(--no-precompute computes them on demand instead). The refreshes run in their
+own precompute pool, so they never hold up on-demand collectors.
+
+The realtime metrics, status and top endpoints read through one
+DashboardMetricsUpdater per request worker thread (SQLite connections are
+per thread), created on the worker's first such request and then reused.
+
+/api/stream is a Server-Sent Events stream of realtime metrics changes (see
+metrics_stream): one computation per change, shared by every watcher.
 """
 
 import json
 import os
 import sys
+import gzip
+import hashlib
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Callable
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 import threading
 import time
 
@@ -30,12 +66,155 @@ try:
 except ImportError as e:
     print(f"Warning: Could not import some modules: {e}", file=sys.stderr)
 
+from response_cache import ResponseCache
+from precompute import PrecomputeScheduler
+from metrics_stream import MetricsStream
+
+# Request worker threads, and accepted requests that may wait for a free one
+DEFAULT_WORKERS = 8
+DEFAULT_BACKLOG = 32
+
+# Collector threads, and how long a request waits for a collector result
+COLLECTOR_WORKERS = 2
+COLLECTOR_TIMEOUT_SECONDS = 10
+
+# Threads refreshing the precomputed results
+PRECOMPUTE_WORKERS = 2
+
+# Precomputed results: cache key -> paths (under the framework root) whose changes trigger a
+# refresh; they are also refreshed every CACHE_POLICIES TTL
+PRECOMPUTE_WATCH = {
+    'health_check': ['system', 'hooks', 'operations'],
+    'agent_usage': ['operations', 'projects'],
+    'git_status': ['.git/HEAD', '.git/index', '.git/logs/HEAD', 'operations']
+}
+
+
+def collectors(framework_root: str) -> Dict[str, Callable[[], Dict[str, Any]]]:
+    """The expensive collectors, by cache key."""
+    return {
+        'health_check': lambda: FrameworkHealthChecker(framework_root).run_all_checks(),
+        'metrics': lambda: FrameworkMetricsCollector(framework_root).collect_all_metrics(),
+        'agent_usage': lambda: AgentUsageTracker(framework_root).analyze_agent_usage(),
+        'git_status': lambda: GitOperationsMonitor(framework_root).get_comprehensive_status()
+    }
+
+
+# Bodies smaller than this are not worth compressing
+GZIP_MIN_BYTES = 1024
+GZIP_LEVEL = 6
+
+# Encodings of the most recently sent objects: id -> (object, encoding); the
+# entry references the object, so its id cannot be reused while it is kept
+ENCODED_RESPONSES_KEPT = 16
+_encoded_responses = OrderedDict()
+_encoded_responses_lock = threading.Lock()
+
+def encode_json(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Compact JSON body of data and its ETag: {'body', 'etag'} (plus 'gzip' once compressed)."""
+    key = id(data)
+    with _encoded_responses_lock:
+        kept = _encoded_responses.get(key)
+        if kept is not None and kept[0] is data:
+            _encoded_responses.move_to_end(key)
+            return kept[1]
+    
+    body = json.dumps(data, separators=(',', ':'), default=str).encode('utf-8')
+    # Weak: the gzipped and plain bodies are the same representation
+    encoding = {"body": body, "etag": f'W/"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'}
+    with _encoded_responses_lock:
+        _encoded_responses[key] = (data, encoding)
+        while len(_encoded_responses) > ENCODED_RESPONSES_KEPT:
+            _encoded_responses.popitem(last=False)
+    return encoding
+
+# Cache key: (seconds a result is fresh, seconds it is then served stale while refreshing)
+CACHE_POLICIES = {
+    'health_check': (5 * 60, 60 * 60),
+    'metrics': (10 * 60, 60 * 60),
+    'agent_usage': (15 * 60, 60 * 60),
+    'git_status': (2 * 60, 10 * 60)
+}
+
+class PooledHTTPServer(HTTPServer):
+    """HTTPServer that handles requests on a bounded pool of worker threads."""
+    
+    def __init__(self, server_address, handler_class, workers: int = DEFAULT_WORKERS,
+                 backlog: int = DEFAULT_BACKLOG, snapshot_dir: Optional[Path] = None):
+        super().__init__(server_address, handler_class)
+        self.request_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='dashboard-request')
+        self.collector_pool = ThreadPoolExecutor(max_workers=COLLECTOR_WORKERS, thread_name_prefix='dashboard-collector')
+        self.request_slots = threading.BoundedSemaphore(workers + backlog)
+        self.response_cache = ResponseCache(self.collector_pool, snapshot_dir)
+        self.precompute: Optional[PrecomputeScheduler] = None
+        self.precompute_pool: Optional[ThreadPoolExecutor] = None
+        # Creates the DashboardMetricsUpdater kept by each request worker thread
+        self.create_updater: Optional[Callable[[], Any]] = None
+        self.thread_updaters = threading.local()
+        self.metrics_stream: Optional[MetricsStream] = None
+        # Requests whose socket a handler handed over (event stream watchers)
+        self.detached_requests = set()
+        self.detached_lock = threading.Lock()
+    
+    def process_request(self, request, client_address):
+        """Hand the request to a worker, or turn it away when the pool is saturated."""
+        if not self.request_slots.acquire(blocking=False):
+            self.reject_request(request)
+            return
+        self.request_pool.submit(self.process_request_thread, request, client_address)
+    
+    def process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            with self.detached_lock:
+                detached = request in self.detached_requests
+                self.detached_requests.discard(request)
+            if not detached:
+                self.shutdown_request(request)
+            self.request_slots.release()
+    
+    def detach_request(self, request):
+        """Keep request's socket open after its handler returns (its new owner closes it)."""
+        with self.detached_lock:
+            self.detached_requests.add(request)
+    
+    def metrics_updater(self):
+        """The calling worker thread's DashboardMetricsUpdater, created on first use."""
+        updater = getattr(self.thread_updaters, 'updater', None)
+        if updater is None:
+            updater = self.thread_updaters.updater = self.create_updater()
+        return updater
+    
+    def reject_request(self, request):
+        """Answer 503 without reading the request."""
+        try:
+            request.sendall(b"HTTP/1.0 503 Service Unavailable\r\nRetry-After: 1\r\n"
+                            b"Content-Length: 0\r\nConnection: close\r\n\r\n")
+        except OSError:
+            pass
+        self.shutdown_request(request)
+    
+    def server_close(self):
+        super().server_close()
+        if self.precompute is not None:
+            self.precompute.stop()
+        if self.precompute_pool is not None:
+            self.precompute_pool.shutdown(wait=False)
+        if self.metrics_stream is not None:
+            self.metrics_stream.close()
+        self.request_pool.shutdown(wait=False)
+        self.collector_pool.shutdown(wait=False)
+
 class DashboardAPIHandler(BaseHTTPRequestHandler):
     """HTTP request handler for dashboard API endpoints."""
     
-    def __init__(self, *args, framework_root=None, **kwargs):
+    def __init__(self, *args, framework_root=None, metrics_backend=None, **kwargs):
         self.framework_root = Path(framework_root) if framework_root else Path.home() / '.claude'
         self.dashboard_data_dir = self.framework_root / 'system' / 'dashboard' / 'data'
+        self.metrics_backend = metrics_backend
         super().__init__(*args, **kwargs)
     
     def do_GET(self):
@@ -60,8 +239,12 @@ class DashboardAPIHandler(BaseHTTPRequestHandler):
                 self.handle_navigation()
             elif path == '/api/realtime-metrics':
                 self.handle_realtime_metrics()
+            elif path == '/api/stream':
+                self.handle_stream(query_params)
             elif path == '/api/status':
                 self.handle_overall_status()
+            elif path.startswith('/api/top/'):
+                self.handle_top(path[len('/api/top/'):], query_params)
             elif path.startswith('/api/'):
                 self.send_error(404, "API endpoint not found")
             else:
@@ -74,15 +257,7 @@ class DashboardAPIHandler(BaseHTTPRequestHandler):
     def handle_health_check(self):
         """Handle health check endpoint."""
         try:
-            # Use cached data if recent, otherwise run fresh check
-            cached_data = self.get_cached_data('health_check')
-            
-            if cached_data and self.is_data_fresh(cached_data, minutes=5):
-                data = cached_data
-            else:
-                checker = FrameworkHealthChecker(str(self.framework_root))
-                data = checker.run_all_checks()
-                self.cache_data('health_check', data)
+            data = self.collect('health_check')
             
             self.send_json_response(data)
             
@@ -96,15 +271,7 @@ class DashboardAPIHandler(BaseHTTPRequestHandler):
     def handle_metrics(self):
         """Handle metrics endpoint."""
         try:
-            # Use cached metrics if recent
-            cached_data = self.get_cached_data('metrics')
-            
-            if cached_data and self.is_data_fresh(cached_data, minutes=10):
-                data = cached_data
-            else:
-                collector = FrameworkMetricsCollector(str(self.framework_root))
-                data = collector.collect_all_metrics()
-                self.cache_data('metrics', data)
+            data = self.collect('metrics')
             
             self.send_json_response(data)
             
@@ -117,14 +284,7 @@ class DashboardAPIHandler(BaseHTTPRequestHandler):
     def handle_agents(self):
         """Handle agent usage endpoint."""
         try:
-            cached_data = self.get_cached_data('agent_usage')
-            
-            if cached_data and self.is_data_fresh(cached_data, minutes=15):
-                data = cached_data
-            else:
-                tracker = AgentUsageTracker(str(self.framework_root))
-                data = tracker.analyze_agent_usage()
-                self.cache_data('agent_usage', data)
+            data = self.collect('agent_usage')
             
             self.send_json_response(data)
             
@@ -137,14 +297,7 @@ class DashboardAPIHandler(BaseHTTPRequestHandler):
     def handle_git_status(self):
         """Handle git status endpoint."""
         try:
-            cached_data = self.get_cached_data('git_status')
-            
-            if cached_data and self.is_data_fresh(cached_data, minutes=2):
-                data = cached_data
-            else:
-                monitor = GitOperationsMonitor(str(self.framework_root))
-                data = monitor.get_comprehensive_status()
-                self.cache_data('git_status', data)
+            data = self.collect('git_status')
             
             self.send_json_response(data)
             
@@ -157,8 +310,7 @@ class DashboardAPIHandler(BaseHTTPRequestHandler):
     def handle_operations(self):
         """Handle operations endpoint."""
         try:
-            monitor = GitOperationsMonitor(str(self.framework_root))
-            data = monitor.get_operations_status()
+            data = self.collect(None, lambda: GitOperationsMonitor(str(self.framework_root)).get_operations_status())
             self.send_json_response(data)
             
         except Exception as e:
@@ -183,7 +335,7 @@ class DashboardAPIHandler(BaseHTTPRequestHandler):
     def handle_realtime_metrics(self):
         """Handle real-time metrics from hooks."""
         try:
-            updater = DashboardMetricsUpdater(str(self.framework_root))
+            updater = self.metrics_updater()
             data = updater.get_current_metrics()
             self.send_json_response(data)
             
@@ -193,11 +345,39 @@ class DashboardAPIHandler(BaseHTTPRequestHandler):
                 "last_updated": datetime.now().isoformat()
             })
     
+    def metrics_updater(self):
+        """The worker thread's updater under DashboardServer, else a new one."""
+        if getattr(self.server, 'create_updater', None) is not None:
+            return self.server.metrics_updater()
+        return DashboardMetricsUpdater(str(self.framework_root), self.metrics_backend)
+    
+    def handle_stream(self, query_params: Dict[str, Any]):
+        """Handle Server-Sent Events stream of real-time metrics changes."""
+        stream = getattr(self.server, 'metrics_stream', None)
+        if stream is None:
+            self.send_error(503, "Streaming is only available from the dashboard server")
+            return
+        
+        # EventSource resends Last-Event-ID itself; ?lastEventId= is for clients that cannot
+        last_event_id = self.headers.get('Last-Event-ID') or query_params.get('lastEventId', [None])[0]
+        
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Access-Control-Allow-Origin', '*')  # Enable CORS
+        self.send_header('X-Accel-Buffering', 'no')
+        self.end_headers()
+        self.wfile.flush()
+        
+        # The stream writes to the socket from now on; this worker is free again
+        if stream.subscribe(self.request, last_event_id):
+            self.server.detach_request(self.request)
+    
     def handle_overall_status(self):
         """Handle overall dashboard status endpoint."""
         try:
             # Combine key metrics for dashboard overview
-            updater = DashboardMetricsUpdater(str(self.framework_root))
+            updater = self.metrics_updater()
             realtime_data = updater.get_current_metrics()
             
             status = {
@@ -225,6 +405,29 @@ class DashboardAPIHandler(BaseHTTPRequestHandler):
                 "timestamp": datetime.now().isoformat()
             })
     
+    def handle_top(self, kind: str, query_params: Dict[str, Any]):
+        """Handle top tools, files and agents endpoint (/api/top/<kind>?limit=N)."""
+        try:
+            limit = max(1, min(100, int(query_params.get('limit', ['10'])[0])))
+        except ValueError:
+            self.send_error(400, "limit must be an integer")
+            return
+        
+        try:
+            updater = self.metrics_updater()
+            data = updater.get_top_items(kind, limit)
+        except ValueError as e:
+            self.send_error(404, str(e))
+            return
+        except Exception as e:
+            data = {
+                "error": str(e),
+                "kind": kind,
+                "items": []
+            }
+        
+        self.send_json_response(data)
+    
     def handle_static_file(self):
         """Handle static file requests."""
         try:
@@ -346,6 +549,39 @@ class DashboardAPIHandler(BaseHTTPRequestHandler):
         except Exception:
             return 0
     
+    def collect(self, cache_key: Optional[str], collect: Optional[Callable[[], Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Result of a collector (default: the collector of cache_key), cached
+        under cache_key with its CACHE_POLICIES TTL (None: not cached).
+        Precomputed keys are read from their latest snapshot. Collectors run
+        in the server's collector pool.
+        """
+        collect = collect or collectors(str(self.framework_root))[cache_key]
+        
+        precompute = getattr(self.server, 'precompute', None)
+        if cache_key and precompute is not None and precompute.handles(cache_key):
+            return precompute.latest(cache_key, COLLECTOR_TIMEOUT_SECONDS).data
+        
+        response_cache = getattr(self.server, 'response_cache', None)
+        if response_cache is None:
+            # Outside PooledHTTPServer: cache files only
+            cached_data = self.get_cached_data(cache_key) if cache_key else None
+            if cached_data and self.is_data_fresh(cached_data, minutes=CACHE_POLICIES[cache_key][0] / 60):
+                return cached_data
+            data = collect()
+            if cache_key:
+                self.cache_data(cache_key, data)
+            return data
+        
+        if cache_key is None:
+            try:
+                return self.server.collector_pool.submit(collect).result(timeout=COLLECTOR_TIMEOUT_SECONDS)
+            except FutureTimeoutError:
+                raise TimeoutError(f"Still collecting after {COLLECTOR_TIMEOUT_SECONDS}s, retry shortly")
+        
+        ttl, stale_seconds = CACHE_POLICIES[cache_key]
+        return response_cache.get(cache_key, collect, ttl, stale_seconds, COLLECTOR_TIMEOUT_SECONDS)
+    
     def get_cached_data(self, cache_key: str) -> Dict[str, Any]:
         """Get cached data if available."""
         cache_file = self.dashboard_data_dir / f"{cache_key}_cache.json"
@@ -365,8 +601,11 @@ class DashboardAPIHandler(BaseHTTPRequestHandler):
         
         try:
             self.dashboard_data_dir.mkdir(parents=True, exist_ok=True)
-            with open(cache_file, 'w') as f:
+            # Other request threads may be reading it: write a temp file and rename
+            temp_file = cache_file.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+            with open(temp_file, 'w') as f:
                 json.dump(data, f, indent=2, default=str)
+            os.replace(temp_file, cache_file)
         except Exception:
             pass  # Silently fail on cache errors
     
@@ -383,30 +622,79 @@ class DashboardAPIHandler(BaseHTTPRequestHandler):
             return False
     
     def send_json_response(self, data: Dict[str, Any]):
-        """Send JSON response."""
-        response_data = json.dumps(data, indent=2, default=str)
+        """Send JSON response (304 if the client has it, gzipped if it accepts that)."""
+        encoding = encode_json(data)
+        
+        if self.etag_matches(encoding['etag']):
+            self.send_response(304)
+            self.send_json_headers(encoding['etag'])
+            self.end_headers()
+            return
+        
+        body = encoding['body']
+        compress = len(body) >= GZIP_MIN_BYTES and self.accepts_gzip()
+        if compress:
+            if 'gzip' not in encoding:
+                encoding['gzip'] = gzip.compress(body, compresslevel=GZIP_LEVEL)
+            body = encoding['gzip']
         
         self.send_response(200)
         self.send_header('Content-Type', 'application/json')
-        self.send_header('Content-Length', str(len(response_data)))
-        self.send_header('Access-Control-Allow-Origin', '*')  # Enable CORS
-        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Content-Length', str(len(body)))
+        if compress:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_json_headers(encoding['etag'])
         self.end_headers()
-        self.wfile.write(response_data.encode('utf-8'))
+        self.wfile.write(body)
+    
+    def send_json_headers(self, etag: str):
+        self.send_header('Access-Control-Allow-Origin', '*')  # Enable CORS
+        self.send_header('Cache-Control', 'no-cache')  # Revalidate with the ETag on every poll
+        self.send_header('ETag', etag)
+        self.send_header('Vary', 'Accept-Encoding')
+    
+    def etag_matches(self, etag: str) -> bool:
+        """Whether If-None-Match names etag (weak comparison)."""
+        header = self.headers.get('If-None-Match')
+        if not header:
+            return False
+        if header.strip() == '*':
+            return True
+        opaque = lambda tag: tag[2:] if tag.startswith('W/') else tag
+        return any(opaque(tag.strip()) == opaque(etag) for tag in header.split(','))
+    
+    def accepts_gzip(self) -> bool:
+        """Whether Accept-Encoding allows gzip."""
+        for coding in self.headers.get('Accept-Encoding', '').split(','):
+            name, _, params = coding.partition(';')
+            if name.strip().lower() in ('gzip', '*'):
+                quality = params.strip()
+                try:
+                    return not quality.startswith('q=') or float(quality[2:]) > 0
+                except ValueError:
+                    return True
+        return False
     
     def log_message(self, format, *args):
         """Override log message to reduce noise."""
-        # Only log errors
-        if args and len(args) > 1 and int(args[1]) >= 400:
+        # Only log errors (request lines: requestline, status, size; send_error's
+        # own "code %d, message %s" line is followed by the request line)
+        if len(args) > 1 and str(args[1]).isdigit() and int(args[1]) >= 400:
             super().log_message(format, *args)
 
 class DashboardServer:
     """Dashboard HTTP server wrapper."""
     
-    def __init__(self, host='127.0.0.1', port=8080, framework_root=None):
+    def __init__(self, host='127.0.0.1', port=8080, framework_root=None, metrics_backend=None,
+                 workers=DEFAULT_WORKERS, backlog=DEFAULT_BACKLOG, cache_snapshots=True, precompute=True):
         self.host = host
         self.port = port
         self.framework_root = framework_root or str(Path.home() / '.claude')
+        self.metrics_backend = metrics_backend
+        self.workers = workers
+        self.backlog = backlog
+        self.cache_snapshots = cache_snapshots
+        self.precompute = precompute
         self.server = None
         self.server_thread = None
     
@@ -415,9 +703,15 @@ class DashboardServer:
         try:
             # Create custom handler class with framework_root
             def handler(*args, **kwargs):
-                return DashboardAPIHandler(*args, framework_root=self.framework_root, **kwargs)
+                return DashboardAPIHandler(*args, framework_root=self.framework_root,
+                                           metrics_backend=self.metrics_backend, **kwargs)
             
-            self.server = HTTPServer((self.host, self.port), handler)
+            snapshot_dir = Path(self.framework_root) / 'system' / 'dashboard' / 'data' if self.cache_snapshots else None
+            self.server = PooledHTTPServer((self.host, self.port), handler, self.workers, self.backlog, snapshot_dir)
+            self.server.create_updater = lambda: DashboardMetricsUpdater(str(self.framework_root), self.metrics_backend)
+            self.server.metrics_stream = MetricsStream(self.server.create_updater)
+            if self.precompute:
+                self.server.precompute = self.create_precompute_scheduler()
             
             print(f"🚀 Starting Claude Dashboard Server at http://{self.host}:{self.port}")
             print(f"📁 Framework root: {self.framework_root}")
@@ -435,6 +729,18 @@ class DashboardServer:
             print(f"❌ Failed to start dashboard server: {e}")
             return False
     
+    def create_precompute_scheduler(self) -> PrecomputeScheduler:
+        """Scheduler refreshing the PRECOMPUTE_WATCH results in the precompute pool."""
+        self.server.precompute_pool = ThreadPoolExecutor(max_workers=PRECOMPUTE_WORKERS,
+                                                         thread_name_prefix='dashboard-precompute')
+        scheduler = PrecomputeScheduler(self.server.precompute_pool, self.server.response_cache)
+        root = Path(self.framework_root)
+        for key, collect in collectors(str(root)).items():
+            if key in PRECOMPUTE_WATCH:
+                scheduler.add_job(key, collect, CACHE_POLICIES[key][0], [root / path for path in PRECOMPUTE_WATCH[key]])
+        scheduler.start()
+        return scheduler
+    
     def stop(self):
         """Stop the dashboard server."""
         if self.server:
@@ -454,13 +760,28 @@ def main():
     parser.add_argument('--host', default='127.0.0.1', help='Server host (default: 127.0.0.1)')
     parser.add_argument('--port', type=int, default=8080, help='Server port (default: 8080)')
     parser.add_argument('--framework-root', help='Framework root directory (default: ~/.claude)')
+    parser.add_argument('--metrics-backend', choices=['json', 'sqlite'],
+                        help='Real-time metrics storage (default: $CLAUDE_DASHBOARD_METRICS_BACKEND or json)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'Request worker threads (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--backlog', type=int, default=DEFAULT_BACKLOG,
+                        help=f'Requests that may wait for a worker before new ones get 503 (default: {DEFAULT_BACKLOG})')
+    parser.add_argument('--no-cache-snapshots', action='store_true',
+                        help='Keep collector results in memory only (no data/*_cache.json warm-start snapshots)')
+    parser.add_argument('--no-precompute', action='store_true',
+                        help='Run the health, agent and git collectors on demand instead of in the background')
     
     args = parser.parse_args()
     
     server = DashboardServer(
         host=args.host,
         port=args.port,
-        framework_root=args.framework_root
+        framework_root=args.framework_root,
+        metrics_backend=args.metrics_backend,
+        workers=args.workers,
+        backlog=args.backlog,
+        cache_snapshots=not args.no_cache_snapshots,
+        precompute=not args.no_precompute
     )
     
     if server.start():
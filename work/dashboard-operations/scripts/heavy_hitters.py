@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Heavy-Hitter Summaries
+
+Bounded-memory top-K counting (the Space-Saving algorithm) for tools, modified
+files and agent mentions, kept as plain JSON-serializable dicts so they live
+in the metrics cache snapshot:
+
+    {"capacity": 100, "counters": {item: [count, error], ...}}
+
+A summary never holds more than capacity items. An item that is not tracked
+while the summary is full takes the place of the item with the smallest
+count, inheriting that count as its error. So for every tracked item
+
+    count - error <= true count <= count
+
+and every item whose true count is above total / capacity is tracked. While
+no more than capacity distinct items have been seen, counts are exact (error
+0 everywhere).
+"""
+
+import heapq
+from typing import Dict, Any, List
+
+# Items tracked per kind of summary
+CAPACITIES = {
+    'tools': 100,
+    'files': 200,
+    'agents': 50
+}
+
+
+def create_summary(capacity: int) -> Dict[str, Any]:
+    """Empty summary tracking at most capacity items."""
+    return {"capacity": capacity, "counters": {}}
+
+
+def add(summary: Dict[str, Any], item: str, count: int = 1):
+    """Count item, evicting the smallest counter if the summary is full."""
+    counters = summary['counters']
+    counter = counters.get(item)
+    if counter is not None:
+        counter[0] += count
+    elif len(counters) < summary['capacity']:
+        counters[item] = [count, 0]
+    else:
+        smallest = min(counters, key=lambda key: counters[key][0])
+        floor = counters.pop(smallest)[0]
+        counters[item] = [floor + count, floor]
+
+
+def top(summary: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
+    """The limit items with the highest counts, highest first."""
+    counters = summary['counters']
+    ranked = heapq.nsmallest(limit, counters.items(), key=lambda entry: (-entry[1][0], entry[0]))
+    return [{"item": item, "count": count, "error": error} for item, (count, error) in ranked]
+
+
+def counts(summary: Dict[str, Any]) -> Dict[str, int]:
+    """Count (upper bound) of every tracked item."""
+    return {item: counter[0] for item, counter in summary['counters'].items()}
+
+
+def is_exact(summary: Dict[str, Any]) -> bool:
+    """True while no item has been evicted, so every count is exact."""
+    return all(error == 0 for _, error in summary['counters'].values())
@@ -0,0 +1,602 @@
+#!/usr/bin/env python3
+"""
+Dashboard Metrics Storage
+
+Storage backends for DashboardMetricsUpdater. Both record the compact hook
+events built by the updater and the activity log, and rebuild the metrics
+cache structure served by the dashboard API.
+
+- EventLogStorage ('json', default): events appended to metrics_events.jsonl
+  and folded into the metrics_cache.json snapshot by the updater's
+  apply_event(); activity appended to the activity_log/ segmented log
+  (hooks/segmented_log.py: rotated, compressed, time-indexed segments), or to
+  activity_log.jsonl when the hooks directory is not available. With
+  CLAUDE_DASHBOARD_ACTIVITY_FORMAT=binary the activity log is
+  activity_log_binary/ in the compact format of activity_codec
+- SQLiteStorage ('sqlite'): metrics.db in WAL mode with indexed tables for
+  tool executions, file modifications, sessions and agent activity, plus the
+  activity log. Each hook event is one transaction, readers never block
+  writers, and aggregates (rolling-window buckets included) are SQL queries.
+
+Select a backend with create_storage(), the updater's backend argument or the
+CLAUDE_DASHBOARD_METRICS_BACKEND environment variable.
+
+Concurrent hooks never read-modify-write shared metrics. An update is one
+appended event (or one SQLite transaction), so increments cannot be lost:
+- appends hold an exclusive flock on the log file, so records never interleave
+- compaction takes the same lock before sealing the log; a writer that opened
+  the log before it was sealed notices the inode change and reopens the live
+  log, so no event lands in a log that is being folded
+- snapshots are written through per-process temp files by one compactor at a
+  time
+"""
+
+import json
+import os
+import sys
+import fcntl
+import sqlite3
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List, Callable
+
+import rolling_windows
+from activity_codec import ActivityCodec
+from activity_sampling import load_policy
+
+# segmented_log lives in the hooks directory: <root>/hooks next to
+# <root>/work/dashboard-operations/scripts or ~/.claude/system/dashboard/scripts
+try:
+    from segmented_log import SegmentedLog, CLOCK_SKEW_SECONDS
+except ImportError:
+    HOOKS_DIR = Path(__file__).resolve().parents[3] / 'hooks'
+    if str(HOOKS_DIR) not in sys.path:
+        sys.path.append(str(HOOKS_DIR))
+    try:
+        from segmented_log import SegmentedLog, CLOCK_SKEW_SECONDS
+    except ImportError:
+        SegmentedLog = None
+
+# Fold the event log into the snapshot once it grows past this size
+COMPACT_THRESHOLD_BYTES = 256 * 1024
+
+# Window used for per-day averages
+AVERAGE_WINDOW_DAYS = 30
+
+DEFAULT_BACKEND = 'json'
+BACKEND_ENV_VAR = 'CLAUDE_DASHBOARD_METRICS_BACKEND'
+
+# Activity log format of the json backend: 'jsonl' (full entries) or 'binary'
+ACTIVITY_FORMAT_ENV_VAR = 'CLAUDE_DASHBOARD_ACTIVITY_FORMAT'
+
+
+class EventLogStorage:
+    """Append-only JSON event log with snapshot compaction."""
+
+    name = 'json'
+
+    def __init__(self, data_dir: Path, apply_event: Callable, create_empty_cache: Callable):
+        self.data_dir = Path(data_dir)
+        self.apply_event = apply_event
+        self.create_empty_cache = create_empty_cache
+
+        self.metrics_cache_file = self.data_dir / "metrics_cache.json"
+        self.activity_log_file = self.data_dir / "activity_log.jsonl"
+        self.activity_log = self.open_activity_log()
+
+        # Events not yet folded into metrics_cache.json (the snapshot)
+        self.event_log_file = self.data_dir / "metrics_events.jsonl"
+        self.sealed_log_file = self.data_dir / "metrics_events.sealed.jsonl"
+        self.compact_lock_file = self.data_dir / "metrics_compact.lock"
+
+    def open_activity_log(self):
+        """Segmented activity log in the configured format, None without segmented_log."""
+        if SegmentedLog is None:
+            return None
+        # Reservoir samples are appended when their sampling window closes
+        clock_skew_seconds = load_policy()['window_seconds'] + CLOCK_SKEW_SECONDS
+        if os.environ.get(ACTIVITY_FORMAT_ENV_VAR) == 'binary':
+            directory = self.data_dir / "activity_log_binary"
+            return SegmentedLog(directory, codec=ActivityCodec(directory), clock_skew_seconds=clock_skew_seconds)
+        return SegmentedLog(self.data_dir / "activity_log", clock_skew_seconds=clock_skew_seconds)
+
+    def record(self, event: Dict[str, Any], activities: List[Dict[str, Any]]):
+        """Store one hook event and the activity log entries it produced."""
+        self.append_line(self.event_log_file, event)
+        for activity in activities:
+            self.log_activity(activity)
+
+        if self.event_log_size() > COMPACT_THRESHOLD_BYTES:
+            self.compact()
+
+    def log_activity(self, activity: Dict[str, Any]):
+        """Append an entry to the activity log."""
+        if self.activity_log is not None:
+            self.activity_log.append(activity)
+        else:
+            self.append_line(self.activity_log_file, activity)
+
+    def read_activity(self, since=None, until=None) -> List[Dict[str, Any]]:
+        """Activity log entries timed within [since, until] (datetimes)."""
+        if self.activity_log is not None:
+            return list(self.activity_log.read(since, until))
+        entries = []
+        try:
+            with open(self.activity_log_file, 'r') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        timestamp = datetime.fromisoformat(entry['timestamp'])
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    if (since is None or timestamp >= since) and (until is None or timestamp <= until):
+                        entries.append(entry)
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def append_line(self, log_file: Path, record: Dict[str, Any]):
+        """Append one JSON record to log_file under its exclusive lock."""
+        line = (json.dumps(record, separators=(',', ':')) + '\n').encode('utf-8')
+        while True:
+            fd = os.open(log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                # Sealed by a compactor after we opened it: append to the new live log
+                try:
+                    current = os.stat(log_file).st_ino
+                except FileNotFoundError:
+                    current = None
+                if current != os.fstat(fd).st_ino:
+                    continue
+
+                written = 0
+                while written < len(line):
+                    written += os.write(fd, line[written:])
+                return
+            finally:
+                os.close(fd)
+
+    def read_events(self, log_file: Path, cache: Dict[str, Any]):
+        """Replay every complete event record of log_file into cache."""
+        try:
+            with open(log_file, 'r') as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue  # Partial line from an interrupted writer
+                    self.apply_event(event, cache)
+        except FileNotFoundError:
+            pass
+
+    def event_log_size(self) -> int:
+        """Size of the unfolded event log in bytes."""
+        try:
+            return self.event_log_file.stat().st_size
+        except OSError:
+            return 0
+
+    def log_identity(self, log_file: Path) -> Optional[List[int]]:
+        """Identify a log file version (inode, size, mtime), None if missing."""
+        try:
+            stat = log_file.stat()
+        except FileNotFoundError:
+            return None
+        return [stat.st_ino, stat.st_size, stat.st_mtime_ns]
+
+    def load_metrics(self) -> Dict[str, Any]:
+        """Load the metrics snapshot and replay the events logged since."""
+        # Read again if a compaction moved events between the files meanwhile
+        for _ in range(3):
+            generation = self.storage_generation()
+            cache = self.load_snapshot()
+
+            # A sealed log is left only while (or if) a compaction is interrupted
+            sealed = self.log_identity(self.sealed_log_file)
+            if sealed is not None and sealed != cache.get('folded_event_log'):
+                self.read_events(self.sealed_log_file, cache)
+            self.read_events(self.event_log_file, cache)
+
+            if self.storage_generation() == generation:
+                break
+
+        return cache
+
+    def storage_generation(self) -> tuple:
+        """Changes whenever a compaction seals the live log or replaces the snapshot."""
+        try:
+            live_inode = self.event_log_file.stat().st_ino
+        except FileNotFoundError:
+            live_inode = None
+        return (live_inode, self.log_identity(self.metrics_cache_file))
+
+    def compact(self) -> bool:
+        """Fold the event log into the snapshot; False if another process is compacting."""
+        with open(self.compact_lock_file, 'w') as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return False
+
+            cache = self.load_snapshot()
+
+            # First finish a sealed log left by an interrupted compaction, then seal the live one
+            for _ in range(2):
+                rotated = False
+                if not self.sealed_log_file.exists():
+                    if not self.event_log_file.exists():
+                        break
+                    # New events go to a fresh log from here on
+                    if not self.seal_event_log():
+                        break
+                    rotated = True
+
+                sealed = self.log_identity(self.sealed_log_file)
+                if sealed != cache.get('folded_event_log'):
+                    self.read_events(self.sealed_log_file, cache)
+                    cache['folded_event_log'] = sealed
+                    if not self.save_snapshot(cache):
+                        return False  # Readers keep replaying the sealed log
+                self.sealed_log_file.unlink()
+
+                if rotated:
+                    break
+
+            return True
+
+    def seal_event_log(self) -> bool:
+        """Rename the live log to the sealed log once no append is in progress."""
+        try:
+            fd = os.open(self.event_log_file, os.O_WRONLY | os.O_APPEND)
+        except FileNotFoundError:
+            return False
+        try:
+            # Writers hold this lock while appending and recheck the inode after taking it
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            if os.fstat(fd).st_ino != os.stat(self.event_log_file).st_ino:
+                return False
+            os.replace(self.event_log_file, self.sealed_log_file)
+            return True
+        except FileNotFoundError:
+            return False
+        finally:
+            os.close(fd)
+
+    def load_snapshot(self) -> Dict[str, Any]:
+        """Load existing metrics cache or create new one."""
+        if not self.metrics_cache_file.exists():
+            return self.create_empty_cache()
+
+        try:
+            with open(self.metrics_cache_file, 'r') as f:
+                cache = json.load(f)
+
+            # Ensure cache has required structure
+            if 'last_updated' not in cache:
+                cache['last_updated'] = datetime.now().isoformat()
+
+            return cache
+
+        except Exception:
+            return self.create_empty_cache()
+
+    def save_snapshot(self, cache: Dict[str, Any]) -> bool:
+        """Save metrics cache to file."""
+        # last_updated tracks the newest folded event
+        cache.setdefault('last_updated', datetime.now().isoformat())
+
+        try:
+            # Write to temporary file first, then rename (atomic operation)
+            temp_file = self.metrics_cache_file.with_suffix(f'.{os.getpid()}.tmp')
+
+            with open(temp_file, 'w') as f:
+                json.dump(cache, f, indent=2)
+
+            os.replace(temp_file, self.metrics_cache_file)
+            return True
+
+        except Exception as e:
+            # Log error but continue
+            self.log_activity({
+                "timestamp": datetime.now().isoformat(),
+                "event_type": "cache_save_error",
+                "error": str(e)
+            })
+            return False
+
+    def top_items(self, kind: str, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """Not indexed: the updater ranks the heavy-hitter summaries of the snapshot."""
+        return None
+
+    def change_token(self) -> tuple:
+        """Changes whenever an event is recorded or the snapshot is replaced."""
+        return (self.log_identity(self.event_log_file), self.log_identity(self.metrics_cache_file))
+
+    def close(self):
+        pass
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hook_events (
+    id INTEGER PRIMARY KEY,
+    event TEXT NOT NULL,
+    recorded_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_hook_events_recorded_at ON hook_events(recorded_at);
+
+CREATE TABLE IF NOT EXISTS tool_executions (
+    id INTEGER PRIMARY KEY,
+    event_id INTEGER NOT NULL REFERENCES hook_events(id),
+    tool TEXT NOT NULL,
+    parameters TEXT NOT NULL,
+    warnings INTEGER,
+    timestamp TEXT NOT NULL,
+    recorded_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tool_executions_tool ON tool_executions(tool);
+CREATE INDEX IF NOT EXISTS idx_tool_executions_recorded_at ON tool_executions(recorded_at);
+CREATE INDEX IF NOT EXISTS idx_tool_executions_warnings ON tool_executions(id) WHERE warnings IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS file_modifications (
+    id INTEGER PRIMARY KEY,
+    event_id INTEGER NOT NULL REFERENCES hook_events(id),
+    file TEXT NOT NULL,
+    tool TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    recorded_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_file_modifications_recorded_at ON file_modifications(recorded_at);
+CREATE INDEX IF NOT EXISTS idx_file_modifications_file ON file_modifications(file);
+
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    event_id INTEGER NOT NULL REFERENCES hook_events(id),
+    timestamp TEXT NOT NULL,
+    recorded_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_recorded_at ON sessions(recorded_at);
+
+CREATE TABLE IF NOT EXISTS agent_activity (
+    id INTEGER PRIMARY KEY,
+    event_id INTEGER NOT NULL REFERENCES hook_events(id),
+    agent_type TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    recorded_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_agent_activity_agent_type ON agent_activity(agent_type);
+CREATE INDEX IF NOT EXISTS idx_agent_activity_recorded_at ON agent_activity(recorded_at);
+
+CREATE TABLE IF NOT EXISTS activity_log (
+    id INTEGER PRIMARY KEY,
+    recorded_at TEXT NOT NULL,
+    entry TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_activity_log_recorded_at ON activity_log(recorded_at);
+"""
+
+# Rolling-window series and the table whose rows they count
+ROLLING_TABLES = {
+    'tool_executions': 'tool_executions',
+    'file_modifications': 'file_modifications',
+    'session_starts': 'sessions',
+    'agent_activity': 'agent_activity'
+}
+
+# Heavy-hitter kinds and the indexed column they count
+TOP_ITEM_COLUMNS = {
+    'tools': ('tool_executions', 'tool'),
+    'files': ('file_modifications', 'file'),
+    'agents': ('agent_activity', 'agent_type')
+}
+
+# recorded_at prefix length and trailing text that make a bucket's start time
+ROLLING_BUCKET_PREFIXES = {
+    'minute': (16, ''),
+    'hour': (13, ':00'),
+    'day': (10, '')
+}
+
+
+class SQLiteStorage:
+    """Indexed SQLite database in WAL mode."""
+
+    name = 'sqlite'
+
+    def __init__(self, data_dir: Path, apply_event: Callable = None, create_empty_cache: Callable = None):
+        self.data_dir = Path(data_dir)
+        self.create_empty_cache = create_empty_cache
+        self.database_file = self.data_dir / "metrics.db"
+
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+        self.connection = sqlite3.connect(str(self.database_file), timeout=10, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SQLITE_SCHEMA)
+
+    def record(self, event: Dict[str, Any], activities: List[Dict[str, Any]]):
+        """Store one hook event and the activity log entries it produced in one transaction."""
+        db = self.connection
+        recorded_at = event['recorded_at']
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            event_id = db.execute(
+                "INSERT INTO hook_events (event, recorded_at) VALUES (?, ?)",
+                (event['event'], recorded_at)
+            ).lastrowid
+
+            if event['event'] == 'post_tool_use':
+                tool_name = event['tool']['name']
+                warnings = len(event['warnings']) if 'warnings' in event else None
+                db.execute(
+                    "INSERT INTO tool_executions (event_id, tool, parameters, warnings, timestamp, recorded_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (event_id, tool_name, json.dumps(event['tool']['parameters']), warnings,
+                     event['timestamp'], recorded_at)
+                )
+                db.executemany(
+                    "INSERT INTO file_modifications (event_id, file, tool, timestamp, recorded_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [(event_id, file_path, tool_name, event['timestamp'], recorded_at)
+                     for file_path in event['modified_files']]
+                )
+                if event.get('agent_indicator'):
+                    db.execute(
+                        "INSERT INTO agent_activity (event_id, agent_type, timestamp, recorded_at) "
+                        "VALUES (?, ?, ?, ?)",
+                        (event_id, event['agent_indicator'], event['timestamp'], recorded_at)
+                    )
+            elif event['event'] == 'session_start':
+                db.execute(
+                    "INSERT INTO sessions (event_id, timestamp, recorded_at) VALUES (?, ?, ?)",
+                    (event_id, event['timestamp'], recorded_at)
+                )
+
+            for activity in activities:
+                self.insert_activity(activity)
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    def log_activity(self, activity: Dict[str, Any]):
+        """Append an entry to the activity log."""
+        self.insert_activity(activity)
+
+    def insert_activity(self, activity: Dict[str, Any]):
+        self.connection.execute(
+            "INSERT INTO activity_log (recorded_at, entry) VALUES (?, ?)",
+            (activity.get('timestamp', datetime.now().isoformat()), json.dumps(activity))
+        )
+
+    def load_metrics(self) -> Dict[str, Any]:
+        """Build the metrics cache structure from indexed queries."""
+        db = self.connection
+        cache = self.create_empty_cache()
+        cache.pop('heavy_hitters', None)  # Top items are counted over the indexes
+        today = datetime.now().date().isoformat()
+
+        # One read transaction, so every figure comes from the same snapshot
+        db.execute("BEGIN")
+        try:
+            last_updated = db.execute("SELECT MAX(recorded_at) FROM hook_events").fetchone()[0]
+            if last_updated:
+                cache['last_updated'] = last_updated
+
+            tool_usage = cache['tool_usage']
+            tool_usage['tool_counts'] = dict(db.execute(
+                "SELECT tool, COUNT(*) FROM tool_executions GROUP BY tool"
+            ).fetchall())
+            tool_usage['total_executions'] = sum(tool_usage['tool_counts'].values())
+            tool_usage['recent_tools'] = [
+                {"tool": tool, "timestamp": timestamp, "parameters": json.loads(parameters)}
+                for tool, timestamp, parameters in db.execute(
+                    "SELECT tool, timestamp, parameters FROM tool_executions ORDER BY id DESC LIMIT 10"
+                )
+            ]
+            cache['hook_performance']['total_hook_executions'] = tool_usage['total_executions']
+
+            session_data = cache['session_data']
+            session_data['total_sessions'], session_data['last_session_start'] = db.execute(
+                "SELECT COUNT(*), (SELECT timestamp FROM sessions ORDER BY id DESC LIMIT 1) FROM sessions"
+            ).fetchone()
+            session_data['session_starts_today'] = db.execute(
+                "SELECT COUNT(*) FROM sessions WHERE recorded_at >= ?", (today,)
+            ).fetchone()[0]
+
+            file_modifications = cache['file_modifications']
+            file_modifications['total_modifications'] = db.execute(
+                "SELECT COUNT(*) FROM file_modifications"
+            ).fetchone()[0]
+            file_modifications['files_modified_today'] = db.execute(
+                "SELECT COUNT(*) FROM file_modifications WHERE recorded_at >= ?", (today,)
+            ).fetchone()[0]
+            file_modifications['recent_modifications'] = [
+                {"file": file_path, "tool": tool, "timestamp": timestamp}
+                for file_path, tool, timestamp in db.execute(
+                    "SELECT file, tool, timestamp FROM file_modifications ORDER BY id DESC LIMIT 20"
+                )
+            ]
+
+            latest_warnings = db.execute(
+                "SELECT warnings FROM tool_executions WHERE warnings IS NOT NULL ORDER BY id DESC LIMIT 1"
+            ).fetchone()
+            if latest_warnings is not None:
+                issues = latest_warnings[0]
+                cache['framework_health']['issues_detected'] = issues
+                cache['framework_health']['health_score'] = max(0, 100 - issues * 10) if issues else 100
+
+            agent_activity = cache['agent_activity']
+            agent_activity['agent_mentions'] = dict(db.execute(
+                "SELECT agent_type, COUNT(*) FROM agent_activity GROUP BY agent_type"
+            ).fetchall())
+            agent_activity['total_agent_deployments'] = sum(agent_activity['agent_mentions'].values())
+            agent_activity['recent_agent_activity'] = [
+                {"agent_type": agent_type, "timestamp": timestamp, "context": "tool_execution"}
+                for agent_type, timestamp in db.execute(
+                    "SELECT agent_type, timestamp FROM agent_activity ORDER BY id DESC LIMIT 10"
+                )
+            ]
+
+            cache['rolling_windows'] = {
+                series: self.rolling_windows(table) for series, table in ROLLING_TABLES.items()
+            }
+        finally:
+            db.execute("COMMIT")
+
+        return cache
+
+    def rolling_windows(self, table: str) -> Dict[str, Any]:
+        """Rolling-window buckets of a table, grouped over its recorded_at index."""
+        windows = rolling_windows.create_windows()
+        now = datetime.now()
+        oldest = {
+            'minute': now - timedelta(minutes=rolling_windows.RING_SIZES['minute']),
+            'hour': now - timedelta(hours=rolling_windows.RING_SIZES['hour']),
+            'day': datetime.combine(now.date() - timedelta(days=rolling_windows.RING_SIZES['day']), datetime.min.time())
+        }
+        for resolution, (length, suffix) in ROLLING_BUCKET_PREFIXES.items():
+            rows = self.connection.execute(
+                f"SELECT substr(recorded_at, 1, {length}), COUNT(*) FROM {table} "
+                "WHERE recorded_at >= ? GROUP BY 1", (oldest[resolution].isoformat(),)
+            )
+            for bucket, count in rows:
+                epoch = datetime.fromisoformat(bucket + suffix).timestamp()
+                rolling_windows.add_to_bucket(windows, resolution, epoch, count)
+        return windows
+
+    def compact(self) -> bool:
+        """Fold the WAL back into the database file."""
+        self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return True
+
+    def change_token(self) -> Optional[int]:
+        """Changes whenever an event is recorded (id of the last one)."""
+        return self.connection.execute("SELECT MAX(id) FROM hook_events").fetchone()[0]
+
+    def top_items(self, kind: str, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """Most frequent tools, files or agents, counted exactly over their index."""
+        table, column = TOP_ITEM_COLUMNS[kind]
+        rows = self.connection.execute(
+            f"SELECT {column}, COUNT(*) AS uses FROM {table} GROUP BY {column} "
+            f"ORDER BY uses DESC, {column} LIMIT ?", (limit,)
+        )
+        return [{"item": item, "count": count, "error": 0} for item, count in rows]
+
+    def close(self):
+        self.connection.close()
+
+
+STORAGE_BACKENDS = {
+    EventLogStorage.name: EventLogStorage,
+    SQLiteStorage.name: SQLiteStorage
+}
+
+
+def create_storage(backend: Optional[str], data_dir: Path, apply_event: Callable,
+                   create_empty_cache: Callable):
+    """Open the named storage backend (default: $CLAUDE_DASHBOARD_METRICS_BACKEND or json)."""
+    backend = backend or os.environ.get(BACKEND_ENV_VAR) or DEFAULT_BACKEND
+    if backend not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown metrics backend: {backend} (choose from {', '.join(STORAGE_BACKENDS)})")
+    return STORAGE_BACKENDS[backend](data_dir, apply_event, create_empty_cache)
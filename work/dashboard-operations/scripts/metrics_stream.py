@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Realtime Metrics Stream
+
+Server-Sent Events for /api/stream. One MetricsStream per dashboard server
+computes the realtime metrics for all watchers:
+
+- a single thread polls the metrics storage's change token (a stat of the
+  event log and snapshot, or the last SQLite event id) every POLL_SECONDS,
+  and recomputes the metrics when a hook recorded a change, or every
+  REFRESH_SECONDS for time-based figures (today counters, rates, latencies)
+- a change is published as one event whose data is a JSON merge patch
+  (RFC 7386) of the fields that changed: event "metrics", id = sequence
+  number. A new watcher first gets the whole document as event "snapshot".
+  The document is /api/realtime-metrics without the raw counters
+  (OMITTED_FIELDS), which its computed section already reports
+- a reconnecting watcher's Last-Event-ID resumes from the last HISTORY
+  events; if it is older (or unknown) it gets a fresh snapshot instead
+- watchers that received nothing for HEARTBEAT_SECONDS get a comment line,
+  so proxies keep the connection open and dead clients are noticed
+
+Subscribed sockets are written by the stream thread, not by request
+workers, so watchers do not occupy the server's worker pool. A watcher that
+cannot take an event within SEND_TIMEOUT_SECONDS is dropped. The stream
+thread only runs while someone is watching.
+"""
+
+import json
+import time
+import socket
+import threading
+from collections import deque
+from typing import Dict, Any, Optional, Callable, List
+
+POLL_SECONDS = 0.5
+REFRESH_SECONDS = 10
+HEARTBEAT_SECONDS = 15
+HISTORY = 100
+SEND_TIMEOUT_SECONDS = 5
+
+# Reconnect delay browsers should use (milliseconds)
+RETRY_MS = 3000
+
+# Storage-internal fields of the realtime metrics: rolling-window rings and heavy-hitter summaries
+OMITTED_FIELDS = ('rolling_windows', 'heavy_hitters', 'folded_event_log')
+
+
+def merge_patch(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON merge patch turning old into new (removed keys map to None)."""
+    patch = {}
+    for key, value in new.items():
+        if key not in old:
+            patch[key] = value
+        elif isinstance(value, dict) and isinstance(old[key], dict):
+            nested = merge_patch(old[key], value)
+            if nested:
+                patch[key] = nested
+        elif value != old[key]:
+            patch[key] = value
+    for key in old:
+        if key not in new:
+            patch[key] = None
+    return patch
+
+
+def format_event(event_id: int, event: str, data: Dict[str, Any]) -> bytes:
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data, separators=(',', ':'), default=str)}\n\n".encode('utf-8')
+
+
+class MetricsStream:
+    """Publishes realtime metrics changes to Server-Sent Events watchers."""
+
+    def __init__(self, create_updater: Callable[[], Any]):
+        # The updater is created on the stream thread (SQLite connections are per thread)
+        self.create_updater = create_updater
+        self.lock = threading.Lock()
+        self.watchers: Dict[socket.socket, float] = {}  # socket -> time of the last write
+        self.events = deque(maxlen=HISTORY)  # (id, patch)
+        self.event_id = 0
+        self.current: Optional[Dict[str, Any]] = None
+        self.thread: Optional[threading.Thread] = None
+        self.stopped = threading.Event()
+
+    def subscribe(self, sock: socket.socket, last_event_id: Optional[str] = None) -> bool:
+        """Catch sock up (events since last_event_id, or a snapshot) and add it as a watcher."""
+        try:
+            resume_from = int(last_event_id) if last_event_id is not None else None
+        except ValueError:
+            resume_from = None
+
+        with self.lock:
+            frames = [f"retry: {RETRY_MS}\n\n".encode('utf-8')]
+            if self.current is not None:
+                oldest = self.events[0][0] if self.events else self.event_id + 1
+                if resume_from is not None and oldest - 1 <= resume_from <= self.event_id:
+                    frames += [format_event(event_id, 'metrics', patch)
+                               for event_id, patch in self.events if event_id > resume_from]
+                else:
+                    frames.append(format_event(self.event_id, 'snapshot', self.current))
+
+            # Catch-up frames go out before any later event, which needs the lock to publish
+            sock.settimeout(SEND_TIMEOUT_SECONDS)
+            if not self.send(sock, b''.join(frames)):
+                return False
+            self.watchers[sock] = time.monotonic()
+
+            if self.thread is None or not self.thread.is_alive():
+                self.stopped.clear()
+                self.thread = threading.Thread(target=self.run, name='dashboard-metrics-stream', daemon=True)
+                self.thread.start()
+        return True
+
+    def run(self):
+        updater = self.create_updater()
+        token = None
+        computed_at = 0.0
+        while not self.stopped.wait(POLL_SECONDS):
+            with self.lock:
+                if not self.watchers:
+                    self.thread = None
+                    break
+
+            try:
+                latest = updater.storage.change_token()
+                if latest != token or time.monotonic() - computed_at >= REFRESH_SECONDS:
+                    token, computed_at = latest, time.monotonic()
+                    self.publish(updater.get_current_metrics())
+            except Exception:
+                pass  # Try again at the next poll
+
+            self.heartbeat()
+
+        try:
+            updater.storage.close()
+        except Exception:
+            pass
+
+    def publish(self, metrics: Dict[str, Any]):
+        """Send the fields that changed since the last published metrics to every watcher."""
+        # Round-trip through JSON so comparisons see what watchers see
+        metrics = json.loads(json.dumps(
+            {key: value for key, value in metrics.items() if key not in OMITTED_FIELDS}, default=str))
+        with self.lock:
+            first = self.current is None
+            patch = metrics if first else merge_patch(self.current, metrics)
+            if not patch:
+                return
+            self.event_id += 1
+            self.current = metrics
+            self.events.append((self.event_id, patch))
+            frame = format_event(self.event_id, 'snapshot' if first else 'metrics', patch)
+            self.broadcast(frame, list(self.watchers))
+
+    def heartbeat(self):
+        with self.lock:
+            now = time.monotonic()
+            idle = [sock for sock, written in self.watchers.items() if now - written >= HEARTBEAT_SECONDS]
+            self.broadcast(b": heartbeat\n\n", idle)
+
+    def broadcast(self, frame: bytes, watchers: List[socket.socket]):
+        """Send frame to watchers, dropping those that fail (call with the lock held)."""
+        for sock in watchers:
+            if self.send(sock, frame):
+                self.watchers[sock] = time.monotonic()
+            else:
+                self.watchers.pop(sock, None)
+
+    def send(self, sock: socket.socket, frame: bytes) -> bool:
+        try:
+            sock.sendall(frame)
+            return True
+        except OSError:
+            self.close_socket(sock)
+            return False
+
+    def close_socket(self, sock: socket.socket):
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        sock.close()
+
+    def close(self):
+        """Stop the stream thread and disconnect every watcher."""
+        self.stopped.set()
+        with self.lock:
+            for sock in list(self.watchers):
+                self.close_socket(sock)
+            self.watchers.clear()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Dashboard Precomputation Scheduler
+
+Keeps the results of the expensive collectors (health check, agent usage,
+git status) precomputed, so requests only read the latest snapshot and their
+latency no longer depends on collector cost:
+
+- each job refreshes on its own interval, or sooner when one of its watched
+  paths changes (modification time or size, checked every WATCH_SECONDS;
+  directories change when entries are added or removed), but never more
+  often than every MIN_REFRESH_SECONDS
+- jobs run one at a time each, in the collector pool; a failed run keeps the
+  previous snapshot and is retried after RETRY_SECONDS
+- a finished run is published as a new immutable Snapshot (a private copy of
+  the result) in one assignment, so readers see either the old or the new
+  one, never a partial result; with a ResponseCache, snapshots are also
+  stored there (and written to its warm-start files), and a restarted server
+  starts from those
+"""
+
+import json
+import time
+import threading
+from pathlib import Path
+from dataclasses import dataclass
+from concurrent.futures import Executor
+from typing import Dict, Any, Optional, Callable, List
+
+WATCH_SECONDS = 2
+MIN_REFRESH_SECONDS = 5
+RETRY_SECONDS = 30
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """A published collector result; data must be treated as read-only."""
+    key: str
+    data: Dict[str, Any]
+    taken_at: float
+    generation: int
+
+
+class Job:
+    def __init__(self, key: str, collect: Callable[[], Dict[str, Any]], interval: float, watch: List[Path]):
+        self.key = key
+        self.collect = collect
+        self.interval = interval
+        self.watch = watch
+        self.token = None
+        self.due_at = 0.0
+        self.started_at = 0.0
+        self.running = False
+        self.published = threading.Event()
+
+
+def watch_token(paths: List[Path]) -> tuple:
+    """(mtime, size) of each path, None for missing ones."""
+    token = []
+    for path in paths:
+        try:
+            stat = path.stat()
+            token.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            token.append(None)
+    return tuple(token)
+
+
+class PrecomputeScheduler:
+    """Refreshes collector results in the background and publishes them as snapshots."""
+
+    def __init__(self, executor: Executor, response_cache=None):
+        self.executor = executor
+        self.response_cache = response_cache
+        self.jobs: Dict[str, Job] = {}
+        self.snapshots: Dict[str, Snapshot] = {}
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def add_job(self, key: str, collect: Callable[[], Dict[str, Any]], interval: float,
+                watch: Optional[List[Path]] = None):
+        """Precompute key with collect every interval seconds or when a watched path changes."""
+        job = self.jobs[key] = Job(key, collect, interval, [Path(path) for path in watch or []])
+        job.token = watch_token(job.watch)
+
+        # Start from the warm-start snapshot; refresh it at once if it is older than the interval
+        warm = self.response_cache.peek(key) if self.response_cache is not None else None
+        if warm is not None:
+            stored_at, data = warm
+            self.publish(job, data, stored_at)
+            job.due_at = stored_at + interval
+
+    def handles(self, key: str) -> bool:
+        return key in self.jobs
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name='dashboard-precompute', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+
+    def latest(self, key: str, timeout: float = 0) -> Snapshot:
+        """Latest snapshot of key, waiting up to timeout seconds for the first one."""
+        snapshot = self.snapshots.get(key)
+        if snapshot is None and self.jobs[key].published.wait(timeout):
+            snapshot = self.snapshots.get(key)
+        if snapshot is None:
+            raise TimeoutError(f"{key} is still being computed, retry shortly")
+        return snapshot
+
+    def run(self):
+        while True:
+            now = time.time()
+            for job in self.jobs.values():
+                token = watch_token(job.watch)
+                changed = token != job.token
+                if job.running or not (changed or now >= job.due_at):
+                    continue
+                if now - job.started_at < MIN_REFRESH_SECONDS:
+                    continue  # Changed again right after a run: wait for the quiet period
+                job.token = token
+                self.submit(job, now)
+            if self.stopped.wait(WATCH_SECONDS):
+                return
+
+    def submit(self, job: Job, now: float):
+        job.running, job.started_at = True, now
+        try:
+            self.executor.submit(self.refresh, job)
+        except RuntimeError:
+            job.running = False  # Executor shut down
+
+    def refresh(self, job: Job):
+        try:
+            data = job.collect()
+            self.publish(job, data, time.time())
+            if self.response_cache is not None:
+                self.response_cache.put(job.key, self.snapshots[job.key].data)
+            job.due_at = time.time() + job.interval
+        except Exception:
+            job.due_at = time.time() + min(job.interval, RETRY_SECONDS)
+        finally:
+            job.running = False
+
+    def publish(self, job: Job, data: Dict[str, Any], taken_at: float):
+        # A private copy: nobody else holds a reference that could change it
+        frozen = json.loads(json.dumps(data, default=str))
+        with self.lock:
+            previous = self.snapshots.get(job.key)
+            generation = previous.generation + 1 if previous else 1
+            self.snapshots[job.key] = Snapshot(job.key, frozen, taken_at, generation)
+        job.published.set()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Dashboard Response Cache
+
+In-process cache of collector results for the dashboard API server, shared
+by all request threads:
+
+- each key has a TTL: within it, requests get the cached result without
+  touching the collector or the disk
+- after the TTL, for stale_seconds more, requests get the cached result
+  (marked "stale") at once while one background refresh runs
+  (stale-while-revalidate)
+- concurrent misses for a key share one collector run (single-flight); a
+  request waits at most timeout seconds for it, then gets the previous result
+  (if any) marked stale
+- with a snapshot directory, results are also written to <key>_cache.json
+  there, and a key missing from memory is warm-started from its snapshot (aged
+  by the file's modification time), so a restarted server has results at once
+
+A failed refresh leaves the previous result in place.
+"""
+
+import json
+import os
+import time
+import threading
+from pathlib import Path
+from concurrent.futures import Executor, Future, TimeoutError as FutureTimeoutError
+from typing import Dict, Any, Optional, Callable, Tuple
+
+
+class ResponseCache:
+    """Collector results by key, with TTLs, single-flight and stale-while-revalidate."""
+
+    def __init__(self, executor: Executor, snapshot_dir: Optional[Path] = None):
+        self.executor = executor
+        self.snapshot_dir = Path(snapshot_dir) if snapshot_dir else None
+        self.lock = threading.Lock()
+        self.entries: Dict[str, Tuple[float, Dict[str, Any]]] = {}  # key -> (stored at, result)
+        self.inflight: Dict[str, Future] = {}
+
+    def get(self, key: str, collect: Callable[[], Dict[str, Any]], ttl: float,
+            stale_seconds: float = 0, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Result for key: cached, stale while refreshing, or from a (shared) collector run."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                entry = self.load_snapshot(key)
+            age = time.time() - entry[0] if entry else None
+            if age is not None and age < ttl:
+                return entry[1]
+            future = self.refresh(key, collect)
+
+        if age is not None and age < ttl + stale_seconds:
+            return {**entry[1], "stale": True}
+
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            if entry is None:
+                raise TimeoutError(f"Still collecting {key} after {timeout}s, retry shortly")
+        except Exception:
+            if entry is None:
+                raise
+        return {**entry[1], "stale": True}
+
+    def refresh(self, key: str, collect: Callable[[], Dict[str, Any]]) -> Future:
+        """The running collector of key, or a new one (call with the lock held)."""
+        future = self.inflight.get(key)
+        if future is None:
+            future = self.inflight[key] = self.executor.submit(self.run, key, collect)
+        return future
+
+    def run(self, key: str, collect: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        try:
+            data = collect()
+            with self.lock:
+                self.entries[key] = (time.time(), data)
+            self.save_snapshot(key, data)
+            return data
+        finally:
+            with self.lock:
+                self.inflight.pop(key, None)
+
+    def put(self, key: str, data: Dict[str, Any]):
+        """Store a result computed elsewhere (e.g. by the precompute scheduler)."""
+        with self.lock:
+            self.entries[key] = (time.time(), data)
+        self.save_snapshot(key, data)
+
+    def peek(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """(stored at, result) of key from memory or its snapshot, without collecting."""
+        with self.lock:
+            return self.entries.get(key) or self.load_snapshot(key)
+
+    def invalidate(self, key: str):
+        """Forget the cached result of key (its snapshot is kept)."""
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def snapshot_file(self, key: str) -> Path:
+        return self.snapshot_dir / f"{key}_cache.json"
+
+    def load_snapshot(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """Warm-start key from its snapshot (call with the lock held)."""
+        if self.snapshot_dir is None:
+            return None
+        snapshot_file = self.snapshot_file(key)
+        try:
+            stored_at = snapshot_file.stat().st_mtime
+            with open(snapshot_file, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self.entries[key] = (stored_at, data)
+        return self.entries[key]
+
+    def save_snapshot(self, key: str, data: Dict[str, Any]):
+        if self.snapshot_dir is None:
+            return
+        snapshot_file = self.snapshot_file(key)
+        try:
+            self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+            # Write a temp file and rename, so readers never see a partial snapshot
+            temp_file = snapshot_file.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+            with open(temp_file, 'w') as f:
+                json.dump(data, f, indent=2, default=str)
+            os.replace(temp_file, snapshot_file)
+        except OSError:
+            pass  # Snapshots are only a warm start
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Rolling-Window Counters
+
+Fixed-size ring buffers of per-minute, per-hour and per-day buckets, kept as
+plain JSON-serializable dicts so they live in the metrics cache snapshot:
+
+    {"minute": {"start": [...], "count": [...]}, "hour": {...}, "day": {...}}
+
+Adding an event touches one bucket per resolution (O(1)). A slot whose bucket
+has passed out of its ring is reset when it is reused, and queries only sum
+slots whose bucket lies inside the window, so counts stay correct however long
+the counters sat idle and across day boundaries. Hour and day buckets follow
+local time, so "today" starts at local midnight.
+
+Windows are bucket-granular: last_hour() is the current minute plus the 59
+before it, last_day() the current hour plus the 23 before it, last_days(n)
+today plus the n - 1 days before it.
+"""
+
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+# Buckets kept per resolution (must cover the longest window queried)
+RING_SIZES = {
+    'minute': 60,
+    'hour': 24,
+    'day': 30
+}
+
+
+def create_windows() -> Dict[str, Any]:
+    """Empty counters for every resolution."""
+    return {
+        resolution: {"start": [None] * size, "count": [0] * size}
+        for resolution, size in RING_SIZES.items()
+    }
+
+
+def bucket_index(resolution: str, epoch: float) -> int:
+    """Bucket number of epoch at the given resolution."""
+    if resolution == 'minute':
+        return int(epoch // 60)
+    moment = datetime.fromtimestamp(epoch)
+    if resolution == 'hour':
+        return moment.toordinal() * 24 + moment.hour
+    return moment.toordinal()
+
+
+def add(windows: Dict[str, Any], epoch: float, value: int = 1):
+    """Count value at epoch in every resolution."""
+    for resolution in windows:
+        add_to_bucket(windows, resolution, epoch, value)
+
+
+def add_to_bucket(windows: Dict[str, Any], resolution: str, epoch: float, value: int = 1):
+    """Count value at epoch in one resolution."""
+    ring = windows[resolution]
+    index = bucket_index(resolution, epoch)
+    slot = index % len(ring['count'])
+    start = ring['start'][slot]
+    if start == index:
+        ring['count'][slot] += value
+    elif start is None or start < index:
+        ring['start'][slot] = index
+        ring['count'][slot] = value
+    # else: older than the ring keeps, its slot already holds a newer bucket
+
+
+def total(windows: Dict[str, Any], resolution: str, buckets: int, now: Optional[float] = None) -> int:
+    """Sum of the latest `buckets` buckets (the current one included) at resolution."""
+    ring = windows[resolution]
+    newest = bucket_index(resolution, now if now is not None else datetime.now().timestamp())
+    oldest = newest - min(buckets, len(ring['count'])) + 1
+    return sum(
+        count for start, count in zip(ring['start'], ring['count'])
+        if start is not None and oldest <= start <= newest
+    )
+
+
+def last_hour(windows: Dict[str, Any], now: Optional[float] = None) -> int:
+    return total(windows, 'minute', 60, now)
+
+
+def last_day(windows: Dict[str, Any], now: Optional[float] = None) -> int:
+    return total(windows, 'hour', 24, now)
+
+
+def last_days(windows: Dict[str, Any], days: int, now: Optional[float] = None) -> int:
+    return total(windows, 'day', days, now)
+
+
+def today(windows: Dict[str, Any], now: Optional[float] = None) -> int:
+    return total(windows, 'day', 1, now)
+
+
+def rates(windows: Dict[str, Any], now: Optional[float] = None) -> Dict[str, int]:
+    """Counts over the last 1h, 24h and 7d."""
+    return {
+        "last_1h": last_hour(windows, now),
+        "last_24h": last_day(windows, now),
+        "last_7d": last_days(windows, 7, now)
+    }
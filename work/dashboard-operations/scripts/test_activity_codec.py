@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Activity Codec Test
+
+Round-trips activity records through the binary codec of a segmented log and
+checks large-value omission, shared name interning, partial frames and the
+JSONL converter.
+"""
+
+import io
+import os
+import sys
+import json
+import hashlib
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import metrics_storage  # noqa: F401  (makes segmented_log importable)
+from segmented_log import SegmentedLog
+from activity_codec import ActivityCodec, LARGE_VALUE_BYTES, to_jsonl
+
+
+START = datetime(2026, 2, 1, 9, 0, 0, 123456)
+CONTENT = 'def handler():\n    return 42\n' * 150
+
+
+def activity(n):
+    return {
+        "timestamp": (START + timedelta(seconds=n)).isoformat(),
+        "event": "post_tool_use",
+        "tool": {"name": ['Edit', 'Write', 'Read'][n % 3], "parameters": {"file_path": f"/repo/mod_{n}.py", "content": CONTENT}},
+        "modified_files": [f"/repo/mod_{n}.py"],
+        "warnings": []
+    }
+
+
+def open_log(directory):
+    return SegmentedLog(directory, compress=False, codec=ActivityCodec(directory))
+
+
+def test_round_trip_omits_large_values():
+    directory = tempfile.mkdtemp()
+    log = open_log(directory)
+    records = [activity(n) for n in range(30)]
+    for record in records:
+        log.append(record)
+
+    decoded = list(open_log(directory).read())
+    first = decoded[0]
+    omitted = first['tool']['parameters']['content']
+    expected_hash = hashlib.blake2b(CONTENT.encode('utf-8'), digest_size=8).hexdigest()
+    return (
+        len(decoded) == len(records) and
+        all(d['timestamp'] == r['timestamp'] and d['tool']['name'] == r['tool']['name'] and
+            d['tool']['parameters']['file_path'] == r['tool']['parameters']['file_path'] and
+            d['modified_files'] == r['modified_files'] for d, r in zip(decoded, records)) and
+        len(CONTENT) > LARGE_VALUE_BYTES and
+        omitted == {"omitted_bytes": len(CONTENT), "blake2b": expected_hash} and
+        Path(directory, 'current.bin').stat().st_size * 10 <
+        sum(len(json.dumps(record)) for record in records)
+    )
+
+
+def test_writers_share_interned_names():
+    directory = tempfile.mkdtemp()
+    first, second = open_log(directory), open_log(directory)
+    first.append({"timestamp": START.isoformat(), "event": "post_tool_use", "tool": {"name": "Edit"}})
+    second.append({"timestamp": START.isoformat(), "event": "session_start"})
+    first.append({"timestamp": START.isoformat(), "event": "session_start", "tool": {"name": "Bash"}})
+    events = [(record['event'], record.get('tool', {}).get('name')) for record in open_log(directory).read()]
+    return events == [('post_tool_use', 'Edit'), ('session_start', None), ('session_start', 'Bash')]
+
+
+def test_partial_frame_and_untimed_records():
+    directory = tempfile.mkdtemp()
+    log = open_log(directory)
+    log.append({"note": "no timestamp"})
+    log.append(activity(1))
+    with open(log.current_file, 'ab') as f:
+        f.write(log.codec.encode(activity(2))[:20])  # Interrupted writer
+    return [record.get('note') for record in log.read()] == ['no timestamp', None]
+
+
+def test_converter_writes_time_range_as_jsonl():
+    directory = tempfile.mkdtemp()
+    log = open_log(directory)
+    for n in range(100):
+        log.append(activity(n))
+    output = io.StringIO()
+    count = to_jsonl(Path(directory), output, START + timedelta(seconds=10), START + timedelta(seconds=19))
+    lines = [json.loads(line) for line in output.getvalue().splitlines()]
+    return count == 10 and [line['tool']['parameters']['file_path'] for line in lines] == [f"/repo/mod_{n}.py" for n in range(10, 20)]
+
+
+def test_event_records_omit_large_parameters():
+    from update_dashboard_metrics import DashboardMetricsUpdater
+
+    sizes, recent = {}, {}
+    for backend in ('json', 'sqlite'):
+        updater = DashboardMetricsUpdater(tempfile.mkdtemp(), backend)
+        updater.update_from_hook_data({
+            "event": "post_tool_use",
+            "tool": {"name": "Write", "parameters": {"file_path": "/repo/big.py", "content": CONTENT * 20}},
+            "modified_files": ["/repo/big.py"]
+        })
+        recent[backend] = updater.get_current_metrics()['tool_usage']['recent_tools'][0]['parameters']
+        if backend == 'json':
+            sizes[backend] = os.path.getsize(updater.storage.event_log_file)
+        else:
+            sizes[backend] = len(updater.storage.connection.execute(
+                "SELECT parameters FROM tool_executions").fetchone()[0])
+        updater.storage.close()
+
+    encoded = (CONTENT * 20).encode('utf-8')
+    return (
+        all(size < 1024 for size in sizes.values()) and
+        recent['json'] == recent['sqlite'] == {
+            "file_path": "/repo/big.py",
+            "content": {"omitted_bytes": len(encoded), "blake2b": hashlib.blake2b(encoded, digest_size=8).hexdigest()}
+        }
+    )
+
+
+def main():
+    print("Testing activity codec...")
+    print("=" * 50)
+
+    test_cases = [
+        ('records round-trip with large values omitted', test_round_trip_omits_large_values),
+        ('concurrent writers share interned names', test_writers_share_interned_names),
+        ('partial frames are skipped, untimed records kept', test_partial_frame_and_untimed_records),
+        ('converter writes a time range as JSONL', test_converter_writes_time_range_as_jsonl),
+        ('metrics event records omit large tool parameters', test_event_records_omit_large_parameters),
+    ]
+
+    passed = 0
+    for name, test in test_cases:
+        if test():
+            passed += 1
+            print(f"✅ {name}")
+        else:
+            print(f"❌ {name}")
+
+    print("\n" + "=" * 50)
+    print(f"Results: {passed}/{len(test_cases)} tests passed")
+
+    if passed == len(test_cases):
+        print("🎉 All tests passed!")
+        return 0
+    else:
+        print("❌ Some tests failed!")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Activity Sampling Test
+
+Checks that quiet periods are logged in full, that rate and reservoir
+sampling bound the entries logged during a burst while their weights still
+add up to the events seen, that concurrent hook processes share one window,
+and that dashboard counters stay exact while activity entries are sampled.
+"""
+
+import io
+import os
+import sys
+import random
+import tempfile
+import contextlib
+import multiprocessing
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from activity_sampling import ActivitySampler, load_policy, estimated_count, POLICY_ENV_VAR, DEFAULT_POLICY
+
+
+WINDOW_START = 1_800_000_000  # Start of a 10 second window
+PROCESSES = 10
+EVENTS_PER_PROCESS = 40
+
+
+def entry(n):
+    return {"timestamp": f"2027-01-15T08:00:{n % 60:02d}", "event": "post_tool_use", "n": n}
+
+
+def burst(sampler, count, now=WINDOW_START):
+    """Admit count entries within one window and flush them with the next one."""
+    logged = []
+    for n in range(count):
+        logged += sampler.admit(entry(n), now + n * 0.001)
+    return logged + sampler.flush(now + 10)
+
+
+def test_quiet_windows_are_logged_in_full():
+    sampler = ActivitySampler(tempfile.mkdtemp(), load_policy('rate'))
+    logged = burst(sampler, 50) + burst(sampler, 30, WINDOW_START + 20)
+    return (
+        [item['n'] for item in logged] == list(range(50)) + list(range(30)) and
+        not any('sampling' in item for item in logged) and
+        sampler.stats()['sampled_windows'] == 0
+    )
+
+
+def test_rate_mode_estimates_burst():
+    random.seed(7)
+    sampler = ActivitySampler(tempfile.mkdtemp(), load_policy('{"mode": "rate", "rate": 0.1}'))
+    logged = burst(sampler, 2000)
+    summary = logged[-1]
+    return (
+        len(logged) < 400 and
+        summary['event_type'] == 'activity_sampling' and
+        summary['events_seen'] == 2000 and summary['events_logged'] == len(logged) - 1 and
+        abs(estimated_count(logged) - 2000) < 200
+    )
+
+
+def test_reservoir_mode_keeps_bounded_weighted_sample():
+    random.seed(11)
+    sampler = ActivitySampler(tempfile.mkdtemp(), load_policy('reservoir'))
+    logged = burst(sampler, 500)
+    sampled = [item for item in logged if 'sampling' in item]
+    stats = sampler.stats()
+    return (
+        len(logged) == 50 + 10 + 1 and
+        [item['n'] for item in logged[:50]] == list(range(50)) and
+        all(item['sampling'] == {"mode": "reservoir", "weight": 45.0} and item['n'] >= 50 for item in sampled) and
+        len({item['n'] for item in sampled}) == 10 and
+        estimated_count(logged) == 500 and
+        stats['events_seen'] == 500 and stats['events_logged'] == 60 and
+        not any(sampler.reservoir_dir.iterdir())
+    )
+
+
+def admit_events(data_dir, worker_id):
+    sampler = ActivitySampler(data_dir, load_policy('reservoir'))
+    for n in range(EVENTS_PER_PROCESS):
+        sampler.admit(entry(worker_id * EVENTS_PER_PROCESS + n), WINDOW_START + 1)
+
+
+def test_processes_share_one_window():
+    data_dir = tempfile.mkdtemp()
+    workers = [multiprocessing.Process(target=admit_events, args=(data_dir, worker_id)) for worker_id in range(PROCESSES)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+
+    sampler = ActivitySampler(data_dir, load_policy('reservoir'))
+    held = sampler.flush(WINDOW_START + 10)
+    expected = PROCESSES * EVENTS_PER_PROCESS
+    return (
+        len(held) == 10 + 1 and
+        held[-1]['events_seen'] == expected and
+        sampler.stats()['events_seen'] == expected
+    )
+
+
+def test_counters_stay_exact_while_sampling():
+    os.environ[POLICY_ENV_VAR] = 'reservoir'
+    from update_dashboard_metrics import DashboardMetricsUpdater
+
+    updater = DashboardMetricsUpdater(tempfile.mkdtemp())
+    for n in range(200):
+        updater.update_from_hook_data({
+            "event": "post_tool_use",
+            "tool": {"name": "Edit", "parameters": {"file_path": f"/repo/mod_{n}.py"}}
+        })
+
+    metrics = updater.get_current_metrics()
+    logged = updater.storage.read_activity()
+    return (
+        metrics['tool_usage']['total_executions'] == 200 and
+        metrics['computed']['activity_sampling']['events_seen'] == 200 and
+        len(logged) < 200
+    )
+
+
+def test_invalid_policy_falls_back_to_default():
+    os.environ[POLICY_ENV_VAR] = 'Rate'
+    from update_dashboard_metrics import DashboardMetricsUpdater
+
+    warnings = io.StringIO()
+    try:
+        with contextlib.redirect_stderr(warnings):
+            policies = [load_policy(value) for value in ('{"mode": "rate"', '[1, 2]', '{"mode": "bogus"}')]
+            updater = DashboardMetricsUpdater(tempfile.mkdtemp())
+            recorded = updater.update_from_hook_data({"event": "post_tool_use", "tool": {"name": "Read", "parameters": {}}})
+    finally:
+        os.environ.pop(POLICY_ENV_VAR)
+    return (
+        all(policy == DEFAULT_POLICY for policy in policies) and
+        updater.sampler.policy == DEFAULT_POLICY and recorded and
+        updater.get_current_metrics()['tool_usage']['total_executions'] == 1 and
+        warnings.getvalue().count(POLICY_ENV_VAR) >= 4
+    )
+
+
+def main():
+    print("Testing activity sampling...")
+    print("=" * 50)
+
+    test_cases = [
+        ('quiet windows are logged in full', test_quiet_windows_are_logged_in_full),
+        ('rate mode estimates a burst from its sample', test_rate_mode_estimates_burst),
+        ('reservoir mode keeps a bounded weighted sample', test_reservoir_mode_keeps_bounded_weighted_sample),
+        (f'{PROCESSES} processes share one sampling window', test_processes_share_one_window),
+        ('counters stay exact while activity is sampled', test_counters_stay_exact_while_sampling),
+        ('invalid policies fall back to the default', test_invalid_policy_falls_back_to_default),
+    ]
+
+    passed = 0
+    for name, test in test_cases:
+        if test():
+            passed += 1
+            print(f"✅ {name}")
+        else:
+            print(f"❌ {name}")
+
+    print("\n" + "=" * 50)
+    print(f"Results: {passed}/{len(test_cases)} tests passed")
+
+    if passed == len(test_cases):
+        print("🎉 All tests passed!")
+        return 0
+    else:
+        print("❌ Some tests failed!")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Dashboard Server Concurrency Test
+
+Runs DashboardServer with a deliberately slow git collector and checks that
+cheap endpoints stay fast while slow requests are in flight, that a request
+outwaiting the collector gets the stale warm-start snapshot, that a saturated
+pool answers 503 instead of queueing, that JSON responses are compact,
+revalidated with ETags and gzipped on request, that the metrics endpoints
+reuse one updater per worker thread, and that precomputed results are
+refreshed in their own pool.
+"""
+
+import io
+import os
+import sys
+import gzip
+import json
+import http.client
+import time
+import tempfile
+import threading
+import contextlib
+import urllib.request
+import urllib.error
+from pathlib import Path
+from datetime import datetime, timedelta
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import dashboard_api
+from dashboard_api import DashboardServer
+
+
+COLLECTOR_SECONDS = 1.5
+
+
+class SlowGitOperationsMonitor:
+    """Stands in for GitOperationsMonitor with a collector that takes a while."""
+
+    def __init__(self, framework_root):
+        self.framework_root = framework_root
+
+    collector_threads = []
+
+    def get_comprehensive_status(self):
+        self.collector_threads.append(threading.current_thread().name)
+        time.sleep(COLLECTOR_SECONDS)
+        return {"timestamp": datetime.now().isoformat(), "git_status": {"repository_exists": True}}
+
+
+def start_server(**kwargs):
+    server = DashboardServer(port=0, framework_root=tempfile.mkdtemp(), **kwargs)
+    with contextlib.redirect_stdout(io.StringIO()):
+        server.start()
+    return server, f"http://127.0.0.1:{server.server.server_address[1]}"
+
+
+def stop_server(server):
+    with contextlib.redirect_stdout(io.StringIO()):
+        server.stop()
+
+
+def get(url):
+    """(status, decoded JSON or None, seconds taken)"""
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=30) as response:
+            status, body = response.status, response.read()
+    except urllib.error.HTTPError as e:
+        status, body = e.code, b''
+    return status, (json.loads(body) if body else None), time.perf_counter() - started
+
+
+def test_cheap_endpoints_stay_fast():
+    server, base = start_server()
+    results = []
+    slow = [threading.Thread(target=lambda: results.append(get(f"{base}/api/git-status"))) for _ in range(4)]
+    try:
+        for thread in slow:
+            thread.start()
+        time.sleep(0.2)  # Slow requests are now waiting for their collectors
+        cheap = [get(f"{base}/api/navigation") for _ in range(5)]
+        for thread in slow:
+            thread.join()
+    finally:
+        stop_server(server)
+
+    return (
+        all(status == 200 and seconds < 0.5 for status, _, seconds in cheap) and
+        len(results) == 4 and all(data['git_status']['repository_exists'] for _, data, _ in results)
+    )
+
+
+def test_slow_collector_serves_stale_result():
+    # On-demand collection: the precompute scheduler would refresh the snapshot at startup
+    server, base = start_server(precompute=False)
+    handler_dir = Path(server.framework_root) / 'system' / 'dashboard' / 'data'
+    handler_dir.mkdir(parents=True)
+    an_hour_ago = datetime.now() - timedelta(hours=1)
+    snapshot = handler_dir / 'git_status_cache.json'
+    snapshot.write_text(json.dumps({"timestamp": an_hour_ago.isoformat(), "git_status": {"branch": "old"}}))
+    os.utime(snapshot, (an_hour_ago.timestamp(), an_hour_ago.timestamp()))
+
+    timeout, dashboard_api.COLLECTOR_TIMEOUT_SECONDS = dashboard_api.COLLECTOR_TIMEOUT_SECONDS, 0.3
+    try:
+        status, data, seconds = get(f"{base}/api/git-status")
+        time.sleep(COLLECTOR_SECONDS)  # The collector finishes in the background
+        _, fresh, _ = get(f"{base}/api/git-status")
+    finally:
+        dashboard_api.COLLECTOR_TIMEOUT_SECONDS = timeout
+        stop_server(server)
+
+    return (
+        status == 200 and seconds < 1.0 and
+        data.get('stale') is True and data['git_status'] == {"branch": "old"} and
+        'stale' not in fresh and fresh['git_status']['repository_exists']
+    )
+
+
+def test_saturated_pool_answers_503():
+    server, base = start_server(workers=1, backlog=0)
+    results = []
+    busy = threading.Thread(target=lambda: results.append(get(f"{base}/api/git-status")))
+    try:
+        busy.start()
+        time.sleep(0.2)
+        status, _, seconds = get(f"{base}/api/navigation")
+        busy.join()
+        after, _, _ = get(f"{base}/api/navigation")
+    finally:
+        stop_server(server)
+
+    return status == 503 and seconds < 0.5 and results[0][0] == 200 and after == 200
+
+
+def request(base, path, headers):
+    """(status, headers, body bytes) of a GET with the given request headers"""
+    connection = http.client.HTTPConnection(base[len('http://'):], timeout=30)
+    try:
+        connection.request('GET', path, headers=headers)
+        response = connection.getresponse()
+        return response.status, response.headers, response.read()
+    finally:
+        connection.close()
+
+
+def test_conditional_and_compressed_json():
+    server, base = start_server()
+    gzip_min_bytes, dashboard_api.GZIP_MIN_BYTES = dashboard_api.GZIP_MIN_BYTES, 0
+    try:
+        status, headers, body = request(base, '/api/git-status', {'Accept-Encoding': 'gzip, deflate'})
+        etag = headers['ETag']
+        not_modified = request(base, '/api/git-status', {'If-None-Match': f'"other", {etag}'})
+        changed = request(base, '/api/git-status', {'If-None-Match': '"other"', 'Accept-Encoding': 'gzip;q=0'})
+    finally:
+        dashboard_api.GZIP_MIN_BYTES = gzip_min_bytes
+        stop_server(server)
+
+    decoded = gzip.decompress(body)
+    return (
+        status == 200 and headers['Content-Encoding'] == 'gzip' and
+        headers['Vary'] == 'Accept-Encoding' and int(headers['Content-Length']) == len(body) and
+        json.loads(decoded)['git_status']['repository_exists'] and b'\n' not in decoded and b', ' not in decoded and
+        not_modified[0] == 304 and not_modified[2] == b'' and not_modified[1]['ETag'] == etag and
+        changed[0] == 200 and 'Content-Encoding' not in changed[1] and changed[2] == decoded
+    )
+
+
+class CountingMetricsUpdater(dashboard_api.DashboardMetricsUpdater):
+    """DashboardMetricsUpdater recording the thread that created each instance."""
+
+    created_by = []
+
+    def __init__(self, *args, **kwargs):
+        self.created_by.append(threading.current_thread().name)
+        super().__init__(*args, **kwargs)
+
+
+def test_metrics_endpoints_reuse_thread_updaters():
+    updater_class, dashboard_api.DashboardMetricsUpdater = dashboard_api.DashboardMetricsUpdater, CountingMetricsUpdater
+    CountingMetricsUpdater.created_by.clear()
+    server, base = start_server(workers=2, metrics_backend='sqlite', precompute=False)
+    try:
+        paths = ['/api/realtime-metrics', '/api/status', '/api/top/tools?limit=3'] * 5
+        results = []
+        threads = [threading.Thread(target=lambda path=path: results.append(get(f"{base}{path}"))) for path in paths]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        dashboard_api.DashboardMetricsUpdater = updater_class
+        stop_server(server)
+
+    created = [name for name in CountingMetricsUpdater.created_by if name.startswith('dashboard-request')]
+    return (
+        len(results) == len(paths) and
+        all(status == 200 and 'error' not in data for status, data, _ in results) and
+        1 <= len(created) <= 2
+    )
+
+
+def test_precompute_has_its_own_pool():
+    SlowGitOperationsMonitor.collector_threads.clear()
+    server, base = start_server()
+    try:
+        status, data, _ = get(f"{base}/api/git-status")
+    finally:
+        stop_server(server)
+
+    threads = SlowGitOperationsMonitor.collector_threads
+    return (
+        status == 200 and data['git_status']['repository_exists'] and
+        threads and all(name.startswith('dashboard-precompute') for name in threads)
+    )
+
+
+def main():
+    print("Testing dashboard server concurrency...")
+    print("=" * 50)
+
+    dashboard_api.GitOperationsMonitor = SlowGitOperationsMonitor
+
+    test_cases = [
+        ('cheap endpoints stay fast during slow requests', test_cheap_endpoints_stay_fast),
+        ('slow collector serves the stale cached result', test_slow_collector_serves_stale_result),
+        ('saturated pool answers 503', test_saturated_pool_answers_503),
+        ('JSON is compact, revalidated with ETags and gzipped', test_conditional_and_compressed_json),
+        ('metrics endpoints reuse one updater per worker thread', test_metrics_endpoints_reuse_thread_updaters),
+        ('precomputed results refresh in their own pool', test_precompute_has_its_own_pool),
+    ]
+
+    passed = 0
+    for name, test in test_cases:
+        if test():
+            passed += 1
+            print(f"✅ {name}")
+        else:
+            print(f"❌ {name}")
+
+    print("\n" + "=" * 50)
+    print(f"Results: {passed}/{len(test_cases)} tests passed")
+
+    if passed == len(test_cases):
+        print("🎉 All tests passed!")
+        return 0
+    else:
+        print("❌ Some tests failed!")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Heavy Hitters Test
+
+Checks the Space-Saving error bounds on a skewed stream, that the updater's
+tool, file and agent summaries stay bounded (legacy count dicts included),
+that both storage backends rank the same top items, and the /api/top
+endpoint.
+"""
+
+import io
+import sys
+import json
+import random
+import tempfile
+import contextlib
+import urllib.request
+import urllib.error
+from pathlib import Path
+from collections import Counter
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import heavy_hitters
+from update_dashboard_metrics import DashboardMetricsUpdater
+
+
+def edit(file_path, tool='Edit'):
+    return {
+        "event": "post_tool_use",
+        "tool": {"name": tool, "parameters": {"file_path": file_path}},
+        "modified_files": [file_path]
+    }
+
+
+def test_space_saving_bounds():
+    random.seed(5)
+    stream = [f"file_{int(random.paretovariate(1.1))}" for _ in range(20000)]
+    summary = heavy_hitters.create_summary(50)
+    for item in stream:
+        heavy_hitters.add(summary, item)
+
+    true_counts = Counter(stream)
+    counters = summary['counters']
+    top = heavy_hitters.top(summary, 5)
+    return (
+        len(true_counts) > 50 and len(counters) == 50 and
+        all(count - error <= true_counts[item] <= count for item, (count, error) in counters.items()) and
+        all(item in counters for item, count in true_counts.items() if count > len(stream) / 50) and
+        [entry['item'] for entry in top] == [item for item, _ in true_counts.most_common(5)] and
+        not heavy_hitters.is_exact(summary)
+    )
+
+
+def test_updater_summaries_stay_bounded():
+    updater = DashboardMetricsUpdater(tempfile.mkdtemp(), 'json')
+    cache = updater.create_empty_cache()
+    # Legacy snapshots kept unbounded dicts
+    cache.pop('heavy_hitters')
+    cache['tool_usage']['tool_counts'] = {'Read': 7}
+    cache['agent_activity']['agent_mentions'] = {'research': 2}
+
+    for n in range(1000):
+        updater.apply_event(updater.event_from_hook_data(edit(f"/repo/generated_{n}.py")), cache)
+    for _ in range(30):
+        updater.apply_event(updater.event_from_hook_data(edit("/repo/hot.py", 'Write')), cache)
+
+    summaries = cache['heavy_hitters']
+    return (
+        len(summaries['files']['counters']) == heavy_hitters.CAPACITIES['files'] and
+        heavy_hitters.top(summaries['files'], 1)[0]['item'] == '/repo/hot.py' and
+        heavy_hitters.counts(summaries['tools']) == {'Edit': 1000, 'Write': 30, 'Read': 7} and
+        heavy_hitters.counts(summaries['agents']) == {'research': 2} and
+        'tool_counts' not in cache['tool_usage'] and
+        len(json.dumps(cache)) < 60000
+    )
+
+
+def record_workload(backend):
+    updater = DashboardMetricsUpdater(tempfile.mkdtemp(), backend)
+    for n in range(60):
+        updater.update_from_hook_data(edit(f"/repo/mod_{n % 7}.py", ['Edit', 'Write', 'Read'][n % 4 % 3]))
+    updater.update_from_hook_data({"event": "post_tool_use", "tool": {"name": "Task"}, "prompt": "research agent"})
+    return updater
+
+
+def test_backends_rank_the_same():
+    results = []
+    for backend in ('json', 'sqlite'):
+        updater = record_workload(backend)
+        metrics = updater.get_current_metrics()
+        results.append((
+            {kind: updater.get_top_items(kind, 3)['items'] for kind in heavy_hitters.CAPACITIES},
+            metrics['computed']['top_tools'],
+            metrics['tool_usage']['tool_counts'],
+            metrics['agent_activity']['agent_mentions']
+        ))
+    json_result, sqlite_result = results
+    return json_result == sqlite_result and json_result[0]['files'][0] == {"item": "/repo/mod_0.py", "count": 9, "error": 0}
+
+
+def test_top_endpoint():
+    from dashboard_api import DashboardServer
+
+    updater = record_workload('json')
+    server = DashboardServer(port=0, framework_root=str(updater.framework_root), metrics_backend='json')
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = server.start()
+    if not started:
+        return False
+    base = f"http://127.0.0.1:{server.server.server_address[1]}/api/top"
+    try:
+        with urllib.request.urlopen(f"{base}/files?limit=2") as response:
+            data = json.loads(response.read())
+        try:
+            urllib.request.urlopen(f"{base}/colors")
+            unknown_status = 200
+        except urllib.error.HTTPError as e:
+            unknown_status = e.code
+    finally:
+        with contextlib.redirect_stdout(io.StringIO()):
+            server.stop()
+
+    return (
+        data['kind'] == 'files' and data['exact'] and
+        [entry['item'] for entry in data['items']] == ['/repo/mod_0.py', '/repo/mod_1.py'] and
+        unknown_status == 404
+    )
+
+
+def main():
+    print("Testing heavy hitters...")
+    print("=" * 50)
+
+    test_cases = [
+        ('space-saving counts stay within their error bounds', test_space_saving_bounds),
+        ('updater summaries stay bounded', test_updater_summaries_stay_bounded),
+        ('json and sqlite backends rank the same top items', test_backends_rank_the_same),
+        ('/api/top serves top items', test_top_endpoint),
+    ]
+
+    passed = 0
+    for name, test in test_cases:
+        if test():
+            passed += 1
+            print(f"✅ {name}")
+        else:
+            print(f"❌ {name}")
+
+    print("\n" + "=" * 50)
+    print(f"Results: {passed}/{len(test_cases)} tests passed")
+
+    if passed == len(test_cases):
+        print("🎉 All tests passed!")
+        return 0
+    else:
+        print("❌ Some tests failed!")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Metrics Stream Test
+
+Watches /api/stream of a running DashboardServer while hook events are
+recorded, and checks merge patches, Last-Event-ID resume, heartbeats and
+that watchers do not hold request workers.
+"""
+
+import io
+import sys
+import json
+import time
+import socket
+import tempfile
+import contextlib
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import metrics_stream
+from metrics_stream import merge_patch
+from dashboard_api import DashboardServer
+from update_dashboard_metrics import DashboardMetricsUpdater
+
+
+metrics_stream.POLL_SECONDS = 0.05
+metrics_stream.HEARTBEAT_SECONDS = 0.5
+
+
+class Watcher:
+    """Raw SSE client: reads events (and comments) from /api/stream."""
+
+    def __init__(self, port, last_event_id=None):
+        self.sock = socket.create_connection(('127.0.0.1', port), timeout=5)
+        headers = f"Last-Event-ID: {last_event_id}\r\n" if last_event_id is not None else ""
+        self.sock.sendall(f"GET /api/stream HTTP/1.1\r\nHost: localhost\r\n{headers}\r\n".encode())
+        self.buffer = b''
+        self.headers = self.read_block(b'\r\n\r\n')
+
+    def read_block(self, separator=b'\n\n'):
+        while separator not in self.buffer:
+            chunk = self.sock.recv(65536)
+            if not chunk:
+                raise ConnectionError('stream closed')
+            self.buffer += chunk
+        block, self.buffer = self.buffer.split(separator, 1)
+        return block.decode()
+
+    def next_event(self, skip_comments=True):
+        """{'id', 'event', 'data'} of the next event ({'comment'} for comments unless skipped)."""
+        while True:
+            event = {}
+            for line in self.read_block().split('\n'):
+                if line.startswith(':'):
+                    event['comment'] = line[1:].strip()
+                elif line:
+                    field, _, value = line.partition(': ')
+                    event[field] = json.loads(value) if field == 'data' else value
+            if 'event' in event or ('comment' in event and not skip_comments):
+                return event
+
+    def close(self):
+        self.sock.close()
+
+
+def record_edit(framework_root, n):
+    DashboardMetricsUpdater(framework_root, 'json').update_from_hook_data({
+        "event": "post_tool_use",
+        "tool": {"name": "Edit", "parameters": {"file_path": f"/repo/mod_{n}.py"}},
+        "modified_files": [f"/repo/mod_{n}.py"]
+    })
+
+
+def start_server(**kwargs):
+    server = DashboardServer(port=0, framework_root=tempfile.mkdtemp(), metrics_backend='json', **kwargs)
+    with contextlib.redirect_stdout(io.StringIO()):
+        server.start()
+    return server, server.server.server_address[1]
+
+
+def stop_server(server):
+    with contextlib.redirect_stdout(io.StringIO()):
+        server.stop()
+
+
+def apply_patch(document, patch):
+    for key, value in patch.items():
+        if value is None:
+            document.pop(key, None)
+        elif isinstance(value, dict) and isinstance(document.get(key), dict):
+            apply_patch(document[key], value)
+        else:
+            document[key] = value
+    return document
+
+
+def test_merge_patch_round_trip():
+    old = {"a": 1, "b": {"c": [1, 2], "d": "x"}, "gone": True}
+    new = {"a": 1, "b": {"c": [1, 2, 3], "d": "x"}, "added": {"e": 0}}
+    patch = merge_patch(old, new)
+    return patch == {"b": {"c": [1, 2, 3]}, "added": {"e": 0}, "gone": None} and apply_patch(json.loads(json.dumps(old)), patch) == new
+
+
+def test_changes_are_pushed_as_patches():
+    server, port = start_server()
+    try:
+        watcher = Watcher(port)
+        snapshot = watcher.next_event()
+        record_edit(server.framework_root, 1)
+        change = watcher.next_event()
+        watcher.close()
+    finally:
+        stop_server(server)
+
+    document = apply_patch(json.loads(json.dumps(snapshot['data'])), change['data'])
+    return (
+        'text/event-stream' in watcher.headers and
+        snapshot['event'] == 'snapshot' and snapshot['data']['tool_usage']['total_executions'] == 0 and
+        change['event'] == 'metrics' and int(change['id']) == int(snapshot['id']) + 1 and
+        change['data']['tool_usage']['total_executions'] == 1 and
+        'framework_health' not in change['data'] and 'rolling_windows' not in change['data'] and
+        document['file_modifications']['total_modifications'] == 1
+    )
+
+
+def test_reconnect_resumes_from_last_event_id():
+    server, port = start_server()
+    try:
+        watcher = Watcher(port)
+        snapshot = watcher.next_event()
+        watcher.close()
+
+        # Missed while disconnected
+        record_edit(server.framework_root, 1)
+        other = Watcher(port)
+        other.next_event()
+        missed = other.next_event()
+        other.close()
+
+        resumed = Watcher(port, last_event_id=snapshot['id'])
+        replayed = resumed.next_event()
+        resumed.close()
+        unknown = Watcher(port, last_event_id='from another server')
+        fresh = unknown.next_event()
+        unknown.close()
+    finally:
+        stop_server(server)
+
+    return (
+        replayed == missed and replayed['event'] == 'metrics' and
+        fresh['event'] == 'snapshot' and fresh['id'] == missed['id'] and
+        fresh['data']['tool_usage']['total_executions'] == 1
+    )
+
+
+def test_watchers_share_updates_and_free_workers():
+    server, port = start_server(workers=1, backlog=0)
+    try:
+        watchers, snapshots = [], []
+        for _ in range(5):
+            # Each watcher has been handed over once its snapshot arrives
+            watchers.append(Watcher(port))
+            snapshots.append(watchers[-1].next_event())
+            time.sleep(0.05)
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/api/navigation", timeout=5) as response:
+            navigation_status = response.status
+        record_edit(server.framework_root, 1)
+        changes = [watcher.next_event() for watcher in watchers]
+        heartbeat = watchers[0].next_event(skip_comments=False)
+        for watcher in watchers:
+            watcher.close()
+    finally:
+        stop_server(server)
+
+    return (
+        navigation_status == 200 and
+        len({snapshot['id'] for snapshot in snapshots}) == 1 and
+        all(change == changes[0] for change in changes) and
+        heartbeat.get('comment') == 'heartbeat'
+    )
+
+
+def main():
+    print("Testing metrics stream...")
+    print("=" * 50)
+
+    test_cases = [
+        ('merge patches carry only changed fields', test_merge_patch_round_trip),
+        ('recorded events are pushed as patches', test_changes_are_pushed_as_patches),
+        ('reconnects resume from Last-Event-ID', test_reconnect_resumes_from_last_event_id),
+        ('watchers share updates and free the workers', test_watchers_share_updates_and_free_workers),
+    ]
+
+    passed = 0
+    for name, test in test_cases:
+        if test():
+            passed += 1
+            print(f"✅ {name}")
+        else:
+            print(f"❌ {name}")
+
+    print("\n" + "=" * 50)
+    print(f"Results: {passed}/{len(test_cases)} tests passed")
+
+    if passed == len(test_cases):
+        print("🎉 All tests passed!")
+        return 0
+    else:
+        print("❌ Some tests failed!")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
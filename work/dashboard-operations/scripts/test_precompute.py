@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Precompute Scheduler Test
+
+Checks that readers get snapshots without waiting for slow collectors, that
+jobs refresh on their interval and when watched paths change, that published
+snapshots are private copies, and that failures and restarts keep the last
+result.
+"""
+
+import sys
+import time
+import tempfile
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import precompute
+from precompute import PrecomputeScheduler
+from response_cache import ResponseCache
+
+
+precompute.WATCH_SECONDS = 0.05
+precompute.MIN_REFRESH_SECONDS = 0
+precompute.RETRY_SECONDS = 0.1
+
+
+class Collector:
+    """Counts its runs; each takes delay seconds and returns the run number."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.runs = 0
+        self.fail = False
+        self.last = None
+
+    def __call__(self):
+        self.runs += 1
+        run = self.runs
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError('collector failed')
+        self.last = {"run": run, "items": [run]}
+        return self.last
+
+
+def wait_for(condition, timeout=3.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_readers_do_not_wait_for_slow_collectors():
+    scheduler = PrecomputeScheduler(ThreadPoolExecutor(max_workers=2))
+    collect = Collector(delay=0.3)
+    scheduler.add_job('key', collect, interval=60)
+    scheduler.start()
+    try:
+        first = scheduler.latest('key', timeout=2)
+        started = time.perf_counter()
+        reads = [scheduler.latest('key') for _ in range(100)]
+        seconds = time.perf_counter() - started
+    finally:
+        scheduler.stop()
+    return first.data['run'] == 1 and all(read is first for read in reads) and seconds < 0.05 and collect.runs == 1
+
+
+def test_interval_and_watched_changes_refresh():
+    watched = Path(tempfile.mkdtemp()) / 'HEAD'
+    watched.write_text('ref: refs/heads/main\n')
+    scheduler = PrecomputeScheduler(ThreadPoolExecutor(max_workers=2))
+    ticking, watching = Collector(), Collector()
+    scheduler.add_job('ticking', ticking, interval=0.1)
+    scheduler.add_job('watching', watching, interval=60, watch=[watched])
+    scheduler.start()
+    try:
+        ticked = wait_for(lambda: scheduler.latest('ticking', timeout=2).generation >= 3)
+        before = scheduler.latest('watching', timeout=2)
+        idle = watching.runs
+        watched.write_text('ref: refs/heads/feature/longer-name\n')
+        refreshed = wait_for(lambda: scheduler.latest('watching').generation == before.generation + 1)
+    finally:
+        scheduler.stop()
+    return ticked and idle == 1 and refreshed and scheduler.latest('watching').data['run'] == 2
+
+
+def test_snapshots_are_private_copies():
+    scheduler = PrecomputeScheduler(ThreadPoolExecutor(max_workers=1))
+    collect = Collector()
+    scheduler.add_job('key', collect, interval=60)
+    scheduler.start()
+    try:
+        snapshot = scheduler.latest('key', timeout=2)
+    finally:
+        scheduler.stop()
+    collect.last['items'].append('changed by the collector')
+    try:
+        snapshot.generation = 0
+        frozen = False
+    except AttributeError:
+        frozen = True
+    return snapshot.data == {"run": 1, "items": [1]} and frozen
+
+
+def test_failures_keep_the_last_snapshot():
+    scheduler = PrecomputeScheduler(ThreadPoolExecutor(max_workers=1))
+    collect = Collector()
+    scheduler.add_job('key', collect, interval=0.1)
+    scheduler.start()
+    try:
+        first = scheduler.latest('key', timeout=2)
+        collect.fail = True
+        retried = wait_for(lambda: collect.runs >= 3)
+        during = scheduler.latest('key')
+        collect.fail = False
+        recovered = wait_for(lambda: scheduler.latest('key').generation == 2)
+    finally:
+        scheduler.stop()
+    return retried and during is first and recovered
+
+
+def test_restart_starts_from_stored_snapshot():
+    snapshot_dir = Path(tempfile.mkdtemp())
+    executor = ThreadPoolExecutor(max_workers=1)
+    scheduler = PrecomputeScheduler(executor, ResponseCache(executor, snapshot_dir))
+    scheduler.add_job('health_check', Collector(), interval=60)
+    scheduler.start()
+    try:
+        stored = scheduler.latest('health_check', timeout=2)
+        written = wait_for(lambda: (snapshot_dir / 'health_check_cache.json').exists())
+    finally:
+        scheduler.stop()
+
+    # Available before the restarted scheduler runs anything
+    collect = Collector(delay=0.5)
+    restarted = PrecomputeScheduler(executor, ResponseCache(executor, snapshot_dir))
+    restarted.add_job('health_check', collect, interval=60)
+    warm = restarted.latest('health_check')
+    return written and stored.data == warm.data == {"run": 1, "items": [1]} and collect.runs == 0
+
+
+def main():
+    print("Testing precompute scheduler...")
+    print("=" * 50)
+
+    test_cases = [
+        ('readers do not wait for slow collectors', test_readers_do_not_wait_for_slow_collectors),
+        ('intervals and watched changes trigger refreshes', test_interval_and_watched_changes_refresh),
+        ('snapshots are private, immutable copies', test_snapshots_are_private_copies),
+        ('failures keep the last snapshot', test_failures_keep_the_last_snapshot),
+        ('restarts start from the stored snapshot', test_restart_starts_from_stored_snapshot),
+    ]
+
+    passed = 0
+    for name, test in test_cases:
+        if test():
+            passed += 1
+            print(f"✅ {name}")
+        else:
+            print(f"❌ {name}")
+
+    print("\n" + "=" * 50)
+    print(f"Results: {passed}/{len(test_cases)} tests passed")
+
+    if passed == len(test_cases):
+        print("🎉 All tests passed!")
+        return 0
+    else:
+        print("❌ Some tests failed!")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Response Cache Test
+
+Checks single-flight collection of concurrent misses, TTL hits,
+stale-while-revalidate, failed refreshes and warm starts from snapshots.
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from response_cache import ResponseCache
+
+
+class Collector:
+    """Counts its runs; each takes delay seconds and returns the run number."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.runs = 0
+        self.fail = False
+
+    def __call__(self):
+        self.runs += 1
+        run = self.runs
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError('collector failed')
+        return {"run": run}
+
+
+def test_concurrent_misses_share_one_run():
+    cache = ResponseCache(ThreadPoolExecutor(max_workers=4))
+    collect = Collector(delay=0.3)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get('key', collect, ttl=60))) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return collect.runs == 1 and results == [{"run": 1}] * 10
+
+
+def test_stale_while_revalidate():
+    cache = ResponseCache(ThreadPoolExecutor(max_workers=2))
+    collect = Collector(delay=0.2)
+    first = cache.get('key', collect, ttl=0.5, stale_seconds=5)
+    hit = cache.get('key', collect, ttl=0.5, stale_seconds=5)
+    time.sleep(0.6)
+
+    started = time.perf_counter()
+    stale = [cache.get('key', collect, ttl=0.5, stale_seconds=5) for _ in range(5)]
+    stale_seconds = time.perf_counter() - started
+    time.sleep(0.3)  # The one refresh finishes (and is still fresh)
+    refreshed = cache.get('key', collect, ttl=0.5, stale_seconds=5)
+    return (
+        first == hit == {"run": 1} and stale_seconds < 0.1 and
+        stale == [{"run": 1, "stale": True}] * 5 and
+        refreshed == {"run": 2} and collect.runs == 2
+    )
+
+
+def test_failures_and_timeouts_keep_previous_result():
+    cache = ResponseCache(ThreadPoolExecutor(max_workers=2))
+    collect = Collector()
+    cache.get('key', collect, ttl=0)
+    collect.fail = True
+    failed = cache.get('key', collect, ttl=0)
+
+    collect.fail, collect.delay = False, 0.5
+    timed_out = cache.get('key', collect, ttl=0, timeout=0.1)
+    try:
+        cache.get('other', Collector(delay=0.5), ttl=0, timeout=0.1)
+        missing_raised = False
+    except TimeoutError:
+        missing_raised = True
+    return failed == timed_out == {"run": 1, "stale": True} and missing_raised
+
+
+def test_warm_start_from_snapshot():
+    snapshot_dir = Path(tempfile.mkdtemp())
+    collect = Collector()
+    ResponseCache(ThreadPoolExecutor(max_workers=1), snapshot_dir).get('health_check', collect, ttl=60)
+
+    # A restarted server answers from the snapshot without collecting
+    restarted = ResponseCache(ThreadPoolExecutor(max_workers=1), snapshot_dir)
+    warm = restarted.get('health_check', collect, ttl=60)
+
+    # An old snapshot is served stale while it is refreshed
+    old = time.time() - 120
+    os.utime(snapshot_dir / 'health_check_cache.json', (old, old))
+    aged = ResponseCache(ThreadPoolExecutor(max_workers=1), snapshot_dir)
+    stale = aged.get('health_check', collect, ttl=60, stale_seconds=600)
+    return warm == {"run": 1} and stale == {"run": 1, "stale": True} and collect.runs in (1, 2)
+
+
+def main():
+    print("Testing response cache...")
+    print("=" * 50)
+
+    test_cases = [
+        ('concurrent misses share one collector run', test_concurrent_misses_share_one_run),
+        ('expired results are served while refreshing', test_stale_while_revalidate),
+        ('failures and timeouts keep the previous result', test_failures_and_timeouts_keep_previous_result),
+        ('restarted caches warm-start from snapshots', test_warm_start_from_snapshot),
+    ]
+
+    passed = 0
+    for name, test in test_cases:
+        if test():
+            passed += 1
+            print(f"✅ {name}")
+        else:
+            print(f"❌ {name}")
+
+    print("\n" + "=" * 50)
+    print(f"Results: {passed}/{len(test_cases)} tests passed")
+
+    if passed == len(test_cases):
+        print("🎉 All tests passed!")
+        return 0
+    else:
+        print("❌ Some tests failed!")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
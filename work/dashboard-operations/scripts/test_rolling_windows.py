@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Rolling-Window Counter Test
+
+Checks the ring-buffer counters against counts computed from the raw event
+times, across day boundaries and after the counters sat idle.
+"""
+
+import sys
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import rolling_windows
+
+
+NOW = datetime(2026, 3, 10, 0, 20, 0)
+
+
+def test_windows_match_raw_counts():
+    random.seed(1)
+    times = [NOW - timedelta(seconds=random.randint(0, 10 * 24 * 3600)) for _ in range(2000)]
+    windows = rolling_windows.create_windows()
+    for moment in times:
+        rolling_windows.add(windows, moment.timestamp())
+
+    now = NOW.timestamp()
+    minute = int(now // 60)
+    hour_start = NOW.replace(minute=0, second=0) - timedelta(hours=23)
+    return (
+        rolling_windows.last_hour(windows, now) == sum(1 for t in times if int(t.timestamp() // 60) > minute - 60) and
+        rolling_windows.last_day(windows, now) == sum(1 for t in times if t >= hour_start) and
+        rolling_windows.last_days(windows, 7, now) == sum(1 for t in times if (NOW.date() - t.date()).days < 7) and
+        rolling_windows.today(windows, now) == sum(1 for t in times if t.date() == NOW.date())
+    )
+
+
+def test_today_resets_at_midnight():
+    windows = rolling_windows.create_windows()
+    rolling_windows.add(windows, (NOW - timedelta(minutes=30)).timestamp(), 5)  # 23:50 the day before
+    rolling_windows.add(windows, NOW.timestamp(), 2)
+    return (
+        rolling_windows.today(windows, NOW.timestamp()) == 2 and
+        rolling_windows.last_days(windows, 2, NOW.timestamp()) == 7
+    )
+
+
+def test_idle_counters_expire():
+    windows = rolling_windows.create_windows()
+    rolling_windows.add(windows, NOW.timestamp(), 3)
+    # Same ring slots a whole ring later: old buckets must not be counted
+    later = NOW + timedelta(days=rolling_windows.RING_SIZES['day'])
+    rolling_windows.add(windows, later.timestamp())
+    stale = NOW - timedelta(days=40)
+    rolling_windows.add(windows, stale.timestamp(), 100)
+    return (
+        rolling_windows.rates(windows, later.timestamp()) == {"last_1h": 1, "last_24h": 1, "last_7d": 1} and
+        rolling_windows.last_days(windows, 30, later.timestamp()) == 1
+    )
+
+
+def main():
+    print("Testing rolling-window counters...")
+    print("=" * 50)
+
+    test_cases = [
+        ('1h/24h/7d/today windows match raw counts', test_windows_match_raw_counts),
+        ('today counter resets at local midnight', test_today_resets_at_midnight),
+        ('idle and out-of-range buckets are not counted', test_idle_counters_expire),
+    ]
+
+    passed = 0
+    for name, test in test_cases:
+        if test():
+            passed += 1
+            print(f"✅ {name}")
+        else:
+            print(f"❌ {name}")
+
+    print("\n" + "=" * 50)
+    print(f"Results: {passed}/{len(test_cases)} tests passed")
+
+    if passed == len(test_cases):
+        print("🎉 All tests passed!")
+        return 0
+    else:
+        print("❌ Some tests failed!")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
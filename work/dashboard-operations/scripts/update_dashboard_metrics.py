@@ -4,46 +4,79 @@ Dashboard Metrics Updater
 
 Called by hooks to update dashboard metrics in real-time.
 Handles incremental updates and maintains metrics cache.
+
+Hook events are reduced to compact records and handed to a storage backend
+(see metrics_storage): by default an append-only event log folded into the
+metrics_cache.json snapshot, or an indexed SQLite database in WAL mode.
+
+Per-day rates, today counters and last 1h/24h/7d counts come from the
+rolling-window counters kept in the cache (see rolling_windows), updated once
+per event rather than recomputed on every request.
+
+Tool, modified-file and agent counts are bounded heavy-hitter summaries
+(see heavy_hitters) rather than dicts that grow with every new file or tool
+name; top(kind) ranks them (the SQLite backend counts over its indexes).
+
+Activity log entries go through an ActivitySampler (see activity_sampling),
+which samples them during bursts; metrics always count every event.
+
+hook_performance reports the latency histograms hooks record under
+data/hook_latency (see hooks/hook_timing.py): runs, success rate, mean and
+p50/p95/p99 per hook and per stage.
 """
 
 import json
-import os
+import sys
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 
+# Hooks load this file by path, so make its sibling modules importable
+SCRIPTS_DIR = Path(__file__).resolve().parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from metrics_storage import create_storage, STORAGE_BACKENDS, AVERAGE_WINDOW_DAYS
+import rolling_windows
+import heavy_hitters
+from activity_sampling import ActivitySampler
+from activity_codec import omit_large_values
+
+# metrics_storage makes the hooks directory importable when it is available
+try:
+    import hook_timing
+except ImportError:
+    hook_timing = None
+
+# Common agent indicators
+AGENT_INDICATORS = [
+    'strategic', 'orchestrator', 'guardian', 'collaborative',
+    'action-oriented', 'research', 'specialist', 'deep-thinker',
+    'knowledge-curator', 'dashboard-management', 'api-design',
+    'code-quality', 'performance-optimization', 'testing-strategy',
+    'claude-hooks', 'agent-template'
+]
+
+# Rolling-window counters kept in cache['rolling_windows']
+ROLLING_SERIES = ['tool_executions', 'file_modifications', 'session_starts', 'agent_activity']
+
 class DashboardMetricsUpdater:
-    def __init__(self, framework_root: str = "/Users/nalve/.claude"):
+    def __init__(self, framework_root: str = "/Users/nalve/.claude", backend: Optional[str] = None):
         self.framework_root = Path(framework_root)
         self.dashboard_data_dir = self.framework_root / "system" / "dashboard" / "data"
         self.dashboard_data_dir.mkdir(parents=True, exist_ok=True)
+        self.hook_latency_dir = self.dashboard_data_dir / "hook_latency"
         
-        self.metrics_cache_file = self.dashboard_data_dir / "metrics_cache.json"
-        self.activity_log_file = self.dashboard_data_dir / "activity_log.jsonl"
+        # 'json' (event log + snapshot) or 'sqlite'; see metrics_storage
+        self.storage = create_storage(backend, self.dashboard_data_dir, self.apply_event, self.create_empty_cache)
+        self.sampler = ActivitySampler(self.dashboard_data_dir)
         
     def update_from_hook_data(self, hook_data: Dict[str, Any]):
         """Update dashboard metrics based on hook execution data."""
         try:
-            # Load current metrics cache
-            metrics_cache = self.load_metrics_cache()
-            
-            # Update metrics based on hook event
-            event_type = hook_data.get('event', 'unknown')
-            
-            if event_type == 'post_tool_use':
-                self.handle_post_tool_use(hook_data, metrics_cache)
-            elif event_type == 'session_start':
-                self.handle_session_start(hook_data, metrics_cache)
-            elif event_type == 'user_prompt_submit':
-                self.handle_user_prompt(hook_data, metrics_cache)
-            elif event_type == 'pre_tool_use':
-                self.handle_pre_tool_use(hook_data, metrics_cache)
-            
-            # Log the activity
-            self.log_activity(hook_data)
-            
-            # Save updated cache
-            self.save_metrics_cache(metrics_cache)
+            # Record the event together with the activity log entries the sampler lets through
+            activities = self.sampler.admit(self.activity_entry(hook_data))
+            self.storage.record(self.event_from_hook_data(hook_data), activities)
             
             return True
             
@@ -58,23 +91,65 @@ class DashboardMetricsUpdater:
             self.log_activity(error_log)
             return False
     
-    def load_metrics_cache(self) -> Dict[str, Any]:
-        """Load existing metrics cache or create new one."""
-        if not self.metrics_cache_file.exists():
-            return self.create_empty_cache()
+    def event_from_hook_data(self, hook_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Reduce hook data to the compact record the metrics handlers need."""
+        event = {
+            "event": hook_data.get('event', 'unknown'),
+            "recorded_at": datetime.now().isoformat()
+        }
         
-        try:
-            with open(self.metrics_cache_file, 'r') as f:
-                cache = json.load(f)
-            
-            # Ensure cache has required structure
-            if 'last_updated' not in cache:
-                cache['last_updated'] = datetime.now().isoformat()
-            
-            return cache
-            
-        except Exception:
-            return self.create_empty_cache()
+        if event['event'] == 'post_tool_use':
+            tool_data = hook_data.get('tool', {})
+            # Parameters are only shown in recent_tools: file contents and edit strings
+            # become their size and hash, so records do not grow with the payload
+            event['tool'] = {
+                "name": tool_data.get('name', 'unknown'),
+                "parameters": omit_large_values(tool_data.get('parameters', {}))
+            }
+            event['timestamp'] = hook_data.get('timestamp', event['recorded_at'])
+            event['modified_files'] = hook_data.get('modified_files', [])
+            if 'warnings' in hook_data:
+                event['warnings'] = hook_data['warnings']
+            # Agent detection needs the full hook data, so it happens now
+            event['agent_indicator'] = self.find_agent_indicator(hook_data)
+        elif event['event'] == 'session_start':
+            event['timestamp'] = hook_data.get('timestamp', event['recorded_at'])
+        
+        return event
+    
+    def activity_entry(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Activity log entry for hook data."""
+        return {
+            "timestamp": datetime.now().isoformat(),
+            **data
+        }
+    
+    def apply_event(self, event: Dict[str, Any], cache: Dict[str, Any]):
+        """Fold one logged event into the metrics."""
+        event_type = event.get('event', 'unknown')
+        
+        if event_type == 'post_tool_use':
+            self.handle_post_tool_use(event, cache)
+        elif event_type == 'session_start':
+            self.handle_session_start(event, cache)
+        elif event_type == 'user_prompt_submit':
+            self.handle_user_prompt(event, cache)
+        elif event_type == 'pre_tool_use':
+            self.handle_pre_tool_use(event, cache)
+        
+        cache['last_updated'] = event.get('recorded_at', cache['last_updated'])
+    
+    def load_metrics_cache(self) -> Dict[str, Any]:
+        """Load current metrics from the storage backend."""
+        return self.storage.load_metrics()
+    
+    def compact(self) -> bool:
+        """
+        Log the activity the sampler still holds for an ended window, then
+        compact the storage backend; False if another process is compacting.
+        """
+        self.flush_sampled_activity()
+        return self.storage.compact()
     
     def create_empty_cache(self) -> Dict[str, Any]:
         """Create empty metrics cache structure."""
@@ -109,9 +184,40 @@ class DashboardMetricsUpdater:
                 "agent_mentions": {},
                 "total_agent_deployments": 0,
                 "recent_agent_activity": []
+            },
+            "rolling_windows": {series: rolling_windows.create_windows() for series in ROLLING_SERIES},
+            "heavy_hitters": {
+                kind: heavy_hitters.create_summary(capacity)
+                for kind, capacity in heavy_hitters.CAPACITIES.items()
             }
         }
     
+    def windows(self, cache: Dict[str, Any], series: str) -> Dict[str, Any]:
+        """Rolling-window counters of a series (added to caches that predate them)."""
+        return cache.setdefault('rolling_windows', {}).setdefault(series, rolling_windows.create_windows())
+    
+    def count_event(self, cache: Dict[str, Any], series: str, hook_data: Dict[str, Any], value: int = 1):
+        """Count value in a series' rolling windows at the time the event was recorded."""
+        rolling_windows.add(self.windows(cache, series), self.event_epoch(hook_data), value)
+    
+    def summary(self, cache: Dict[str, Any], kind: str) -> Dict[str, Any]:
+        """Heavy-hitter summary of a kind ('tools', 'files' or 'agents')."""
+        summaries = cache.get('heavy_hitters')
+        if summaries is None:
+            # Caches that predate the summaries kept unbounded count dicts: fold them in once
+            summaries = cache['heavy_hitters'] = {}
+            legacy_counts = {
+                'tools': cache.get('tool_usage', {}).pop('tool_counts', {}),
+                'agents': cache.get('agent_activity', {}).pop('agent_mentions', {})
+            }
+            for legacy_kind, legacy in legacy_counts.items():
+                summary = summaries[legacy_kind] = heavy_hitters.create_summary(heavy_hitters.CAPACITIES[legacy_kind])
+                for item, count in sorted(legacy.items(), key=lambda entry: entry[1]):
+                    heavy_hitters.add(summary, item, count)
+        if kind not in summaries:
+            summaries[kind] = heavy_hitters.create_summary(heavy_hitters.CAPACITIES[kind])
+        return summaries[kind]
+    
     def handle_post_tool_use(self, hook_data: Dict[str, Any], cache: Dict[str, Any]):
         """Handle post_tool_use hook data."""
         tool_data = hook_data.get('tool', {})
@@ -119,7 +225,8 @@ class DashboardMetricsUpdater:
         
         # Update tool usage statistics
         cache['tool_usage']['total_executions'] += 1
-        cache['tool_usage']['tool_counts'][tool_name] = cache['tool_usage']['tool_counts'].get(tool_name, 0) + 1
+        heavy_hitters.add(self.summary(cache, 'tools'), tool_name)
+        self.count_event(cache, 'tool_executions', hook_data)
         
         # Update recent tools list (keep last 10)
         recent_tools = cache['tool_usage'].get('recent_tools', [])
@@ -134,17 +241,11 @@ class DashboardMetricsUpdater:
         modified_files = hook_data.get('modified_files', [])
         if modified_files:
             cache['file_modifications']['total_modifications'] += len(modified_files)
-            
-            # Check if today
-            today = datetime.now().date().isoformat()
-            last_update = cache.get('last_updated', '')
-            if today in last_update:
-                cache['file_modifications']['files_modified_today'] += len(modified_files)
-            else:
-                cache['file_modifications']['files_modified_today'] = len(modified_files)
+            self.count_event(cache, 'file_modifications', hook_data, len(modified_files))
             
             # Update recent modifications
             for file_path in modified_files:
+                heavy_hitters.add(self.summary(cache, 'files'), file_path)
                 cache['file_modifications']['recent_modifications'].insert(0, {
                     "file": file_path,
                     "tool": tool_name,
@@ -174,17 +275,16 @@ class DashboardMetricsUpdater:
     def handle_session_start(self, hook_data: Dict[str, Any], cache: Dict[str, Any]):
         """Handle session_start hook data."""
         cache['session_data']['total_sessions'] += 1
+        self.count_event(cache, 'session_starts', hook_data)
         
-        # Check if today
-        today = datetime.now().date().isoformat()
-        timestamp = hook_data.get('timestamp', datetime.now().isoformat())
-        
-        if today in timestamp:
-            cache['session_data']['session_starts_today'] += 1
-        else:
-            cache['session_data']['session_starts_today'] = 1
-        
-        cache['session_data']['last_session_start'] = timestamp
+        cache['session_data']['last_session_start'] = hook_data.get('timestamp', datetime.now().isoformat())
+    
+    def event_epoch(self, hook_data: Dict[str, Any]) -> float:
+        """Time an event happened (the time it was recorded for logged events)."""
+        try:
+            return datetime.fromisoformat(hook_data['recorded_at']).timestamp()
+        except (KeyError, TypeError, ValueError):
+            return datetime.now().timestamp()
     
     def handle_user_prompt(self, hook_data: Dict[str, Any], cache: Dict[str, Any]):
         """Handle user_prompt_submit hook data."""
@@ -199,127 +299,137 @@ class DashboardMetricsUpdater:
     
     def detect_agent_activity(self, hook_data: Dict[str, Any], cache: Dict[str, Any]):
         """Detect agent-related activity in hook data."""
+        # Logged events carry the indicator detected when they were recorded
+        if 'agent_indicator' in hook_data:
+            indicator = hook_data['agent_indicator']
+        else:
+            indicator = self.find_agent_indicator(hook_data)
+        
+        if indicator:
+            # Increment agent activity counter (only once per hook execution)
+            heavy_hitters.add(self.summary(cache, 'agents'), indicator)
+            cache['agent_activity']['total_agent_deployments'] += 1
+            self.count_event(cache, 'agent_activity', hook_data)
+            
+            # Add to recent activity
+            cache['agent_activity']['recent_agent_activity'].insert(0, {
+                "agent_type": indicator,
+                "timestamp": hook_data.get('timestamp', datetime.now().isoformat()),
+                "context": "tool_execution"
+            })
+            
+            # Keep only recent 10 activities
+            cache['agent_activity']['recent_agent_activity'] = cache['agent_activity']['recent_agent_activity'][:10]
+    
+    def find_agent_indicator(self, hook_data: Dict[str, Any]) -> Optional[str]:
+        """First agent indicator mentioned anywhere in the hook data."""
         # Look for agent mentions in tool parameters and results
         text_content = json.dumps(hook_data).lower()
         
-        # Common agent indicators
-        agent_indicators = [
-            'strategic', 'orchestrator', 'guardian', 'collaborative',
-            'action-oriented', 'research', 'specialist', 'deep-thinker',
-            'knowledge-curator', 'dashboard-management', 'api-design',
-            'code-quality', 'performance-optimization', 'testing-strategy',
-            'claude-hooks', 'agent-template'
-        ]
-        
-        for indicator in agent_indicators:
+        for indicator in AGENT_INDICATORS:
             if indicator in text_content:
-                # Increment agent activity counter
-                cache['agent_activity']['agent_mentions'][indicator] = cache['agent_activity']['agent_mentions'].get(indicator, 0) + 1
-                cache['agent_activity']['total_agent_deployments'] += 1
-                
-                # Add to recent activity
-                cache['agent_activity']['recent_agent_activity'].insert(0, {
-                    "agent_type": indicator,
-                    "timestamp": hook_data.get('timestamp', datetime.now().isoformat()),
-                    "context": "tool_execution"
-                })
-                
-                # Keep only recent 10 activities
-                cache['agent_activity']['recent_agent_activity'] = cache['agent_activity']['recent_agent_activity'][:10]
-                
-                break  # Only count once per hook execution
+                return indicator
+        return None
     
     def log_activity(self, data: Dict[str, Any]):
         """Log activity to activity log file."""
         try:
-            log_entry = {
-                "timestamp": datetime.now().isoformat(),
-                **data
-            }
-            
-            with open(self.activity_log_file, 'a') as f:
-                f.write(json.dumps(log_entry) + '\n')
-                
+            self.storage.log_activity(self.activity_entry(data))
         except Exception:
             # Silently fail on logging errors
             pass
     
-    def save_metrics_cache(self, cache: Dict[str, Any]):
-        """Save metrics cache to file."""
-        cache['last_updated'] = datetime.now().isoformat()
-        
-        try:
-            # Write to temporary file first, then rename (atomic operation)
-            temp_file = self.metrics_cache_file.with_suffix('.tmp')
-            
-            with open(temp_file, 'w') as f:
-                json.dump(cache, f, indent=2)
-            
-            temp_file.rename(self.metrics_cache_file)
-            
-        except Exception as e:
-            # Log error but continue
-            error_data = {
-                "event_type": "cache_save_error",
-                "error": str(e),
-                "timestamp": datetime.now().isoformat()
-            }
-            self.log_activity(error_data)
-    
     def get_current_metrics(self) -> Dict[str, Any]:
-        """Get current dashboard metrics for API endpoints."""
+        """
+        Get current dashboard metrics for API endpoints (read-only: reservoir
+        samples of an ended window are logged by the next event or compaction).
+        """
         cache = self.load_metrics_cache()
+        now = datetime.now().timestamp()
+        
+        # Today counters as of now, not as of the last folded event
+        cache['file_modifications']['files_modified_today'] = rolling_windows.today(
+            self.windows(cache, 'file_modifications'), now)
+        cache['session_data']['session_starts_today'] = rolling_windows.today(
+            self.windows(cache, 'session_starts'), now)
+        
+        # Count dicts as views of the bounded summaries
+        if 'heavy_hitters' in cache:
+            cache['tool_usage']['tool_counts'] = heavy_hitters.counts(self.summary(cache, 'tools'))
+            cache['agent_activity']['agent_mentions'] = heavy_hitters.counts(self.summary(cache, 'agents'))
+        
+        # Measured hook latencies replace the per-event execution count
+        if hook_timing is not None:
+            performance = hook_timing.hook_performance(self.hook_latency_dir)
+            if performance['total_hook_executions']:
+                cache['hook_performance'] = performance
         
         # Add computed metrics
         cache['computed'] = {
-            "tools_per_day": self.calculate_tools_per_day(cache),
-            "files_per_day": self.calculate_files_per_day(cache),
-            "session_frequency": self.calculate_session_frequency(cache),
+            "tools_per_day": self.calculate_tools_per_day(cache, now),
+            "files_per_day": self.calculate_files_per_day(cache, now),
+            "session_frequency": self.calculate_session_frequency(cache, now),
             "top_tools": self.get_top_tools(cache),
-            "recent_activity_summary": self.get_recent_activity_summary(cache)
+            "recent_activity_summary": self.get_recent_activity_summary(cache),
+            "rates": {
+                series: rolling_windows.rates(self.windows(cache, series), now)
+                for series in ROLLING_SERIES
+            },
+            "activity_sampling": self.sampler.stats()
         }
         
         return cache
     
-    def calculate_tools_per_day(self, cache: Dict[str, Any]) -> float:
+    def flush_sampled_activity(self, now: Optional[float] = None):
+        """Log the entries the sampler still holds for a sampling window that has ended."""
+        try:
+            for entry in self.sampler.flush(now):
+                self.storage.log_activity(entry)
+        except Exception:
+            # Silently fail on logging errors
+            pass
+    
+    def average_per_day(self, cache: Dict[str, Any], series: str, now: Optional[float] = None) -> float:
+        """Average count per day of a series over the last AVERAGE_WINDOW_DAYS days."""
+        count = rolling_windows.last_days(self.windows(cache, series), AVERAGE_WINDOW_DAYS, now)
+        return round(count / AVERAGE_WINDOW_DAYS, 1)
+    
+    def calculate_tools_per_day(self, cache: Dict[str, Any], now: Optional[float] = None) -> float:
         """Calculate average tools executed per day."""
-        total_tools = cache.get('tool_usage', {}).get('total_executions', 0)
-        
-        # Rough estimation based on cache age
-        if total_tools == 0:
-            return 0.0
-        
-        # Assume data covers last 30 days (rough approximation)
-        return round(total_tools / 30, 1)
+        return self.average_per_day(cache, 'tool_executions', now)
     
-    def calculate_files_per_day(self, cache: Dict[str, Any]) -> float:
+    def calculate_files_per_day(self, cache: Dict[str, Any], now: Optional[float] = None) -> float:
         """Calculate average files modified per day."""
-        total_files = cache.get('file_modifications', {}).get('total_modifications', 0)
-        
-        if total_files == 0:
-            return 0.0
-        
-        return round(total_files / 30, 1)
+        return self.average_per_day(cache, 'file_modifications', now)
     
-    def calculate_session_frequency(self, cache: Dict[str, Any]) -> float:
+    def calculate_session_frequency(self, cache: Dict[str, Any], now: Optional[float] = None) -> float:
         """Calculate session frequency."""
-        total_sessions = cache.get('session_data', {}).get('total_sessions', 0)
-        
-        if total_sessions == 0:
-            return 0.0
-        
-        return round(total_sessions / 30, 1)
+        return self.average_per_day(cache, 'session_starts', now)
     
     def get_top_tools(self, cache: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Get top 5 most used tools."""
-        tool_counts = cache.get('tool_usage', {}).get('tool_counts', {})
-        
-        if not tool_counts:
-            return []
-        
-        sorted_tools = sorted(tool_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+        return [{"tool": entry['item'], "count": entry['count']} for entry in self.top(cache, 'tools', 5)]
+    
+    def top(self, cache: Dict[str, Any], kind: str, limit: int) -> List[Dict[str, Any]]:
+        """Most frequent items of a kind with their count and maximum overcount."""
+        indexed = self.storage.top_items(kind, limit)
+        if indexed is not None:
+            return indexed
+        return heavy_hitters.top(self.summary(cache, kind), limit)
+    
+    def get_top_items(self, kind: str, limit: int = 10) -> Dict[str, Any]:
+        """Top tools, files or agents for the dashboard API."""
+        if kind not in heavy_hitters.CAPACITIES:
+            raise ValueError(f"Unknown kind: {kind} (choose from {', '.join(heavy_hitters.CAPACITIES)})")
         
-        return [{"tool": tool, "count": count} for tool, count in sorted_tools]
+        cache = self.load_metrics_cache()
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "kind": kind,
+            "items": self.top(cache, kind, limit),
+            # Until the summary first evicts an item every count is exact
+            "exact": 'heavy_hitters' not in cache or heavy_hitters.is_exact(self.summary(cache, kind))
+        }
     
     def get_recent_activity_summary(self, cache: Dict[str, Any]) -> Dict[str, Any]:
         """Get summary of recent activity."""
@@ -334,9 +444,40 @@ class DashboardMetricsUpdater:
             "last_activity": recent_tools[0]['timestamp'] if recent_tools else None
         }
 
+# Updaters of this process, one per framework root and backend
+_updaters: Dict[tuple, DashboardMetricsUpdater] = {}
+
+def get_updater(framework_root: Optional[str] = None, backend: Optional[str] = None) -> DashboardMetricsUpdater:
+    """Get this process's updater, creating it (and its storage) on first use."""
+    key = (framework_root, backend)
+    if key not in _updaters:
+        if framework_root is None:
+            _updaters[key] = DashboardMetricsUpdater(backend=backend)
+        else:
+            _updaters[key] = DashboardMetricsUpdater(framework_root, backend)
+    return _updaters[key]
+
+def update_from_hook_data(hook_data: Dict[str, Any], framework_root: Optional[str] = None,
+                          backend: Optional[str] = None) -> bool:
+    """Entry point for hooks: record hook data with the process-wide updater."""
+    return get_updater(framework_root, backend).update_from_hook_data(hook_data)
+
 def main():
     """Main function for testing metrics updater."""
-    updater = DashboardMetricsUpdater()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Dashboard metrics updater')
+    parser.add_argument('--compact', action='store_true',
+                        help='Compact the metrics storage (fold the event log into the snapshot) and exit')
+    parser.add_argument('--backend', choices=sorted(STORAGE_BACKENDS),
+                        help='Metrics storage backend (default: $CLAUDE_DASHBOARD_METRICS_BACKEND or json)')
+    args = parser.parse_args()
+    
+    updater = DashboardMetricsUpdater(backend=args.backend)
+    
+    if args.compact:
+        print(f"Metrics compaction: {'Done' if updater.compact() else 'Already running'}")
+        return
     
     # Test with sample hook data
     sample_hook_data = {